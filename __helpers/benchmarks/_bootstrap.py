@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "app"))
+
+
+def add_app_path() -> None:
+    """Make the appdata package importable when a benchmark is run from anywhere."""
+
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+
+
+def setup_app(log_level: str = "info", app_config: dict | None = None, extra_config: dict | None = None, work_dir: str | None = None) -> str:
+    """Point the app at a throwaway config, log dir and queue.db. Must run before importing appdata.modules.
+
+    extra_config holds the other top level sections (monitor lists, destinations, mdnx, cardinaldl).
+    work_dir is created when not given. Returns it, so the caller can remove it when done.
+    """
+
+    add_app_path()
+
+    if work_dir is None:
+        work_dir = tempfile.mkdtemp(prefix="mdnx-bench-")
+
+    app_section = {
+        "TEMP_DIR": os.path.join(work_dir, "temp"),
+        "BIN_DIR": os.path.join(work_dir, "bin"),
+        "LOG_DIR": os.path.join(work_dir, "logs"),
+        "LOG_LEVEL": log_level
+    }
+    if app_config:
+        app_section.update(app_config)
+
+    for key in ("TEMP_DIR", "BIN_DIR", "LOG_DIR"):
+        os.makedirs(app_section[key], exist_ok=True)
+
+    config_data = dict(extra_config or {})
+    config_data["app"] = app_section
+
+    config_path = os.path.join(work_dir, "config.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config_data, f, indent=4)
+
+    os.environ["CONFIG_FILE"] = config_path
+    os.environ["QUEUE_DB_FILE"] = os.path.join(work_dir, "queue.db")
+
+    return work_dir
+
+
+def migrate_queue_db() -> None:
+    """Create the queue.db schema the same way entrypoint.sh does. Needs alembic, like the app itself."""
+
+    cmd = [sys.executable, "-m", "alembic", "-c", "appdata/modules/db/alembic/alembic.ini", "upgrade", "head"]
+    subprocess.run(cmd, cwd=APP_DIR, check=True, capture_output=True)
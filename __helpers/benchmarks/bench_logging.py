@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import shutil
+import inspect
+import argparse
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import _bootstrap
+WORK_DIR = _bootstrap.setup_app(log_level="info")
+
+from appdata.modules.LogManager import LogManager  # ruff:ignore[module-import-not-at-top-of-file]
+from appdata.modules.Vars import TZ  # ruff:ignore[module-import-not-at-top-of-file]
+
+
+# roughly what one ffprobe result looks like in a debug line
+STREAMS = [{"index": index, "codec_type": "audio", "codec_name": "aac", "tags": {"language": "jpn", "title": f"Track {index}"}} for index in range(12)]
+FILE_PATH = "/data/Anime/Some Series/S01/Some Series - S01E01.mkv"
+
+
+def legacy_line(log_file: str, message: str) -> None:
+    """One enabled line the way LogManager used to write it: frame walk, new ZoneInfo, open per line."""
+
+    frame = inspect.currentframe().f_back
+    filename = os.path.basename(frame.f_code.co_filename)
+    funcname = frame.f_code.co_name
+
+    now = datetime.now(ZoneInfo(TZ))
+    time_str = now.strftime("%I:%M:%S %p")
+    date_str = now.strftime("%d/%m/%Y")
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(f"[{time_str} {date_str}] [INFO] [{filename}<{funcname}>] - {message}\n")
+    print(f"[INFO] {message}", file=sys.stdout, flush=True)
+
+
+def bench(name: str, lines: int, func) -> float:
+    start = time.perf_counter()
+    for index in range(lines):
+        func(index)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {elapsed / lines * 1_000_000:8.2f} us/line", file=sys.stderr)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-line cost of LogManager calls.")
+    parser.add_argument("--lines", type=int, default=50000)
+    args = parser.parse_args()
+
+    log_manager = LogManager()
+    legacy_file = os.path.join(WORK_DIR, "logs", "legacy.log")
+
+    # terminal output is not what we are measuring
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    try:
+        print("filtered debug lines (LOG_LEVEL=info):", file=sys.stderr)
+        bench("  eager f-string", args.lines, lambda i: log_manager.debug(f"ffprobe output for {FILE_PATH}: {STREAMS}"))
+        bench("  lazy callable", args.lines, lambda i: log_manager.debug(lambda: f"ffprobe output for {FILE_PATH}: {STREAMS}"))
+        bench("  is_enabled guard", args.lines, lambda i: log_manager.is_enabled("debug") and log_manager.debug(f"ffprobe output for {FILE_PATH}: {STREAMS}"))
+
+        print("enabled info lines:", file=sys.stderr)
+        before = bench("  before (sync, open per line)", args.lines, lambda i: legacy_line(legacy_file, f"download progress line {i}"))
+        after = bench("  after (queued)", args.lines, lambda i: log_manager.info(f"download progress line {i}"))
+
+        start = time.perf_counter()
+        log_manager.close()
+        drain = time.perf_counter() - start
+        print(f"  writer drain after the run             {drain * 1000:8.2f} ms", file=sys.stderr)
+        print(f"  speedup on the calling thread          {before / after:8.1f}x", file=sys.stderr)
+
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
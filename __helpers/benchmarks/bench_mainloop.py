@@ -0,0 +1,246 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import importlib
+import threading
+
+import _bootstrap
+
+
+STUBS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs")
+
+FOLDER_STRUCTURE = "${seriesTitle}/S${season}/${seriesTitle} - S${seasonPadded}E${episodePadded}"
+
+# service name -> (enable key, monitor list key, series id for the n-th series, API module, API class)
+BENCH_SERVICES = {
+    "crunchyroll": ("CR_ENABLED", "cr_monitor_series_id", lambda n: f"GBENCH{n:03d}", "appdata.modules.API.MDNX.crunchy", "CR_MDNX_API"),
+    "hidive": ("HIDIVE_ENABLED", "hidive_monitor_series_id", lambda n: str(500 + n), "appdata.modules.API.MDNX.hidive", "HIDIVE_MDNX_API"),
+    "adn": ("ADN_ENABLED", "adn_monitor_series_id", lambda n: str(700 + n), "appdata.modules.API.MDNX.adn", "ADN_MDNX_API"),
+    "cdl-crunchyroll": ("CDL_CR_ENABLED", "cdl_cr_monitor_series_id", lambda n: f"GCDL{n:03d}", "appdata.modules.API.CardinalDL.crunchy", "CR_CDL_API")
+}
+
+
+class WriteCounter:
+    """Counts write statements and commits on a sqlite connection through its trace callback."""
+
+    def __init__(self, conn) -> None:
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.statements = 0
+        self.commits = 0
+        conn.set_trace_callback(self._trace)
+
+    def _trace(self, sql: str) -> None:
+        head = sql.lstrip()[:7].upper()
+        with self.lock:
+            if head.startswith(("INSERT", "UPDATE", "DELETE", "REPLACE")):
+                self.statements += 1
+            elif head.startswith("COMMIT"):
+                self.commits += 1
+
+    def snapshot(self) -> tuple[int, int, int]:
+        with self.lock:
+            return self.statements, self.commits, self.conn.total_changes
+
+
+def timed(durations: dict, key, func):
+    """Wrap func so every call adds its wall time to durations[key(args)]."""
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            name = key(args)
+            durations[name] = durations.get(name, 0.0) + time.perf_counter() - start
+
+    return wrapper
+
+
+def build_config(args, work_dir: str) -> tuple[dict, dict]:
+    app_config = {
+        "CR_SKIP_API_TEST": True,
+        "HIDIVE_SKIP_API_TEST": True,
+        "EPISODE_DL_DELAY": 0,
+        "MAX_CONCURRENT_DOWNLOADS": args.concurrent
+    }
+    extra_config = {
+        "destinations": {},
+        "mdnx": {"dir-path": {"content": os.path.join(work_dir, "mdnx-content")}},
+        "cardinaldl": {
+            "crunchyroll": {
+                "dlpath": os.path.join(work_dir, "cdl-download"),
+                "tempPath": os.path.join(work_dir, "cdl-temp"),
+                "configPath": os.path.join(work_dir, "cdl-storage.db")
+            }
+        }
+    }
+
+    for service_name in args.services:
+        enable_key, monitor_key, series_id, _, _ = BENCH_SERVICES[service_name]
+        app_config[enable_key] = True
+        extra_config[monitor_key] = {series_id(number): {} for number in range(1, args.series + 1)}
+
+        library_dir = os.path.join(work_dir, "library", service_name)
+        os.makedirs(library_dir, exist_ok=True)
+        extra_config["destinations"][service_name] = {"dir": library_dir, "folder_structure": FOLDER_STRUCTURE}
+
+    for name in ("mdnx-content", "cdl-download", "cdl-temp"):
+        os.makedirs(os.path.join(work_dir, name), exist_ok=True)
+
+    return app_config, extra_config
+
+
+def install_stubs(bin_dir: str) -> None:
+    """Put the stub binaries where the app expects aniDL and cardinaldl."""
+
+    os.makedirs(os.path.join(bin_dir, "mdnx", "config"), exist_ok=True)
+    os.makedirs(os.path.join(bin_dir, "cardinaldl"), exist_ok=True)
+    os.symlink(os.path.join(STUBS_DIR, "aniDL"), os.path.join(bin_dir, "mdnx", "aniDL"))
+    os.symlink(os.path.join(STUBS_DIR, "cardinaldl"), os.path.join(bin_dir, "cardinaldl", "cardinaldl"))
+
+
+def downloaded_episodes(queue_manager) -> int:
+    total = 0
+    for labels, value in queue_manager._queue_gauge():
+        if labels["state"] == "downloaded":
+            total += value
+    return total
+
+
+def stub_peak_rss(stats_file: str) -> int:
+    peak = 0
+    if os.path.isfile(stats_file):
+        with open(stats_file, "r", encoding="utf-8") as f:
+            for line in f:
+                peak = max(peak, int(line.split()[1]))
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive MainLoop end to end against stub aniDL/cardinaldl binaries.")
+    parser.add_argument("--services", default="crunchyroll,cdl-crunchyroll", help=f"comma separated, any of: {', '.join(BENCH_SERVICES)}")
+    parser.add_argument("--series", type=int, default=1, help="series monitored per service")
+    parser.add_argument("--seasons", type=int, default=2)
+    parser.add_argument("--episodes", type=int, default=6, help="episodes per season")
+    parser.add_argument("--dubs", default="Japanese,English")
+    parser.add_argument("--subs", default="English,Spanish")
+    parser.add_argument("--episode-mb", type=float, default=20, help="size of each fake download")
+    parser.add_argument("--mbps", type=float, default=200, help="fake download speed in MB/s, 0 for unthrottled")
+    parser.add_argument("--listing-delay", type=float, default=0.5, help="seconds each --srz listing takes")
+    parser.add_argument("--concurrent", type=int, default=1, help="MAX_CONCURRENT_DOWNLOADS")
+    parser.add_argument("--iterations", type=int, default=2, help="the first one starts monitors and downloads, later ones only refresh")
+    parser.add_argument("--ready-stable", type=float, default=None, help="override FileManager.readyStableSeconds (app default 5, only used without /proc and inotify)")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    args = parser.parse_args()
+
+    args.services = [name.strip() for name in args.services.split(",") if name.strip()]
+    for service_name in args.services:
+        if service_name not in BENCH_SERVICES:
+            parser.error(f"unknown service {service_name}")
+
+    # FileManager sanitizes every part of the destination path, so keep "_" out of the scratch dir name
+    work_dir = os.path.join(tempfile.gettempdir(), f"mdnx-bench-{os.getpid()}-{int(time.time())}")
+    os.makedirs(work_dir)
+    app_config, extra_config = build_config(args, work_dir)
+    _bootstrap.setup_app(log_level=args.log_level, app_config=app_config, extra_config=extra_config, work_dir=work_dir)
+    _bootstrap.migrate_queue_db()
+    install_stubs(os.path.join(work_dir, "bin"))
+
+    stats_file = os.path.join(work_dir, "stub-rss.txt")
+    os.environ.update({
+        "BENCH_SEASONS": str(args.seasons),
+        "BENCH_EPISODES": str(args.episodes),
+        "BENCH_DUBS": args.dubs,
+        "BENCH_SUBS": args.subs,
+        "BENCH_EPISODE_MB": str(args.episode_mb),
+        "BENCH_DL_MBPS": str(args.mbps),
+        "BENCH_LISTING_DELAY": str(args.listing_delay),
+        "BENCH_STATS_FILE": stats_file,
+        # offline, so skip fetching remote-specials.yaml
+        "REMOTE_SPECIALS_URL": "false"
+    })
+
+    # the app's own log output is not what we are measuring
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    from appdata.modules.Globals import file_manager, probe_cache, queue_manager
+    from appdata.modules.MainLoop import MainLoop
+    from appdata.modules.Vars import SERVICES
+    from appdata.modules.API.MDNX._shared import update_mdnx_config
+
+    try:
+        update_mdnx_config()
+        for service_name in args.services:
+            _, _, _, module_name, class_name = BENCH_SERVICES[service_name]
+            SERVICES.get(service_name).api = getattr(importlib.import_module(module_name), class_name)()
+
+        if args.ready_stable is not None:
+            file_manager.readyStableSeconds = args.ready_stable
+
+        queue_writes = WriteCounter(queue_manager.conn)
+        probe_writes = WriteCounter(probe_cache.conn)
+
+        loop = MainLoop(notifiers=[])
+        durations = {}
+        loop._refresh_queue = timed(durations, lambda call_args: "refresh", loop._refresh_queue)
+        loop._refresh_service_queue = timed(durations, lambda call_args: call_args[0].service_name, loop._refresh_service_queue)
+        loop._run_service_workers = timed(durations, lambda call_args: "downloads", loop._run_service_workers)
+
+        print(f"catalog: {', '.join(args.services)} x {args.series} series x {args.seasons} seasons x {args.episodes} episodes, "
+              f"{args.episode_mb:g} MB episodes at {args.mbps:g} MB/s, {args.listing_delay:g}s per listing", file=sys.stderr)
+
+        for iteration in range(1, args.iterations + 1):
+            durations.clear()
+            downloaded_before = downloaded_episodes(queue_manager)
+            queue_before = queue_writes.snapshot()
+            probe_before = probe_writes.snapshot()
+
+            start = time.perf_counter()
+            loop._run_iteration()
+            elapsed = time.perf_counter() - start
+
+            downloaded = downloaded_episodes(queue_manager) - downloaded_before
+            queue_after = queue_writes.snapshot()
+            probe_after = probe_writes.snapshot()
+
+            per_service = ", ".join(f"{name} {durations.get(name, 0.0):.2f}s" for name in args.services)
+            download_seconds = durations.get("downloads", 0.0)
+
+            print(f"iteration {iteration}", file=sys.stderr)
+            print(f"  wall time           {elapsed:8.2f}s", file=sys.stderr)
+            print(f"  queue refresh       {durations.get('refresh', 0.0):8.2f}s  ({per_service})", file=sys.stderr)
+            if downloaded > 0 and download_seconds:
+                print(f"  download pass       {download_seconds:8.2f}s  {downloaded} episodes, {downloaded / download_seconds * 3600:.0f} episodes/hour", file=sys.stderr)
+            elif downloaded < 0:
+                print(f"  download pass       {download_seconds:8.2f}s  {-downloaded} downloaded episodes dropped from the queue", file=sys.stderr)
+            else:
+                print(f"  download pass       {download_seconds:8.2f}s  nothing new", file=sys.stderr)
+            print(f"  queue.db writes     {queue_after[0] - queue_before[0]:8d} statements, {queue_after[2] - queue_before[2]} rows, {queue_after[1] - queue_before[1]} commits", file=sys.stderr)
+            print(f"  probe cache writes  {probe_after[0] - probe_before[0]:8d} statements, {probe_after[2] - probe_before[2]} rows", file=sys.stderr)
+
+        app_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"peak RSS              app {app_rss:.1f} MiB, largest stub process {stub_peak_rss(stats_file) / 1024:.1f} MiB", file=sys.stderr)
+
+    finally:
+        file_manager.transferScheduler.close()
+        queue_manager.close()
+        probe_cache.close()
+
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+        if args.keep:
+            print(f"kept {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
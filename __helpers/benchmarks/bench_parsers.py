@@ -0,0 +1,167 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import importlib
+import tracemalloc
+
+import _bootstrap
+WORK_DIR = _bootstrap.setup_app(log_level="info", app_config={"CR_SKIP_API_TEST": True, "HIDIVE_SKIP_API_TEST": True})
+_bootstrap.migrate_queue_db()
+
+# offline, so skip fetching remote-specials.yaml
+os.environ["REMOTE_SPECIALS_URL"] = "false"
+
+import catalog  # ruff:ignore[module-import-not-at-top-of-file]
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_baseline.json")
+
+# episodes per listing. 10k is a long running show listed in full.
+SIZES = (10, 1000, 10000)
+
+# episodes per season in the generated listings, so the big ones still have several seasons to resolve
+EPISODES_PER_SEASON = 500
+
+DUBS = ["Japanese", "English", "Spanish"]
+SUBS = ["English", "Spanish", "Portuguese", "French", "German"]
+
+# parser name -> (API module, API class, listing generator, series id)
+PARSERS = {
+    "crunchyroll": ("appdata.modules.API.MDNX.crunchy", "CR_MDNX_API", catalog.cr_listing, "GBENCH001"),
+    "hidive": ("appdata.modules.API.MDNX.hidive", "HIDIVE_MDNX_API", catalog.hidive_listing, "501"),
+    "adn": ("appdata.modules.API.MDNX.adn", "ADN_MDNX_API", catalog.adn_listing, "701")
+}
+
+
+def listing(name: str, episodes: int) -> str:
+    _, _, generator, series_id = PARSERS[name]
+    seasons = max(1, episodes // EPISODES_PER_SEASON)
+    return generator(series_id, seasons, episodes // seasons, DUBS, SUBS)
+
+
+def measure(parse, output: str, repeat: int) -> dict:
+    """Best wall time over repeat runs, then one more run under tracemalloc for allocations."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(output, add2queue=False)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = parse(output, add2queue=False)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    episodes = 0
+    for series in result.values():
+        for season in series.seasons.values():
+            episodes += len(season.episodes)
+
+    return {"seconds": best, "peak_kb": peak / 1024, "retained_kb": retained / 1024, "episodes": episodes}
+
+
+def check(results: dict, baseline: dict, max_slowdown: float, max_alloc_growth: float) -> list[str]:
+    """Every case that got slower or allocates more than the thresholds allow, against baseline."""
+
+    failures = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+
+        if result["episodes"] != previous["episodes"]:
+            failures.append(f"{case}: parsed {result['episodes']} episodes, baseline parsed {previous['episodes']}")
+
+        slowdown = result["seconds"] / previous["seconds"]
+        if slowdown > max_slowdown:
+            failures.append(f"{case}: {slowdown:.2f}x the baseline time (limit {max_slowdown:.2f}x)")
+
+        growth = result["peak_kb"] / previous["peak_kb"]
+        if growth > max_alloc_growth:
+            failures.append(f"{case}: {growth:.2f}x the baseline peak allocation (limit {max_alloc_growth:.2f}x)")
+
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time and allocation benchmark for the MDNX console output parsers.")
+    parser.add_argument("--parsers", default=",".join(PARSERS), help=f"comma separated, any of: {', '.join(PARSERS)}")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES), help="episodes per listing, comma separated")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case, the best one counts")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline instead of checking")
+    parser.add_argument("--max-slowdown", type=float, default=2.0, help="fail when a case takes longer than this times its baseline")
+    parser.add_argument("--max-alloc-growth", type=float, default=1.25, help="fail when a case's peak allocation grows past this times its baseline")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.parsers.split(",") if name.strip()]
+    for name in names:
+        if name not in PARSERS:
+            parser.error(f"unknown parser {name}")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    # the app's own log output is not what we are measuring
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    try:
+        # Globals before any API module, the same order app.py gets them in (through MainLoop)
+        importlib.import_module("appdata.modules.Globals")
+
+        results = {}
+        print(f"{'case':<20} {'best':>10} {'per episode':>12} {'peak alloc':>12} {'retained':>12}", file=sys.stderr)
+        for name in names:
+            module_name, class_name, _, _ = PARSERS[name]
+            api = getattr(importlib.import_module(module_name), class_name)()
+
+            for size in sizes:
+                case = f"{name}/{size}"
+                result = measure(api._process_console_output, listing(name, size), args.repeat)
+                results[case] = result
+                print(
+                    f"{case:<20} {result['seconds'] * 1000:8.2f}ms {result['seconds'] / max(1, result['episodes']) * 1_000_000:10.2f}us "
+                    f"{result['peak_kb']:10.0f}KB {result['retained_kb']:10.0f}KB",
+                    file=sys.stderr
+                )
+
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.isfile(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --save-baseline first", file=sys.stderr)
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    failures = check(results, baseline, args.max_slowdown, args.max_alloc_growth)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+    print(f"no regressions against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import os
+import re
+import sys
+import time
+import random
+import shutil
+import argparse
+import unicodedata
+
+import _bootstrap
+WORK_DIR = _bootstrap.setup_app(log_level="info")
+_bootstrap.migrate_queue_db()
+
+# sanitize() logs through Globals, which has to be importable or every call retries the import
+import appdata.modules.Globals  # ruff:ignore[module-import-not-at-top-of-file, unused-import]
+from appdata.modules.Vars import INVALID_CHARS_RE, sanitize, _sanitize  # ruff:ignore[module-import-not-at-top-of-file]
+
+
+# series, season and episode titles the way they come out of the listings, plus the file names built from them
+TITLES = [
+    "One Piece", "Frieren: Beyond Journey's End", "Oshi no Ko", "Dr. STONE NEW WORLD",
+    "Re:ZERO -Starting Life in Another World-", "That Time I Got Reincarnated as a Slime",
+    "Is It Wrong to Try to Pick Up Girls in a Dungeon?", "The Apothecary Diaries",
+    "進撃の巨人", "鬼滅の刃 刀鍛冶の里編", "葬送のフリーレン", "【推しの子】", "ぼっち・ざ・ろっく！",  # ruff:ignore[ambiguous-unicode-character-string]
+    "Pokémon Horizons", "Mahō Shōjo ni Akogarete", "Shōwa Genroku Rakugo Shinjū", "L'Attaque des Titans",
+    "Déjà Vu", "Café Terrace and Its Goddesses", "Naïve Ep. 3", "Élite Académie",
+    "Idol ★ Stage", "Love Live! ♪ Superstar!!", "Sparkle ✨ Days", "Cooking 🍙 Club", "Heart ♥ Beat",
+    "Ｆｕｌｌ Moon", "Ep １２： The Return", "Who’s There…", "Part 2 – Rain/Shine",  # ruff:ignore[ambiguous-unicode-character-string]
+    "Fate/stay night [Unlimited Blade Works]", "Rascal Does Not Dream of a Dreaming Girl_Movie",
+    "Episode 12 - The Hero's Choice", "A <Very> Bad \"Day\" | Part *3*",
+]
+
+
+def file_names(titles: list[str]) -> list[str]:
+    names = []
+    for index, title in enumerate(titles, start=1):
+        names.append(f"{title} - S01E{index:02d}.mkv")
+    return names
+
+
+def legacy_sanitize(path_segment: str, ascii_only: bool = False, max_len: int = 255) -> str:
+    """sanitize() before it was memoized and given an ASCII path, for comparison."""
+
+    normalized = unicodedata.normalize("NFKC", path_segment)
+    punctuation_translation = {
+        ord("“"): '"', ord("”"): '"', ord("„"): '"', ord("‟"): '"',
+        ord("’"): "'", ord("‘"): "'", ord("‚"): "'", ord("ʼ"): "'",  # ruff:ignore[ambiguous-unicode-character-string]
+        ord("–"): "-", ord("—"): "-", ord("-"): "-",  # ruff:ignore[ambiguous-unicode-character-string]
+        ord("…"): "...", ord("•"): "-", ord("·"): "-", ord("‧"): "-",
+        ord("／"): "/", ord("＼"): "\\", ord("～"): "~",  # ruff:ignore[ambiguous-unicode-character-string]
+        ord("："): ":", ord("；"): ";", ord("！"): "!", ord("？"): "?",  # ruff:ignore[ambiguous-unicode-character-string]
+    }
+    sanitized = normalized.translate(punctuation_translation)
+    sanitized = INVALID_CHARS_RE.sub(" ", sanitized)
+    sanitized = re.sub(r"[\x7F-\x9F]", " ", sanitized)
+
+    builder = []
+    for ch in sanitized:
+        category = unicodedata.category(ch)
+        if category.startswith("C") or category in ("So", "Sm", "Sk"):
+            builder.append(" ")
+        else:
+            builder.append(ch)
+    sanitized = "".join(builder)
+
+    sanitized = sanitized.replace("_", " ")
+    sanitized = re.sub(r"\s+", " ", sanitized).strip()
+    sanitized = re.sub(r"\s+(\.[A-Za-z0-9]{1,10})$", r"\1", sanitized)
+    sanitized = re.sub(r"\.(\s+)([A-Za-z0-9]{1,10})$", r".\2", sanitized)
+    sanitized = sanitized.rstrip(" .")
+
+    if ascii_only:
+        sanitized = unicodedata.normalize("NFKD", sanitized).encode("ascii", "ignore").decode("ascii")
+        sanitized = re.sub(r"[^A-Za-z0-9 .()\-[\]{}!@#$%^&+=,;'%~`-]", " ", sanitized)
+        sanitized = re.sub(r"\s+", " ", sanitized).strip()
+        sanitized = re.sub(r"\s+(\.[A-Za-z0-9]{1,10})$", r"\1", sanitized)
+        sanitized = re.sub(r"\.(\s+)([A-Za-z0-9]{1,10})$", r".\2", sanitized)
+        sanitized = sanitized.rstrip(" .")
+
+    if len(sanitized) > max_len:
+        if "." in sanitized:
+            name_part, dot, ext_part = sanitized.rpartition(".")
+            base = name_part[: max(1, max_len - len(ext_part) - 1)]
+            sanitized = f"{base}{dot}{ext_part}".rstrip(" .")
+        else:
+            sanitized = sanitized[:max_len].rstrip(" .")
+
+    return sanitized
+
+
+def fuzz_segments(rng: random.Random, count: int) -> list[tuple[str, bool, int]]:
+    """Random segments mixing clean ASCII, every ASCII char, C1 controls, symbols, CJK, accents and fullwidth forms."""
+
+    pools = [
+        "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ",
+        "".join(chr(code) for code in range(128)),
+        "".join(chr(code) for code in range(0x80, 0xA0)),
+        "._- .mkv .ass",
+        "éèêëàâäôöûüçñÉÀÇ",
+        "́̈​‍﻿",
+        "日本語のタイトル推しの子",
+        "★♪♥✨🍙🎵©®™°±×÷",  # ruff:ignore[ambiguous-unicode-character-string]
+        "Ａａ０：／！？　",  # ruff:ignore[ambiguous-unicode-character-string]
+        "“”‘’–—…•·",  # ruff:ignore[ambiguous-unicode-character-string]
+    ]
+
+    segments = []
+    for _ in range(count):
+        chars = []
+        for _ in range(rng.randint(0, 40)):
+            chars.append(rng.choice(rng.choice(pools)))
+        max_len = rng.choice((255, 255, 20, 8))
+        segments.append(("".join(chars), rng.random() < 0.2, max_len))
+    return segments
+
+
+def bench(name: str, passes: int, segments: list[str], func, before_pass=None) -> float:
+    elapsed = 0.0
+    for _ in range(passes):
+        if before_pass is not None:
+            before_pass()
+        start = time.perf_counter()
+        for segment in segments:
+            func(segment)
+        elapsed += time.perf_counter() - start
+    calls = passes * len(segments)
+    print(f"  {name:<32} {elapsed / calls * 1_000_000:8.2f} us/call", file=sys.stderr)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare memoized sanitize() against the old implementation.")
+    parser.add_argument("--passes", type=int, default=200, help="passes over the title corpus")
+    parser.add_argument("--fuzz", type=int, default=200000, help="random segments checked against the old implementation")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # the app's own log output is not what we are measuring
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    try:
+        mismatches = 0
+        for segment, ascii_only, max_len in fuzz_segments(random.Random(args.seed), args.fuzz):
+            if sanitize(segment, ascii_only, max_len) != legacy_sanitize(segment, ascii_only, max_len):
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"mismatch for {segment!r} ascii_only={ascii_only} max_len={max_len}", file=sys.stderr)
+        print(f"fuzz       {mismatches} mismatches in {args.fuzz} random segments", file=sys.stderr)
+
+        corpus = TITLES + file_names(TITLES)
+        ascii_share = sum(1 for segment in corpus if segment.isascii()) / len(corpus)
+        print(f"corpus     {len(corpus)} segments, {ascii_share:.0%} pure ASCII", file=sys.stderr)
+
+        ascii_corpus = [segment for segment in corpus if segment.isascii()]
+        print("ASCII segments only:", file=sys.stderr)
+        bench("before", args.passes, ascii_corpus, legacy_sanitize)
+        bench("after, cache cleared every pass", args.passes, ascii_corpus, sanitize, before_pass=_sanitize.cache_clear)
+
+        print("whole corpus:", file=sys.stderr)
+        before = bench("before", args.passes, corpus, legacy_sanitize)
+        bench("after, cache cleared every pass", args.passes, corpus, sanitize, before_pass=_sanitize.cache_clear)
+        after = bench("after, warm cache", args.passes, corpus, sanitize)
+        print(f"  speedup with a warm cache          {before / after:8.1f}x", file=sys.stderr)
+
+        if mismatches:
+            sys.exit(1)
+
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import os
+import time
+
+from probe_bench import ebml_size, element, string, track_entry, uint
+
+
+# display name -> (ISO 639-2 tag in the MKV, CR subtitle locale, ADN token, CardinalDL code)
+LANGUAGES = {
+    "Japanese": ("jpn", "ja-JP", "ja", "JP"),
+    "English": ("eng", "en-US", None, "EN"),
+    "Spanish": ("spa", "es-419", None, "LA-ES"),
+    "Portuguese": ("por", "pt-BR", None, "PT"),
+    "French": ("fra", "fr-FR", "fr", "FR"),
+    "German": ("deu", "de-DE", "de", "DE")
+}
+
+# episode titles cycle through these, a few have characters sanitize() has to deal with (accents, fullwidth, / ? :)
+TITLE_WORDS = [
+    "The Journey Begins", "A Promise Kept", "Where the Wind Blows", "Déjà Vu",
+    "Who Are You?", "Part 2: The Return", "Rain/Shine", "The Hero's Choice",
+    "Café Encounter", "Beyond the Horizon", "\uff26\uff55\uff4c\uff4c Moon", "Final Battle"
+]
+
+# everything the stubs read from the environment, with their defaults
+SETTINGS = {
+    "BENCH_SEASONS": "2",
+    "BENCH_EPISODES": "12",
+    "BENCH_DUBS": "Japanese,English",
+    "BENCH_SUBS": "English,Spanish",
+    "BENCH_EPISODE_MB": "20",
+    "BENCH_DL_MBPS": "200",
+    "BENCH_LISTING_DELAY": "0.5",
+    "BENCH_STATS_FILE": ""
+}
+
+
+def settings() -> dict:
+    """Read the catalog shape and download speed the harness exported."""
+
+    values = {}
+    for key, default in SETTINGS.items():
+        values[key] = os.environ.get(key, default)
+
+    return {
+        "seasons": int(values["BENCH_SEASONS"]),
+        "episodes": int(values["BENCH_EPISODES"]),
+        "dubs": [name.strip() for name in values["BENCH_DUBS"].split(",") if name.strip()],
+        "subs": [name.strip() for name in values["BENCH_SUBS"].split(",") if name.strip()],
+        "episode_bytes": int(float(values["BENCH_EPISODE_MB"]) * 1024 * 1024),
+        "mbps": float(values["BENCH_DL_MBPS"]),
+        "listing_delay": float(values["BENCH_LISTING_DELAY"]),
+        "stats_file": values["BENCH_STATS_FILE"]
+    }
+
+
+def record_peak_rss(stats_file: str, name: str) -> None:
+    """Append this process's peak RSS in KB to stats_file.
+
+    VmHWM rather than getrusage, whose ru_maxrss a child inherits from the parent it was forked from.
+    """
+
+    if not stats_file:
+        return
+
+    peak = 0
+    with open("/proc/self/status", "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                peak = int(line.split()[1])
+                break
+
+    with open(stats_file, "a", encoding="utf-8") as f:
+        f.write(f"{name} {peak}\n")
+
+
+def series_title(series_id: str) -> str:
+    return f"Bench Series {series_id}"
+
+
+def episode_title(season: int, episode: int) -> str:
+    return f"{TITLE_WORDS[(season * 7 + episode) % len(TITLE_WORDS)]} {episode}"
+
+
+def cr_listing(series_id: str, seasons: int, episodes: int, dubs: list[str], subs: list[str], specials: bool = True) -> str:
+    """aniDL --service crunchy --srz output. specials adds an OVA season the parser has to drop."""
+
+    title = series_title(series_id)
+    versions = ", ".join(("☆" if index else "") + name for index, name in enumerate(dubs))
+    locales = ", ".join(LANGUAGES[name][1] for name in subs) or "none"
+
+    lines = [f"[Z:{series_id}] {title} (Seasons: {seasons + int(specials)}, EPs: {seasons * episodes + 2 * int(specials)})"]
+    for season in range(1, seasons + 1):
+        season_name = title if season == 1 else f"{title} Season {season}"
+        lines.append(f"  [S:{series_id}S{season:02d}] {season_name} (Season: {season})")
+        for episode in range(1, episodes + 1):
+            lines.append(f"    [E{episode}] [2024-{(season - 1) % 12 + 1:02d}-{(episode - 1) % 28 + 1:02d}] {season_name} - Season {season} - {episode_title(season, episode)}")
+            lines.append(f"      - Versions: {versions}")
+            lines.append(f"      - Subtitles: {locales}")
+
+    if specials:
+        ova_name = f"{title} OVA"
+        lines.append(f"  [S:{series_id}OVA] {ova_name} (Season: {seasons + 1})")
+        for episode in range(1, 3):
+            lines.append(f"    [E{episode}] [2024-12-{episode:02d}] {ova_name} - Season {seasons + 1} - Bonus {episode}")
+            lines.append(f"      - Versions: {versions}")
+            lines.append(f"      - Subtitles: {locales}")
+
+    return "\n".join(lines) + "\n"
+
+
+def hidive_listing(series_id: str, seasons: int, episodes: int, dubs: list[str], subs: list[str], specials: bool = True) -> str:
+    """aniDL --service hidive --srz output: the season tree followed by the flat [Sxx Eyy] list."""
+
+    versions = ", ".join(dubs)
+    sub_names = ", ".join(subs)
+    total_seasons = seasons + int(specials)
+
+    lines = [f"[Z.{series_id}] {series_title(series_id)} ({total_seasons} Seasons)"]
+    flat = []
+    episode_id = int(series_id) * 1000
+    for season in range(1, seasons + 1):
+        lines.append(f"  [S.{int(series_id) * 100 + season}] Season {season} ({episodes} Episodes)")
+        for episode in range(1, episodes + 1):
+            episode_id += 1
+            name = episode_title(season, episode)
+            lines.append(f"    [E.{episode_id}] {name}")
+            lines.append(f"      - Versions: {versions}")
+            lines.append(f"      - Subtitles: {sub_names}")
+            flat.append(f"[S{season:02d} E{episode:02d}] {name}")
+
+    if specials:
+        lines.append(f"  [S.{int(series_id) * 100 + 99}] OVA (2 Episodes)")
+        for episode in range(1, 3):
+            episode_id += 1
+            lines.append(f"    [E.{episode_id}] Bonus {episode}")
+
+    return "\n".join(lines + flat) + "\n"
+
+
+def adn_listing(series_id: str, seasons: int, episodes: int, dubs: list[str], subs: list[str]) -> str:
+    """aniDL --service adn --srz output. ADN has no seasons, the "Épisode N" prefix restarting marks one."""
+
+    versions = ", ".join(LANGUAGES[name][2] for name in dubs if LANGUAGES[name][2]) or "ja"
+    sub_tokens = ", ".join(LANGUAGES[name][2] for name in subs if LANGUAGES[name][2]) or "fr"
+
+    lines = [f"[S.{series_id}] {series_title(series_id)}"]
+    download_number = 0
+    for season in range(1, seasons + 1):
+        for episode in range(1, episodes + 1):
+            download_number += 1
+            lines.append(f"  ({int(series_id) * 1000 + download_number}) [E{download_number}] Épisode {episode} - {episode_title(season, episode)}")
+            lines.append(f"    - Versions: {versions}")
+            lines.append(f"    - Subtitles: {sub_tokens}")
+
+    lines.append("-" * 40)
+    return "\n".join(lines) + "\n"
+
+
+def cdl_payload(series_id: str, seasons: int, episodes: int, dubs: list[str], subs: list[str]) -> dict:
+    """cardinaldl --srz --jsonOutput payload."""
+
+    audios = [LANGUAGES[name][3] for name in dubs]
+    subtitles = [LANGUAGES[name][3] for name in subs]
+
+    season_list = []
+    for season in range(1, seasons + 1):
+        episode_list = []
+        for episode in range(1, episodes + 1):
+            episode_list.append({
+                "id": f"{series_id}-S{season}E{episode}",
+                "episode": episode,
+                "title": episode_title(season, episode),
+                "audios": audios,
+                "subtitles": subtitles,
+                "qualities": ["1080p@avc", "720p@avc"],
+                "is_special": False
+            })
+
+        season_list.append({
+            "id": f"{series_id}-S{season}",
+            "season": season,
+            "title": f"Season {season}",
+            "episodes": episode_list
+        })
+
+    return {"item": {"id": series_id, "title": series_title(series_id)}, "seasons": season_list}
+
+
+def mkv_header(dubs: list[str], subs: list[str]) -> bytes:
+    """EBML header, Segment and Tracks of an episode carrying the given dubs and subs, up to the first Cluster."""
+
+    tracks = [(1, "V_MPEG4/ISO/AVC", "und", "")]
+    for name in dubs:
+        tracks.append((2, "A_AAC", LANGUAGES[name][0], name))
+    for name in subs:
+        tracks.append((17, "S_TEXT/ASS", LANGUAGES[name][0], name))
+
+    tracks_body = b""
+    for number, (track_type, codec_id, language, name) in enumerate(tracks, start=1):
+        tracks_body += track_entry(number, track_type, codec_id, language, name)
+
+    ebml_header = element(0x1A45DFA3, uint(0x4286, 1) + uint(0x42F7, 1) + uint(0x42F2, 4) + uint(0x42F3, 8) + string(0x4282, "matroska") + uint(0x4287, 4) + uint(0x4285, 2))
+    info = element(0x1549A966, uint(0x2AD7B1, 1000000) + string(0x4D80, "bench") + string(0x5741, "bench"))
+    tracks_element = element(0x1654AE6B, tracks_body)
+
+    # unknown segment size, like a muxer that is still writing
+    return ebml_header + bytes.fromhex("18538067") + bytes.fromhex("01FFFFFFFFFFFFFF") + info + tracks_element
+
+
+def write_episode(file_path: str, dubs: list[str], subs: list[str], size: int, mbps: float, progress=None) -> None:
+    """Write a fake episode of roughly size bytes at mbps megabytes per second."""
+
+    chunk = bytes(1024 * 1024)
+    header = mkv_header(dubs, subs)
+    payload = max(0, size - len(header) - 16)
+
+    with open(file_path, "wb") as f:
+        f.write(header)
+        f.write(bytes.fromhex("1F43B675") + ebml_size(payload))
+
+        start = time.monotonic()
+        written = 0
+        while written < payload:
+            part = min(len(chunk), payload - written)
+            f.write(chunk[:part])
+            written += part
+
+            # sleep off whatever the target speed has left for this chunk
+            if mbps > 0:
+                ahead = written / (mbps * 1024 * 1024) - (time.monotonic() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+            if progress is not None:
+                progress(written, payload)
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import importlib
+
+import _bootstrap
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# season settings the edge case listing is parsed with, so season_override and blacklists are covered too
+MONITOR_CONFIG = {
+    "cr_monitor_series_id": {
+        "GEDGE0001": {"GEDGES03": {"season_override": "7", "blacklists": ["3"]}},
+        "GEDGE0002": {}
+    }
+}
+
+WORK_DIR = _bootstrap.setup_app(log_level="info", app_config={"CR_SKIP_API_TEST": True, "HIDIVE_SKIP_API_TEST": True}, extra_config=MONITOR_CONFIG)
+_bootstrap.migrate_queue_db()
+
+# offline, so skip fetching remote-specials.yaml
+os.environ["REMOTE_SPECIALS_URL"] = "false"
+
+import catalog  # ruff:ignore[module-import-not-at-top-of-file]
+
+
+DUBS = ["Japanese", "English", "Spanish"]
+SUBS = ["English", "Spanish", "Portuguese", "French", "German"]
+
+# fixture name -> (API module, API class, generator for the recorded listing or None for a hand written one)
+FIXTURES = {
+    "crunchyroll_edge_cases": ("appdata.modules.API.MDNX.crunchy", "CR_MDNX_API", None),
+    "crunchyroll_generated": ("appdata.modules.API.MDNX.crunchy", "CR_MDNX_API", lambda: catalog.cr_listing("GBENCH001", 3, 12, DUBS, SUBS)),
+    "hidive_generated": ("appdata.modules.API.MDNX.hidive", "HIDIVE_MDNX_API", lambda: catalog.hidive_listing("501", 3, 12, DUBS, SUBS)),
+    "adn_generated": ("appdata.modules.API.MDNX.adn", "ADN_MDNX_API", lambda: catalog.adn_listing("701", 3, 12, DUBS, SUBS))
+}
+
+
+def render(result: dict) -> str:
+    """Parser result as the JSON text compared byte for byte."""
+
+    dumped = {}
+    for series_id, series in result.items():
+        dumped[series_id] = series.model_dump()
+    return json.dumps(dumped, indent=4, ensure_ascii=False) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the MDNX console parsers against recorded listings and their parsed output.")
+    parser.add_argument("--record", action="store_true", help="write the current parser output as the expected output")
+    parser.add_argument("--fixtures", default=",".join(FIXTURES), help=f"comma separated, any of: {', '.join(FIXTURES)}")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.fixtures.split(",") if name.strip()]
+    for name in names:
+        if name not in FIXTURES:
+            parser.error(f"unknown fixture {name}")
+
+    # the app's own log output is not what we are checking
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    failures = []
+    try:
+        # Globals before any API module, the same order app.py gets them in (through MainLoop)
+        importlib.import_module("appdata.modules.Globals")
+
+        for name in names:
+            module_name, class_name, generator = FIXTURES[name]
+            listing_path = os.path.join(FIXTURES_DIR, f"{name}.txt")
+            expected_path = os.path.join(FIXTURES_DIR, f"{name}.json")
+
+            if args.record and generator is not None:
+                with open(listing_path, "w", encoding="utf-8") as f:
+                    f.write(generator())
+
+            with open(listing_path, "r", encoding="utf-8") as f:
+                listing = f.read()
+
+            api = getattr(importlib.import_module(module_name), class_name)()
+            got = render(api._process_console_output(listing, add2queue=False))
+
+            if args.record:
+                with open(expected_path, "w", encoding="utf-8") as f:
+                    f.write(got)
+                print(f"recorded {name}", file=sys.stderr)
+                continue
+
+            with open(expected_path, "r", encoding="utf-8") as f:
+                expected = f.read()
+
+            if got == expected:
+                print(f"ok        {name}", file=sys.stderr)
+            else:
+                failures.append(name)
+                print(f"MISMATCH  {name}", file=sys.stderr)
+                with open(os.path.join(WORK_DIR, f"{name}.got.json"), "w", encoding="utf-8") as f:
+                    f.write(got)
+
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+        if failures:
+            print(f"parser output kept in {WORK_DIR}", file=sys.stderr)
+        else:
+            shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
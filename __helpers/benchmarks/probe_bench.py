@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import _bootstrap
+_bootstrap.add_app_path()
+
+from appdata.modules.Matroska import read_tracks  # ruff:ignore[module-import-not-at-top-of-file]
+
+
+# the tracks a typical CR/HIDIVE download carries
+AUDIO_TRACKS = [
+    ("jpn", "Japanese"),
+    ("eng", "English"),
+    ("spa", "Spanish (Latin America)"),
+    ("por", "Portuguese (Brazil)"),
+    ("fre", "French"),
+    ("ger", "German")
+]
+SUB_TRACKS = [
+    ("eng", "English"),
+    ("eng", "English [CC]"),
+    ("spa", "Spanish (Latin America)"),
+    ("por", "Portuguese (Brazil)"),
+    ("fre", "French"),
+    ("ger", "German"),
+    ("ara", "Arabic"),
+    ("ita", "Italian"),
+    ("rus", "Russian")
+]
+
+
+def ebml_size(size: int) -> bytes:
+    """Encode size as an 8 byte EBML variable size integer."""
+    return bytes([0x01]) + size.to_bytes(7, "big")
+
+
+def element(element_id: int, body: bytes) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + ebml_size(len(body)) + body
+
+
+def uint(element_id: int, value: int) -> bytes:
+    return element(element_id, value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big"))
+
+
+def string(element_id: int, value: str) -> bytes:
+    return element(element_id, value.encode("utf-8"))
+
+
+def track_entry(number: int, track_type: int, codec_id: str, language: str, name: str) -> bytes:
+    body = uint(0xD7, number) + uint(0x73C5, number) + uint(0x83, track_type) + string(0x86, codec_id)
+    body += string(0x22B59C, language)
+    if name:
+        body += string(0x536E, name)
+    return element(0xAE, body)
+
+
+def build_mkv(rng: random.Random, cluster_size: int) -> tuple[bytes, list[dict]]:
+    """Build a Matroska header plus one dummy cluster. Returns (file bytes, expected streams)."""
+
+    tracks = [(1, "V_MPEG4/ISO/AVC", "und", "")]
+    for language, name in rng.sample(AUDIO_TRACKS, rng.randint(1, 4)):
+        tracks.append((2, "A_AAC", language, name))
+    for language, name in rng.sample(SUB_TRACKS, rng.randint(0, 8)):
+        tracks.append((17, "S_TEXT/ASS", language, name))
+
+    tracks_body = b""
+    expected = []
+    for number, (track_type, codec_id, language, name) in enumerate(tracks, start=1):
+        tracks_body += track_entry(number, track_type, codec_id, language, name)
+        tags = {}
+        if language != "und":
+            tags["language"] = language
+        if name:
+            tags["title"] = name
+        expected.append({"codec_type": {1: "video", 2: "audio", 17: "subtitle"}[track_type], "tags": tags})
+
+    ebml_header = element(0x1A45DFA3, uint(0x4286, 1) + uint(0x42F7, 1) + uint(0x42F2, 4) + uint(0x42F3, 8) + string(0x4282, "matroska") + uint(0x4287, 4) + uint(0x4285, 2))
+    info = element(0x1549A966, uint(0x2AD7B1, 1000000) + string(0x4D80, "probe_bench") + string(0x5741, "probe_bench"))
+    tracks_element = element(0x1654AE6B, tracks_body)
+    # some muxers reserve space before Tracks, which only a SeekHead lets a reader jump over
+    void = element(0xEC, bytes(rng.choice([0, 0, 4096])))
+    cluster = element(0x1F43B675, uint(0xE7, 0) + element(0xA3, os.urandom(cluster_size)))
+
+    # SeekHead entries are relative to the segment body. its own size is fixed, so compute it from a placeholder.
+    placeholder = element(0x114D9B74, element(0x4DBB, uint(0x53AB, 0x1654AE6B) + element(0x53AC, bytes(8))))
+    tracks_position = len(placeholder) + len(info) + len(void)
+    seek_head = element(0x114D9B74, element(0x4DBB, uint(0x53AB, 0x1654AE6B) + element(0x53AC, tracks_position.to_bytes(8, "big"))))
+
+    segment = element(0x18538067, seek_head + info + void + tracks_element + cluster)
+    return ebml_header + segment, expected
+
+
+def normalize(streams: list[dict]) -> list[tuple]:
+    """Reduce streams to what probe_streams reads, so both readers can be compared."""
+
+    result = []
+    for stream in streams:
+        tags = stream.get("tags", {})
+        result.append((stream.get("codec_type"), tags.get("language", ""), tags.get("title", "")))
+    return result
+
+
+def run_ffprobe(file_path: str) -> list[dict]:
+    cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_streams", file_path]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=180)
+    return json.loads(result.stdout or "{}").get("streams", [])
+
+
+def bench(name: str, func, files: list[str]) -> tuple[float, list]:
+    results = []
+    start = time.perf_counter()
+    for file_path in files:
+        results.append(func(file_path))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {len(files)} files in {elapsed:.3f}s ({elapsed / len(files) * 1000:.3f} ms/file)")
+    return elapsed, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the built-in Matroska track reader against ffprobe.")
+    parser.add_argument("--files", type=int, default=200, help="number of generated MKV files")
+    parser.add_argument("--cluster-kb", type=int, default=256, help="dummy cluster payload per file, in KB")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus_dir = tempfile.mkdtemp(prefix="probe-bench-")
+
+    try:
+        files = []
+        expected = []
+        for number in range(args.files):
+            data, streams = build_mkv(rng, args.cluster_kb * 1024)
+            file_path = os.path.join(corpus_dir, f"episode-{number:04d}.mkv")
+            with open(file_path, "wb") as f:
+                f.write(data)
+            files.append(file_path)
+            expected.append(streams)
+
+        print(f"Generated {len(files)} MKV files in {corpus_dir}")
+
+        matroska_time, matroska_results = bench("matroska", read_tracks, files)
+        mismatches = sum(1 for got, want in zip(matroska_results, expected, strict=True) if normalize(got) != normalize(want))
+        print(f"matroska   {mismatches} mismatches against the generated tracks")
+
+        if shutil.which("ffprobe") is None:
+            print("ffprobe    not found on PATH, skipping the comparison")
+            return
+
+        ffprobe_time, ffprobe_results = bench("ffprobe", run_ffprobe, files)
+        mismatches = sum(1 for got, want in zip(matroska_results, ffprobe_results, strict=True) if normalize(got) != normalize(want))
+        print(f"ffprobe    {mismatches} mismatches against the matroska reader")
+        print(f"speedup    {ffprobe_time / matroska_time:.1f}x")
+
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import sys
 import signal
 
 from appdata.modules.MainLoop import MainLoop
-from appdata.modules.Globals import file_manager, log_manager, queue_manager
+from appdata.modules.Globals import file_manager, log_manager, metrics_manager, probe_cache, queue_manager
 from appdata.modules.MediaServerManager import mediaserver_auth, mediaserver_scan_library
 from appdata.modules.API.MDNX._shared import (
     MDNX_SERVICE_BIN_PATH,
@@ -259,6 +259,18 @@ def app():
                 from appdata.modules.API.CardinalDL.amazon import AMAZON_CDL_API
                 cdl_service.api = AMAZON_CDL_API()
 
+    # clear out job workspaces a previous run left behind (container killed mid download, etc)
+    file_manager.remove_stale_workspaces()
+
+    # and partial copies a transfer was writing into the destination dirs when it died
+    file_manager.remove_stale_partials()
+
+    # forget probe results for files that were deleted or moved outside the app
+    probe_cache.prune()
+
+    # optional Prometheus /metrics endpoint
+    metrics_manager.start()
+
     mainloop = MainLoop(notifiers=notifiers)
 
     def shutdown(signum, frame):
@@ -274,7 +286,10 @@ def app():
     try:
         mainloop.mainloop()
     finally:
+        file_manager.transferScheduler.close()
+        metrics_manager.stop()
         queue_manager.close()
+        probe_cache.close()
 
 
 if __name__ == "__main__":
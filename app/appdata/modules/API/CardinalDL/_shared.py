@@ -2,11 +2,12 @@ import os
 import re
 import json
 import sqlite3
+from collections.abc import Callable
 
 from appdata.modules.Vars import (
     config,
     BIN_DIR,
-    dedupe_casefold, ffprobe
+    dedupe_casefold, probe_file
 )
 from appdata.modules.types.queue import Episode
 from appdata.modules.types.service import Service
@@ -165,7 +166,7 @@ def check_cdl_signed_in(storage_path: str) -> tuple[bool, str]:
     return (True, "")
 
 
-def _log(message: str, level: str = "info") -> None:
+def _log(message: str | Callable[[], str], level: str = "info") -> None:
     """Internal logging helper function. Needed to avoid circular imports."""
 
     try:
@@ -187,6 +188,17 @@ def _log(message: str, level: str = "info") -> None:
         pass
 
 
+def _log_enabled(level: str) -> bool:
+    """Check if log_manager would write this level, so loops can skip building debug strings."""
+
+    try:
+        from appdata.modules.Globals import log_manager
+    except Exception:
+        return False
+
+    return log_manager.is_enabled(level)
+
+
 def normalize_cdl_dubs(raw_dubs: list) -> list[str]:
     cleaned = []
     for raw_dub in raw_dubs:
@@ -415,19 +427,22 @@ def get_wanted_dubs_and_subs(service: Service, series_id: str, season_id: str |
         if normalized:
             wanted_subs.add(normalized)
 
-    _log(f"Effective wanted CardinalDL tracks for {service.service_name} {series_id}/{season_id}: dubs={wanted_dubs}, subs={wanted_subs}", level="debug")
+    _log(lambda: f"Effective wanted CardinalDL tracks for {service.service_name} {series_id}/{season_id}: dubs={wanted_dubs}, subs={wanted_subs}", level="debug")
 
     return wanted_dubs, wanted_subs
 
 
 def probe_streams(file_path: str) -> tuple[set, set]:
-    streams = ffprobe(file_path)
+    streams = probe_file(file_path)
     if streams == []:
         return set(), set()
 
     audio_langs = set()
     sub_langs = set()
 
+    # checked once, the per-stream debug line is the most frequent one in this module
+    debug_enabled = _log_enabled("debug")
+
     for stream in streams:
         ffprobe_tags = stream.get("tags", {})
         ffprobe_lang = str(ffprobe_tags.get("language", "")).strip().lower()
@@ -436,7 +451,8 @@ def probe_streams(file_path: str) -> tuple[set, set]:
         lang = ISO_B_TO_T.get(ffprobe_lang, ffprobe_lang)
         title = re.sub(r"\s*\[[^\]]*\]\s*", " ", ffprobe_title).strip()
 
-        _log(f"Probing stream: codec_type={stream.get('codec_type')}, ffprobe_lang={ffprobe_lang}, ffprobe_title={ffprobe_title!r}, lang={lang}, title={title!r}", level="debug")
+        if debug_enabled:
+            _log(f"Probing stream: codec_type={stream.get('codec_type')}, ffprobe_lang={ffprobe_lang}, ffprobe_title={ffprobe_title!r}, lang={lang}, title={title!r}", level="debug")
 
         mapped_code = None
         if title in LANG_MAP:
@@ -459,6 +475,6 @@ def probe_streams(file_path: str) -> tuple[set, set]:
             case _:
                 continue
 
-    _log(f"Probed {file_path}: CardinalDL audio langs={audio_langs}, sub langs={sub_langs}", level="debug")
+    _log(lambda: f"Probed {file_path}: CardinalDL audio langs={audio_langs}, sub langs={sub_langs}", level="debug")
 
     return audio_langs, sub_langs
@@ -3,14 +3,14 @@ import json
 import subprocess
 import threading
 
-from appdata.modules.Globals import queue_manager, log_manager
+from appdata.modules.FileManager import JobWorkspace
+from appdata.modules.Globals import file_manager, queue_manager, log_manager
 from appdata.modules.API.CardinalDL._shared import (
     CDL_SERVICE_BIN_PATH,
     normalize_cdl_dubs, normalize_cdl_subtitles, normalize_cdl_qualities
 )
 from appdata.modules.Vars import (
     config,
-    TEMP_DIR,
     apply_series_blacklist, get_season_monitor_config, sanitize
 )
 from appdata.modules.types.queue import Episode, Season, Series, SeriesInfo
@@ -24,11 +24,9 @@ class DISNEY_CDL_API:
         self.cdl_service = "disney"
         self.queue_service = "cdl-disney"
         self.service_config = config.cardinaldl.disney
-        self.download_filename = os.path.join(self.service_config.dlpath, "output.mkv")
         self.download_thread = None
         self.download_proc = None
         self.download_lock = threading.Lock()
-        self.json_path = os.path.join(TEMP_DIR, "output.json")
 
         if os.path.exists("/usr/bin/stdbuf"):
             self.stdbuf_exists = True
@@ -44,35 +42,39 @@ class DISNEY_CDL_API:
 
         log_manager.debug(f"Monitoring series with ID: {series_id}")
 
-        if os.path.isfile(self.json_path):
-            os.remove(self.json_path)
+        # each listing gets its own workspace so parallel listings never share a json file
+        workspace = self.create_workspace(listing=True)
+        json_path = workspace.path("output.json")
 
-        tmp_cmd = [self.cdl_path, "--service", self.cdl_service, "--srz", series_id, "--full", "--workers", "1", "--jsonOutput", self.json_path, "--configPath", self.service_config.configPath]
-        result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8", cwd=self.cdl_working_dir)
-        log_manager.debug(f"Console output for start_monitor process:\n{result.stdout}")
+        try:
+            tmp_cmd = [self.cdl_path, "--service", self.cdl_service, "--srz", series_id, "--full", "--workers", "1", "--jsonOutput", json_path, "--configPath", self.service_config.configPath]
+            result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8", cwd=self.cdl_working_dir)
+            log_manager.debug(f"Console output for start_monitor process:\n{result.stdout}")
 
-        if result.stderr:
-            log_manager.warning(f"Console output for start_monitor process (stderr):\n{result.stderr}")
+            if result.stderr:
+                log_manager.warning(f"Console output for start_monitor process (stderr):\n{result.stderr}")
 
-        if result.returncode != 0:
-            log_manager.error(f"CardinalDL listing failed for {series_id} with exit code {result.returncode}.")
-            return result.stdout
+            if result.returncode != 0:
+                log_manager.error(f"CardinalDL listing failed for {series_id} with exit code {result.returncode}.")
+                return result.stdout
 
-        if not os.path.isfile(self.json_path):
-            log_manager.warning(f"CardinalDL json payload not found at {self.json_path}.")
-            return result.stdout
+            if not os.path.isfile(json_path):
+                log_manager.warning(f"CardinalDL json payload not found at {json_path}.")
+                return result.stdout
 
-        try:
-            with open(self.json_path, "r", encoding="utf-8") as file_handle:
-                parsed_payload = json.load(file_handle)
-        except (OSError, json.JSONDecodeError) as exc:
-            log_manager.warning(f"Failed to read CardinalDL json payload at {self.json_path}: {exc}")
-            return result.stdout
+            try:
+                with open(json_path, "r", encoding="utf-8") as file_handle:
+                    parsed_payload = json.load(file_handle)
+            except (OSError, json.JSONDecodeError) as exc:
+                log_manager.warning(f"Failed to read CardinalDL json payload at {json_path}: {exc}")
+                return result.stdout
 
-        self._process_json_payload(parsed_payload, requested_series_id=series_id)
+            self._process_json_payload(parsed_payload, requested_series_id=series_id)
 
-        log_manager.debug(f"Monitoring for series with ID: {series_id} complete.")
-        return result.stdout
+            log_manager.debug(f"Monitoring for series with ID: {series_id} complete.")
+            return result.stdout
+        finally:
+            workspace.cleanup()
 
     def stop_monitor(self, series_id: str) -> None:
         """Stop monitoring a series by removing it from the queue."""
@@ -86,35 +88,47 @@ class DISNEY_CDL_API:
 
         log_manager.debug(f"Updating monitor for series with ID: {series_id}")
 
-        if os.path.isfile(self.json_path):
-            os.remove(self.json_path)
+        # each listing gets its own workspace so parallel listings never share a json file
+        workspace = self.create_workspace(listing=True)
+        json_path = workspace.path("output.json")
 
-        tmp_cmd = [self.cdl_path, "--service", self.cdl_service, "--srz", series_id, "--full", "--workers", "1", "--jsonOutput", self.json_path, "--configPath", self.service_config.configPath]
-        result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8", cwd=self.cdl_working_dir)
-        log_manager.debug(f"Console output for update_monitor process:\n{result.stdout}")
+        try:
+            tmp_cmd = [self.cdl_path, "--service", self.cdl_service, "--srz", series_id, "--full", "--workers", "1", "--jsonOutput", json_path, "--configPath", self.service_config.configPath]
+            result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8", cwd=self.cdl_working_dir)
+            log_manager.debug(f"Console output for update_monitor process:\n{result.stdout}")
 
-        if result.stderr:
-            log_manager.warning(f"Console output for update_monitor process (stderr):\n{result.stderr}")
+            if result.stderr:
+                log_manager.warning(f"Console output for update_monitor process (stderr):\n{result.stderr}")
 
-        if result.returncode != 0:
-            log_manager.error(f"CardinalDL listing failed for {series_id} with exit code {result.returncode}.")
-            return result.stdout
+            if result.returncode != 0:
+                log_manager.error(f"CardinalDL listing failed for {series_id} with exit code {result.returncode}.")
+                return result.stdout
 
-        if not os.path.isfile(self.json_path):
-            log_manager.warning(f"CardinalDL json payload not found at {self.json_path}.")
-            return result.stdout
+            if not os.path.isfile(json_path):
+                log_manager.warning(f"CardinalDL json payload not found at {json_path}.")
+                return result.stdout
 
-        try:
-            with open(self.json_path, "r", encoding="utf-8") as file_handle:
-                parsed_payload = json.load(file_handle)
-        except (OSError, json.JSONDecodeError) as exc:
-            log_manager.warning(f"Failed to read CardinalDL json payload at {self.json_path}: {exc}")
+            try:
+                with open(json_path, "r", encoding="utf-8") as file_handle:
+                    parsed_payload = json.load(file_handle)
+            except (OSError, json.JSONDecodeError) as exc:
+                log_manager.warning(f"Failed to read CardinalDL json payload at {json_path}: {exc}")
+                return result.stdout
+
+            self._process_json_payload(parsed_payload, requested_series_id=series_id)
+
+            log_manager.debug(f"Updating monitor for series with ID: {series_id} complete.")
             return result.stdout
+        finally:
+            workspace.cleanup()
+
+    def create_workspace(self, listing: bool = False) -> JobWorkspace:
+        """Create a job workspace for a download (inside dlpath) or a --jsonOutput listing (inside TEMP_DIR)."""
 
-        self._process_json_payload(parsed_payload, requested_series_id=series_id)
+        if listing:
+            return file_manager.create_workspace(f"{self.queue_service}-listing")
 
-        log_manager.debug(f"Updating monitor for series with ID: {series_id} complete.")
-        return result.stdout
+        return file_manager.create_workspace(self.queue_service, self.service_config.dlpath)
 
     def cancel_active_download(self) -> None:
         """Cancel any active download process and wait for the worker thread to stop."""
@@ -145,8 +159,8 @@ class DISNEY_CDL_API:
             if self.download_proc is proc:
                 self.download_proc = None
 
-    def download_episode(self, series_id: str, season_id: str, episode_number: str, dub_override: list[str] | None = None, sub_override: list[str] | None = None) -> bool:
-        """Download a specific episode using the CardinalDL service."""
+    def download_episode(self, series_id: str, season_id: str, episode_number: str, dub_override: list[str] | None = None, sub_override: list[str] | None = None, *, workspace: JobWorkspace) -> bool:
+        """Download a specific episode using the CardinalDL service into the given job workspace."""
 
         log_manager.info(f"Downloading episode {episode_number} for series {series_id} season {season_id}")
 
@@ -187,9 +201,11 @@ class DISNEY_CDL_API:
             tmp_cmd += ["--forceSubFormat", self.service_config.forceSubFormat]
             log_manager.info(f"Using forceSubFormat override: {self.service_config.forceSubFormat}")
 
-        tmp_cmd += ["--fileName", "output"]
-        tmp_cmd += ["--dlpath", self.service_config.dlpath]
-        tmp_cmd += ["--tempPath", self.service_config.tempPath]
+        download_filename = workspace.output_path
+        tmp_cmd += ["--fileName", workspace.output_name]
+        tmp_cmd += ["--dlpath", workspace.dir]
+        # segments go to a dir of their own too, tempPath is shared by every CDL service
+        tmp_cmd += ["--tempPath", workspace.scratch_dir(self.service_config.tempPath)]
         tmp_cmd += ["--configPath", self.service_config.configPath]
 
         if self.stdbuf_exists:
@@ -230,8 +246,8 @@ class DISNEY_CDL_API:
             log_manager.error(f"Download failed with exit code {returncode}")
             return False
 
-        if not os.path.isfile(self.download_filename):
-            log_manager.error(f"Download finished, but expected output file was not found: {self.download_filename}")
+        if not os.path.isfile(download_filename):
+            log_manager.error(f"Download finished, but expected output file was not found: {download_filename}")
             return False
 
         log_manager.info("Download finished successfully.")
@@ -1,10 +1,13 @@
 import os
 import re
+import threading
+import subprocess
+from collections.abc import Callable, Iterator
 
 from appdata.modules.Vars import (
     config,
     BIN_DIR,
-    dedupe_casefold, ffprobe
+    dedupe_casefold, probe_file
 )
 from appdata.modules.types.queue import Episode
 from appdata.modules.types.service import Service
@@ -111,7 +114,7 @@ for language_values in LANG_MAP.values():
         CODE_TO_LOCALE[lowered_dub_code] = lowered_subtitle_locale
 
 
-def _log(message: str, level: str = "info") -> None:
+def _log(message: str | Callable[[], str], level: str = "info") -> None:
     """Internal log shim. Avoids circular imports at module-load time."""
 
     try:
@@ -135,6 +138,47 @@ def _log(message: str, level: str = "info") -> None:
         pass
 
 
+def _log_enabled(level: str) -> bool:
+    """Check if log_manager would write this level, so loops can skip building debug strings."""
+
+    try:
+        from appdata.modules.Globals import log_manager
+    except Exception:
+        return False
+
+    return log_manager.is_enabled(level)
+
+
+def stream_console_output(cmd: list[str], process_name: str) -> Iterator[str]:
+    """Run an aniDL command and yield its stdout line by line as it is printed, so the caller can parse while aniDL is still fetching.
+
+    stderr is drained on a side thread so it can't fill its pipe and stall the process, then logged as a warning once aniDL exits.
+    If the caller stops iterating early, the process is killed.
+    """
+
+    debug_enabled = _log_enabled("debug")
+    stderr_lines = []
+    finished = False
+
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8", bufsize=1) as proc:
+        stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(proc.stderr), name=f"{process_name}-stderr", daemon=True)
+        stderr_reader.start()
+
+        try:
+            for line in proc.stdout:
+                if debug_enabled:
+                    _log(f"[{process_name}] {line.rstrip()}", level="debug")
+                yield line
+            finished = True
+        finally:
+            if not finished:
+                proc.kill()
+            stderr_reader.join()
+
+    if stderr_lines:
+        _log(f"Console output for {process_name} process (stderr):\n{''.join(stderr_lines)}", level="warning")
+
+
 def select_dubs(service: Service, episode: Episode, dub_overrides: list[str] | None = None):
     available_dubs = set()
     for dub_code in episode.available_dubs:
@@ -271,19 +315,22 @@ def get_wanted_dubs_and_subs(service: Service, series_id: str, season_id: str |
         if normalized:
             wanted_subs.add(normalized)
 
-    _log(f"Effective wanted MDNX tracks for {service.service_name} {series_id}/{season_id}: dubs={wanted_dubs}, subs={wanted_subs}", level="debug")
+    _log(lambda: f"Effective wanted MDNX tracks for {service.service_name} {series_id}/{season_id}: dubs={wanted_dubs}, subs={wanted_subs}", level="debug")
 
     return wanted_dubs, wanted_subs
 
 
 def probe_streams(file_path: str) -> tuple[set, set]:
-    streams = ffprobe(file_path)
+    streams = probe_file(file_path)
     if streams == []:
         return set(), set()
 
     audio_langs = set()
     sub_langs = set()
 
+    # checked once, the per-stream debug line is the most frequent one in this module
+    debug_enabled = _log_enabled("debug")
+
     for stream in streams:
         ffprobe_tags = stream.get("tags", {})
         ffprobe_lang = str(ffprobe_tags.get("language", "")).strip().lower()
@@ -292,7 +339,8 @@ def probe_streams(file_path: str) -> tuple[set, set]:
         lang = ISO_B_TO_T.get(ffprobe_lang, ffprobe_lang)
         title = re.sub(r"\s*\[[^\]]*\]\s*", " ", ffprobe_title).strip()
 
-        _log(f"Probing stream: codec_type={stream.get('codec_type')}, ffprobe_lang={ffprobe_lang}, ffprobe_title={ffprobe_title!r}, lang={lang}, title={title!r}", level="debug")
+        if debug_enabled:
+            _log(f"Probing stream: codec_type={stream.get('codec_type')}, ffprobe_lang={ffprobe_lang}, ffprobe_title={ffprobe_title!r}, lang={lang}, title={title!r}", level="debug")
 
         mapped_audio = None
         mapped_sub = None
@@ -322,7 +370,7 @@ def probe_streams(file_path: str) -> tuple[set, set]:
             case _:
                 continue
 
-    _log(f"Probed {file_path}: MDNX audio langs={audio_langs}, sub langs={sub_langs}", level="debug")
+    _log(lambda: f"Probed {file_path}: MDNX audio langs={audio_langs}, sub langs={sub_langs}", level="debug")
 
     return audio_langs, sub_langs
 
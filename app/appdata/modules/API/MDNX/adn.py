@@ -3,10 +3,12 @@ import re
 import sys
 import subprocess
 import threading
+from collections.abc import Iterable
 
-from appdata.modules.Globals import queue_manager, log_manager
+from appdata.modules.FileManager import JobWorkspace
+from appdata.modules.Globals import file_manager, queue_manager, log_manager
 from appdata.modules.API.MDNX._shared import (
-    MDNX_API_OK_LOGS, MDNX_SERVICE_BIN_PATH, LANG_MAP
+    MDNX_API_OK_LOGS, MDNX_SERVICE_BIN_PATH, LANG_MAP, stream_console_output
 )
 from appdata.modules.Vars import (
     config,
@@ -81,22 +83,20 @@ class ADN_MDNX_API:
         log_manager.info(f"Authentication with {self.mdnx_service} complete.")
         return result.stdout
 
-    def start_monitor(self, series_id: str) -> str:
+    def start_monitor(self, series_id: str) -> None:
         """Starts monitoring a series by its ID using the MDNX service."""
 
         log_manager.debug(f"Monitoring series with ID: {series_id}")
 
         tmp_cmd = [self.mdnx_path, "--service", self.mdnx_service, "-s", series_id]
-        result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8")
-        log_manager.debug(f"Console output for start_monitor process:\n{result.stdout}")
-
-        if result.stderr:
-            log_manager.warning(f"Console output for start_monitor process (stderr):\n{result.stderr}")
+        if self.stdbuf_exists:
+            tmp_cmd = ["stdbuf", "-oL", "-eL", *tmp_cmd]
 
-        self._process_console_output(result.stdout)
+        # parse while aniDL is still printing instead of buffering the whole listing first
+        self._process_console_output(stream_console_output(tmp_cmd, "start_monitor"))
 
         log_manager.debug(f"Monitoring for series with ID: {series_id} complete.")
-        return result.stdout
+        return
 
     def stop_monitor(self, series_id: str) -> None:
         """Stops monitoring a series by its ID using the MDNX service."""
@@ -105,22 +105,25 @@ class ADN_MDNX_API:
         log_manager.debug(f"Stopped monitoring series with ID: {series_id}")
         return
 
-    def update_monitor(self, series_id: str) -> str:
+    def update_monitor(self, series_id: str) -> None:
         """Updates monitoring for a series by its ID using the MDNX service."""
 
         log_manager.debug(f"Updating monitor for series with ID: {series_id}")
 
         tmp_cmd = [self.mdnx_path, "--service", self.mdnx_service, "-s", series_id]
-        result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8")
-        log_manager.debug(f"Console output for update_monitor process:\n{result.stdout}")
-
-        if result.stderr:
-            log_manager.warning(f"Console output for update_monitor process (stderr):\n{result.stderr}")
+        if self.stdbuf_exists:
+            tmp_cmd = ["stdbuf", "-oL", "-eL", *tmp_cmd]
 
-        self._process_console_output(result.stdout)
+        # parse while aniDL is still printing instead of buffering the whole listing first
+        self._process_console_output(stream_console_output(tmp_cmd, "update_monitor"))
 
         log_manager.debug(f"Updating monitor for series with ID: {series_id} complete.")
-        return result.stdout
+        return
+
+    def create_workspace(self) -> JobWorkspace:
+        """Create a job workspace inside the MDNX content dir so each download lands in its own folder."""
+
+        return file_manager.create_workspace(self.queue_service, config.mdnx.dir_path.content)
 
     def cancel_active_download(self) -> None:
         """Cancels any active download process and waits for the worker thread to exit."""
@@ -152,8 +155,8 @@ class ADN_MDNX_API:
             if self.download_proc is proc:
                 self.download_proc = None
 
-    def download_episode(self, series_id: str, season_id: str, episode_number: str, dub_override: list[str] | None = None, sub_override: list[str] | None = None) -> bool:
-        """Downloads a specific episode using the MDNX service."""
+    def download_episode(self, series_id: str, season_id: str, episode_number: str, dub_override: list[str] | None = None, sub_override: list[str] | None = None, *, workspace: JobWorkspace) -> bool:
+        """Downloads a specific episode using the MDNX service into the given job workspace."""
 
         log_manager.info(f"Downloading episode {episode_number} for series {series_id} season {season_id}")
 
@@ -173,7 +176,9 @@ class ADN_MDNX_API:
 
         # Hardcoded options.
         # These can not be modified by the users config, or things will break/not work as expected.
-        tmp_cmd += ["--fileName", "output"]
+        # --fileName is relative to the MDNX content dir, so point it at the job workspace folder.
+        tmp_cmd += ["--fileName", f"{workspace.name}/{workspace.output_name}"]
+
         tmp_cmd += ["--skipUpdate", "true"]
 
         if self.stdbuf_exists:
@@ -257,7 +262,7 @@ class ADN_MDNX_API:
             result["success"] = success
             result["returncode"] = returncode
 
-    def _process_console_output(self, output: str, add2queue: bool = True):
+    def _process_console_output(self, output: str | Iterable[str], add2queue: bool = True):
         """Parse the console output from MDNX CLI and build structured series/season/episode data."""
 
         log_manager.debug("Processing console output...")
@@ -313,7 +318,9 @@ class ADN_MDNX_API:
 
             current_season_episodes = []
 
-        for raw_line in output.splitlines():
+        # output is either the whole listing or the live lines from stream_console_output()
+        lines = output.splitlines() if isinstance(output, str) else output
+        for raw_line in lines:
             line = raw_line.strip()
             if not line:
                 continue
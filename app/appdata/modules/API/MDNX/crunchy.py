@@ -4,10 +4,12 @@ import sys
 import json
 import subprocess
 import threading
+from collections.abc import Iterable
 
-from appdata.modules.Globals import queue_manager, log_manager
+from appdata.modules.FileManager import JobWorkspace
+from appdata.modules.Globals import file_manager, queue_manager, log_manager
 from appdata.modules.API.MDNX._shared import (
-    MDNX_API_OK_LOGS, MDNX_SERVICE_BIN_PATH, NAME_TO_CODE, VALID_LOCALES
+    MDNX_API_OK_LOGS, MDNX_SERVICE_BIN_PATH, NAME_TO_CODE, VALID_LOCALES, stream_console_output
 )
 from appdata.modules.Vars import (
     config,
@@ -43,6 +45,16 @@ class CR_MDNX_API:
             r'^\[(?P<ep_type>E|S)(?P<episode_number>\d+)\]\s+(?P<full_episode_name>.+)$'
         )
 
+        # Upstream season label inside an episode line: "... - Season N - ..."
+        self.season_label_pattern = re.compile(
+            r'- Season (\d+) -'
+        )
+
+        # Leading air date on an episode name: "[YYYY-MM-DD] "
+        self.episode_date_pattern = re.compile(
+            r'^\[\d{4}-\d{2}-\d{2}\]\s*'
+        )
+
         # Special seasons: we want to filter out OVAs, movies, compilations, etc
         self.special_season_pattern = re.compile(
             r'\b(OVA|OAD|ONA|Specials?|Recap|Compilation|Summary|Movie|Film)\b',
@@ -123,22 +135,20 @@ class CR_MDNX_API:
         log_manager.info(f"Authentication with {self.mdnx_service} complete.")
         return result.stdout
 
-    def start_monitor(self, series_id: str) -> str:
+    def start_monitor(self, series_id: str) -> None:
         """Starts monitoring a series by its ID using the MDNX service."""
 
         log_manager.debug(f"Monitoring series with ID: {series_id}")
 
         tmp_cmd = [self.mdnx_path, "--service", self.mdnx_service, "--srz", series_id]
-        result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8")
-        log_manager.debug(f"Console output for start_monitor process:\n{result.stdout}")
-
-        if result.stderr:
-            log_manager.warning(f"Console output for start_monitor process (stderr):\n{result.stderr}")
+        if self.stdbuf_exists:
+            tmp_cmd = ["stdbuf", "-oL", "-eL", *tmp_cmd]
 
-        self._process_console_output(result.stdout)
+        # parse while aniDL is still printing instead of buffering the whole listing first
+        self._process_console_output(stream_console_output(tmp_cmd, "start_monitor"))
 
         log_manager.debug(f"Monitoring for series with ID: {series_id} complete.")
-        return result.stdout
+        return
 
     def stop_monitor(self, series_id: str) -> None:
         """Stops monitoring a series by its ID using the MDNX service."""
@@ -147,22 +157,25 @@ class CR_MDNX_API:
         log_manager.debug(f"Stopped monitoring series with ID: {series_id}")
         return
 
-    def update_monitor(self, series_id: str) -> str:
+    def update_monitor(self, series_id: str) -> None:
         """Updates monitoring for a series by its ID using the MDNX service."""
 
         log_manager.debug(f"Updating monitor for series with ID: {series_id}")
 
         tmp_cmd = [self.mdnx_path, "--service", self.mdnx_service, "--srz", series_id]
-        result = subprocess.run(tmp_cmd, capture_output=True, text=True, encoding="utf-8")
-        log_manager.debug(f"Console output for update_monitor process:\n{result.stdout}")
-
-        if result.stderr:
-            log_manager.warning(f"Console output for update_monitor process (stderr):\n{result.stderr}")
+        if self.stdbuf_exists:
+            tmp_cmd = ["stdbuf", "-oL", "-eL", *tmp_cmd]
 
-        self._process_console_output(result.stdout)
+        # parse while aniDL is still printing instead of buffering the whole listing first
+        self._process_console_output(stream_console_output(tmp_cmd, "update_monitor"))
 
         log_manager.debug(f"Updating monitor for series with ID: {series_id} complete.")
-        return result.stdout
+        return
+
+    def create_workspace(self) -> JobWorkspace:
+        """Create a job workspace inside the MDNX content dir so each download lands in its own folder."""
+
+        return file_manager.create_workspace(self.queue_service, config.mdnx.dir_path.content)
 
     def cancel_active_download(self) -> None:
         """Cancels any active download process and waits for the worker thread to exit."""
@@ -194,8 +207,8 @@ class CR_MDNX_API:
             if self.download_proc is proc:
                 self.download_proc = None
 
-    def download_episode(self, series_id: str, season_id: str, episode_number: str, dub_override: list[str] | None = None, sub_override: list[str] | None = None) -> bool:
-        """Downloads a specific episode using the MDNX service."""
+    def download_episode(self, series_id: str, season_id: str, episode_number: str, dub_override: list[str] | None = None, sub_override: list[str] | None = None, *, workspace: JobWorkspace) -> bool:
+        """Downloads a specific episode using the MDNX service into the given job workspace."""
 
         log_manager.info(f"Downloading episode {episode_number} for series {series_id} season {season_id}")
 
@@ -215,7 +228,9 @@ class CR_MDNX_API:
 
         # Hardcoded options.
         # These can not be modified by the users config, or things will break/not work as expected.
-        tmp_cmd += ["--fileName", "output"]
+        # --fileName is relative to the MDNX content dir, so point it at the job workspace folder.
+        tmp_cmd += ["--fileName", f"{workspace.name}/{workspace.output_name}"]
+
         tmp_cmd += ["--skipUpdate", "true"]
 
         if self.stdbuf_exists:
@@ -299,10 +314,12 @@ class CR_MDNX_API:
             result["success"] = success
             result["returncode"] = returncode
 
-    def _process_console_output(self, output: str, add2queue: bool = True):
+    def _process_console_output(self, output: str | Iterable[str], add2queue: bool = True):
         """Parses the console output from the MDNX CLI and constructs a structured dictionary of series, seasons, and episodes."""
 
         log_manager.debug("Processing console output...")
+        debug_enabled = log_manager.is_enabled("debug")
+
         tmp_dict: dict[str, Series] = {}  # maps series_id to Series object
         episode_counters = {}     # maps season key ("S1", "S2", etc) to episode counter
         season_num_map = {}       # we keep the first numeric label we see as a hint for fallback resolution
@@ -314,10 +331,18 @@ class CR_MDNX_API:
         name_to_season_key = {}    # map normalized season_name to season_key so episodes can resolve by name first
         skipped_season_names = set()    # lowercased sanitized names of seasons we dropped as specials
         skipped_season_numbers = set()  # original "Season: N" numbers we dropped as specials
+        normalized_names = {}      # season name -> sanitize(name).lower(). every episode line repeats its season's name
 
         # we stage an episode because its dubs/subs lines arrive after the [E..] line
         staged_episode = None  # dict with: series_id, season_key, ep_key, episode_number_clean, episode_number_download, episode_title_clean, available_subs, available_dubs
 
+        def _normalize_name(name: str) -> str:
+            normalized = normalized_names.get(name)
+            if normalized is None:
+                normalized = sanitize(name).lower()
+                normalized_names[name] = normalized
+            return normalized
+
         def _commit_staged():
 
             # we need to flush the staged episode into tmp_dict when context changes or at the end
@@ -350,18 +375,26 @@ class CR_MDNX_API:
                 available_subs=staged_episode["available_subs"]
             )
 
-            log_manager.debug(f"Committed episode {s_id}/{s_key}/{e_key} to tmp_dict.")
+            if debug_enabled:
+                log_manager.debug(f"Committed episode {s_id}/{s_key}/{e_key} to tmp_dict.")
             staged_episode = None
             return
 
-        for raw_line in output.splitlines():
+        # output is either the whole listing or the live lines from stream_console_output()
+        lines = output.splitlines() if isinstance(output, str) else output
+        for raw_line in lines:
             line = raw_line.strip()
-            if not line:
-                continue
+
+            # every line we parse starts with "[Z:" (series), "[S:" (season), "[E" or "[S<n>" (episode) or "-" (versions, subtitles).
+            # the first two characters pick the only pattern that can match, everything else is skipped untouched.
+            prefix = line[:2]
 
             # series header like "[Z:...] <name> (Seasons: X, EPs: Y)"
-            match = self.series_pattern.match(line)
-            if match:
+            if prefix == "[Z":
+                match = self.series_pattern.match(line)
+                if not match:
+                    continue
+
                 # commit any staged episode before switching series
                 _commit_staged()
 
@@ -389,8 +422,10 @@ class CR_MDNX_API:
                 continue
 
             # season header like "[S:...] <name> (Season: N)"
-            match = self.season_pattern.match(line)
-            if match and current_series_id:
+            if prefix == "[S" and line[2:3] == ":":
+                match = self.season_pattern.match(line)
+                if not match or not current_series_id:
+                    continue
 
                 # commit any staged episode before changing season context
                 _commit_staged()
@@ -437,12 +472,14 @@ class CR_MDNX_API:
                 episode_counters[season_key] = 1
 
                 # we memo the name to resolve episodes by name first
-                name_to_season_key[sanitize(info["season_name"]).lower()] = season_key
+                name_to_season_key[_normalize_name(info["season_name"])] = season_key
                 continue
 
             # episode line like "[E12] [YYYY-MM-DD] <Series Name> - Season N - Episode M"
-            match = self.episode_pattern.match(line)
-            if match and current_series_id:
+            if prefix == "[E" or prefix == "[S":
+                match = self.episode_pattern.match(line)
+                if not match or not current_series_id:
+                    continue
 
                 # commit any previous staged episode before staging a new one
                 _commit_staged()
@@ -453,10 +490,13 @@ class CR_MDNX_API:
                 if ep_info["ep_type"] == "S":
                     continue
 
+                # the upstream "- Season N -" label, read once for remote specials, dropped seasons and the numeric fallback
+                season_label_match = self.season_label_pattern.search(line)
+                season_label = season_label_match.group(1) if season_label_match else None
+
                 # remote-specials override: drop using upstream "Season N" label and [Exx] number
-                upstream_season_match = re.search(r'- Season (\d+) -', line)
-                if upstream_season_match and current_series_id:
-                    upstream_season_id = f"S{upstream_season_match.group(1)}"
+                if season_label is not None:
+                    upstream_season_id = f"S{season_label}"
                     if remote_specials.is_remote_special("mdnx", "crunchyroll", current_series_id, upstream_season_id, ep_info["episode_number"]):
                         log_manager.debug(f"Skipping remote-special at {upstream_season_id}E{ep_info['episode_number']} series_id={current_series_id}")
                         continue
@@ -466,8 +506,7 @@ class CR_MDNX_API:
                 mapped_num = None
 
                 # we extract the display name portion before " - Season "
-                full_name_guess = ep_info["full_episode_name"]
-                full_name_guess = re.sub(r'^\[\d{4}-\d{2}-\d{2}\]\s*', '', full_name_guess)  # strip leading date if present
+                full_name_guess = self.episode_date_pattern.sub('', ep_info["full_episode_name"])  # strip leading date if present
 
                 # skip PV or trailer entries that are not full episodes
                 if ep_info["full_episode_name"].lstrip().lower().startswith("pv"):
@@ -477,31 +516,29 @@ class CR_MDNX_API:
                 season_name_guess = parts_before[0].strip()
 
                 # drop episodes that belong to a season we already skipped above, by name or by numeric label
-                season_name_lower = sanitize(season_name_guess).lower()
+                season_name_lower = _normalize_name(season_name_guess)
                 if season_name_lower in skipped_season_names:
                     log_manager.debug(f"Skipping episode under dropped special season '{season_name_guess}': {line}")
                     continue
 
-                drop_num_match = re.search(r'- Season (\d+) -', line)
-                if drop_num_match and int(drop_num_match.group(1)) in skipped_season_numbers:
-                    log_manager.debug(f"Skipping episode under dropped special season number {drop_num_match.group(1)}: {line}")
+                if season_label is not None and int(season_label) in skipped_season_numbers:
+                    log_manager.debug(f"Skipping episode under dropped special season number {season_label}: {line}")
                     continue
 
                 # try by season name first because names disambiguate duplicate numeric labels
-                guessed_key = name_to_season_key.get(sanitize(season_name_guess).lower())
+                guessed_key = name_to_season_key.get(season_name_lower)
                 if guessed_key:
                     season_key = guessed_key
                     mapped_num = int(season_key[1:])
-                    log_manager.debug(f"Resolved episode season by name '{season_name_guess}' -> {season_key}")
+                    if debug_enabled:
+                        log_manager.debug(f"Resolved episode season by name '{season_name_guess}' -> {season_key}")
 
                 # fallback to the numeric label found in the episode line if name lookup failed
-                if not season_key:
-                    season_num = re.search(r'- Season (\d+) -', line)
-                    if season_num:
-                        orig_label = int(season_num.group(1))
-                        if orig_label in season_num_map:
-                            mapped_num = season_num_map[orig_label]
-                            season_key = f"S{mapped_num}"
+                if not season_key and season_label is not None:
+                    orig_label = int(season_label)
+                    if orig_label in season_num_map:
+                        mapped_num = season_num_map[orig_label]
+                        season_key = f"S{mapped_num}"
 
                 if not season_key:
 
@@ -519,11 +556,9 @@ class CR_MDNX_API:
                         episode_counters[season_key] = 1
 
                     # stabilize future matches by updating maps from what we can infer here
-                    season_num = re.search(r'- Season (\d+) -', line)
-                    if season_num:
-                        orig_label = int(season_num.group(1))
-                        season_num_map.setdefault(orig_label, mapped_num)
-                    name_to_season_key[sanitize(season_name_guess).lower()] = season_key
+                    if season_label is not None:
+                        season_num_map.setdefault(int(season_label), mapped_num)
+                    name_to_season_key[season_name_lower] = season_key
 
                 # make sure the per-season counter exists even if there was no header
                 if season_key not in episode_counters:
@@ -559,12 +594,20 @@ class CR_MDNX_API:
                     "available_dubs": [],
                     "available_subs": []
                 }
-                log_manager.debug(f"Staged new episode {current_series_id}/{season_key}/{ep_key}: '{episode_title_clean}'")
+                if debug_enabled:
+                    log_manager.debug(f"Staged new episode {current_series_id}/{season_key}/{ep_key}: '{episode_title_clean}'")
+                continue
+
+            if prefix[:1] != "-":
+                continue
+
+            # dubs and subs only ever belong to the episode staged right before them
+            if not (current_series_id and active_season_key and active_episode_key and staged_episode and staged_episode.get("ep_key") == active_episode_key):
                 continue
 
             # versions line like "- Versions: en, es-419, ..."
             match = self.versions_pattern.match(line)
-            if match and current_series_id and active_season_key and active_episode_key and staged_episode and staged_episode.get("ep_key") == active_episode_key:
+            if match:
                 raw_list = match.group(1)
 
                 # we normalize entries and map human readable names to language codes
@@ -575,12 +618,13 @@ class CR_MDNX_API:
                         dub_codes.append(NAME_TO_CODE[lang])
 
                 staged_episode["available_dubs"] = dub_codes
-                log_manager.debug(f"Staged episode-level dubs for {current_series_id}/{active_season_key}/{active_episode_key}: {dub_codes}")
+                if debug_enabled:
+                    log_manager.debug(f"Staged episode-level dubs for {current_series_id}/{active_season_key}/{active_episode_key}: {dub_codes}")
                 continue
 
             # subtitles line like "- Subtitles: en-US, es-ES, ..."
             match = self.subtitles_pattern.match(line)
-            if match and current_series_id and active_season_key and active_episode_key and staged_episode and staged_episode.get("ep_key") == active_episode_key:
+            if match:
                 raw_list = match.group(1).strip()
 
                 subs_locales = []
@@ -597,7 +641,8 @@ class CR_MDNX_API:
                             subs_locales.append(base)
 
                 staged_episode["available_subs"] = subs_locales
-                log_manager.debug(f"Staged episode-level subtitles for {current_series_id}/{active_season_key}/{active_episode_key}: {subs_locales}")
+                if debug_enabled:
+                    log_manager.debug(f"Staged episode-level subtitles for {current_series_id}/{active_season_key}/{active_episode_key}: {subs_locales}")
                 continue
 
         # commit any trailing staged episode once the loop ends
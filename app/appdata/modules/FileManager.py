@@ -1,8 +1,23 @@
 import os
+import mmap
 import time
-from shutil import copyfile as shcopy, disk_usage
-
-from .Globals import log_manager
+import queue
+import uuid
+import errno
+import ctypes
+import select
+import struct
+import hashlib
+import threading
+from shutil import disk_usage, rmtree
+
+try:
+    import fcntl
+except ImportError:  # not on Linux/macOS, reflinks are skipped
+    fcntl = None
+
+from .Globals import log_manager, metrics_manager
+from .types.config import DestinationConfig
 from .Vars import (
     config,
     TEMP_DIR, SERVICES,
@@ -10,6 +25,428 @@ from .Vars import (
 )
 
 
+# job workspaces are hidden dirs with a marker file in them, only those are ever removed as stale
+WORKSPACE_PREFIX = ".mdnx-job-"
+WORKSPACE_MARKER = ".mdnx-workspace"
+
+# ioctl request for FICLONE (linux/fs.h). clones the whole file without copying data on btrfs, XFS and other CoW filesystems.
+FICLONE = 0x40049409
+
+# bytes per copy_file_range/sendfile call and buffer size of the chunked copy (a whole number of pages)
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+# smallest chunk a throttled copy is cut into, so low caps still write smoothly instead of in 8 MiB bursts
+THROTTLE_MIN_CHUNK = 256 * 1024
+
+# with drop_page_cache, how much gets written before it is flushed and dropped from the page cache
+DROP_CACHE_SYNC_BYTES = 64 * 1024 * 1024
+
+# seconds between progress lines of a chunked copy
+PROGRESS_LOG_INTERVAL = 10
+
+# errors meaning a transfer method isn't available for this pair of filesystems, so the next one is tried
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EBADF}
+
+
+def _reflink(src, dst) -> None:
+    if fcntl is None:
+        raise OSError(errno.ENOTTY, "reflinks need fcntl")
+    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _copy_file_range(src, dst) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "os.copy_file_range is not available")
+
+    remaining = os.fstat(src.fileno()).st_size
+    copied_any = False
+    while remaining > 0:
+        copied = os.copy_file_range(src.fileno(), dst.fileno(), min(COPY_CHUNK_SIZE, remaining))
+        if copied == 0:
+            # some kernels return 0 instead of an error for filesystems they can't copy between
+            if not copied_any:
+                raise OSError(errno.ENOSYS, "copy_file_range copied nothing")
+            break
+        copied_any = True
+        remaining -= copied
+
+
+def _sendfile(src, dst) -> None:
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "os.sendfile is not available")
+
+    remaining = os.fstat(src.fileno()).st_size
+    copied_any = False
+    while remaining > 0:
+        copied = os.sendfile(dst.fileno(), src.fileno(), None, min(COPY_CHUNK_SIZE, remaining))
+        if copied == 0:
+            if not copied_any:
+                raise OSError(errno.ENOSYS, "sendfile copied nothing")
+            break
+        copied_any = True
+        remaining -= copied
+
+
+# tried in order when the source can't just be renamed into place. a plain read/write copy is the last resort.
+COPY_STRATEGIES = (
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile)
+)
+
+# copies are written next to the destination under this prefix and renamed over it once complete and synced
+PARTIAL_PREFIX = ".mdnx-partial-"
+
+
+def _chunked_copy(src, dst, label: str, max_rate: float = 0, drop_cache: bool = False, verify: bool = False) -> str | None:
+    """Read/write copy through a page aligned buffer, logging progress as it goes.
+
+    max_rate caps the average speed in bytes per second (0 for no cap). drop_cache keeps the copy from
+    pushing everything else out of the page cache. verify hashes every chunk as it is read, checks the
+    destination size once it is on disk and returns the BLAKE2b hex digest of the source.
+    """
+
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+    total = os.fstat(src_fd).st_size
+    drop_cache = drop_cache and hasattr(os, "posix_fadvise")
+
+    chunk_size = COPY_CHUNK_SIZE
+    if max_rate:
+        chunk_size = min(COPY_CHUNK_SIZE, max(THROTTLE_MIN_CHUNK, int(max_rate) // 4))
+        chunk_size -= chunk_size % mmap.PAGESIZE
+
+    read_digest = hashlib.blake2b() if verify else None
+
+    copied = 0
+    synced = 0
+    start = time.perf_counter()
+    next_progress = start + PROGRESS_LOG_INTERVAL
+
+    # anonymous mmap memory is page aligned, which keeps reads and writes on page boundaries
+    buffer = mmap.mmap(-1, chunk_size)
+    view = memoryview(buffer)
+    try:
+        while True:
+            read = src.readinto(view)
+            if not read:
+                break
+
+            if verify:
+                read_digest.update(view[:read])
+
+            written = dst.write(view[:read])
+            if written != read:
+                raise OSError(errno.EIO, f"short write: {written} of {read} bytes")
+
+            if drop_cache:
+                # source pages are clean and can go right away, written ones only after they reached the disk
+                os.posix_fadvise(src_fd, copied, read, os.POSIX_FADV_DONTNEED)
+            copied += read
+
+            if drop_cache and copied - synced >= DROP_CACHE_SYNC_BYTES:
+                dst.flush()
+                os.fdatasync(dst_fd)
+                os.posix_fadvise(dst_fd, synced, copied - synced, os.POSIX_FADV_DONTNEED)
+                synced = copied
+
+            now = time.perf_counter()
+            if max_rate:
+                ahead = copied / max_rate - (now - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+                    now = time.perf_counter()
+
+            if now >= next_progress:
+                elapsed = now - start
+                log_manager.info(
+                    f"Copying '{label}': {copied / max(total, 1):.0%} "
+                    f"({copied / (1024 ** 2):.0f} of {total / (1024 ** 2):.0f} MB) at {copied / (1024 ** 2) / elapsed:.1f} MB/s"
+                )
+                next_progress = now + PROGRESS_LOG_INTERVAL
+    finally:
+        view.release()
+        buffer.close()
+
+    dst.flush()
+    os.fsync(dst_fd)
+    if drop_cache:
+        os.posix_fadvise(dst_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    if not verify:
+        return None
+
+    # the file on disk must hold exactly what went through the loop
+    dst_size = os.fstat(dst_fd).st_size
+    if dst_size != copied or copied != total:
+        raise OSError(errno.EIO, f"size mismatch after copy (source {total}, copied {copied}, destination {dst_size} bytes)")
+    return read_digest.hexdigest()
+
+
+def _read_back_digest(path: str) -> str:
+    """BLAKE2b hex digest of path as it is on disk. Its cached pages are dropped first, so the data is read
+    back from the disk instead of from the memory it was just written from."""
+
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        if hasattr(os, "posix_fadvise"):
+            # only clean pages can be dropped, which they all are once the copy was fsynced
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+        buffer = mmap.mmap(-1, COPY_CHUNK_SIZE)
+        view = memoryview(buffer)
+        try:
+            while True:
+                read = f.readinto(view)
+                if not read:
+                    break
+                digest.update(view[:read])
+        finally:
+            view.release()
+            buffer.close()
+
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    return digest.hexdigest()
+
+
+PROC_DIR = "/proc"
+
+# inotify(7) event mask and inotify_init1 flags (the latter share their values with O_NONBLOCK and O_CLOEXEC)
+IN_CLOSE_WRITE = 0x00000008
+IN_NONBLOCK = getattr(os, "O_NONBLOCK", 0)
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+
+def _open_writers(path: str) -> list[int] | None:
+    """PIDs that have path open for writing, read from /proc. None when /proc isn't there to ask (not Linux)."""
+
+    if not os.path.isdir(os.path.join(PROC_DIR, "self", "fd")):
+        return None
+
+    target = os.path.realpath(path)
+    writers = []
+    for pid in os.listdir(PROC_DIR):
+        if not pid.isdigit():
+            continue
+
+        # processes of other users can't be looked into. the downloaders run as us, so those never matter here.
+        fd_dir = os.path.join(PROC_DIR, pid, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+
+        for fd in fds:
+            try:
+                if os.readlink(os.path.join(fd_dir, fd)) != target:
+                    continue
+                with open(os.path.join(PROC_DIR, pid, "fdinfo", fd), "r", encoding="utf-8") as f:
+                    flags = 0
+                    for line in f:
+                        if line.startswith("flags:"):
+                            flags = int(line.split()[1], 8)
+                            break
+            except (OSError, ValueError):
+                continue  # closed or exited while we looked
+
+            if flags & (os.O_WRONLY | os.O_RDWR):
+                writers.append(int(pid))
+                break
+
+    return writers
+
+
+class _CloseWriteWatch:
+    """inotify watch for IN_CLOSE_WRITE on a single file. available is False when inotify can't be used."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.fd = -1
+        self.available = False
+
+    def __enter__(self) -> "_CloseWriteWatch":
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            init1 = libc.inotify_init1
+            add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError):
+            return self
+
+        fd = init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return self
+        self.fd = fd
+
+        if add_watch(fd, os.fsencode(self.path), IN_CLOSE_WRITE) < 0:
+            log_manager.debug(f"inotify watch on '{self.path}' failed: {os.strerror(ctypes.get_errno())}")
+            return self
+
+        self.available = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the file to be closed by a writer. Returns whether it was."""
+
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return False
+
+        # drain the queued events, every one of them is an IN_CLOSE_WRITE on our file
+        data = os.read(self.fd, 4096)
+        return len(data) >= struct.calcsize("iIII")
+
+
+def _fsync_dir(path: str) -> None:
+    """Flush a directory entry change (like a rename) to disk. Not every filesystem allows it, which is fine."""
+
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JobWorkspace:
+    """A private temp directory for a single download or listing job."""
+
+    def __init__(self, root_dir: str, label: str) -> None:
+        self.root_dir = root_dir
+        self.label = label
+        self.job_id = f"{label}-{uuid.uuid4().hex[:12]}"
+        self.name = f"{WORKSPACE_PREFIX}{self.job_id}"
+        self.dir = os.path.join(root_dir, self.name)
+        self.output_name = "output"
+        self.output_path = self.path(f"{self.output_name}.mkv")
+        self.scratch_dirs = []  # same named dirs under other roots, see scratch_dir()
+
+    def path(self, name: str) -> str:
+        """Return the path of a file inside this workspace."""
+
+        return os.path.join(self.dir, name)
+
+    def create(self) -> "JobWorkspace":
+        """Create the workspace directory on disk."""
+
+        self._make_dir(self.dir)
+        log_manager.debug(f"Created job workspace {self.dir}")
+        return self
+
+    def scratch_dir(self, root_dir: str) -> str:
+        """Create a directory for this job under another root (like a downloader's temp dir) and return its path.
+        It is removed together with the workspace."""
+
+        path = os.path.join(root_dir, self.name)
+        if path != self.dir and path not in self.scratch_dirs:
+            self._make_dir(path)
+            self.scratch_dirs.append(path)
+            log_manager.debug(f"Created job scratch dir {path}")
+        return path
+
+    def cleanup(self) -> None:
+        """Remove the workspace directory, its scratch dirs and everything in them."""
+
+        for path in [self.dir, *self.scratch_dirs]:
+            if not os.path.isdir(path):
+                continue
+
+            try:
+                rmtree(path)
+                log_manager.debug(f"Removed job workspace {path}")
+            except Exception as e:
+                log_manager.error(f"Failed to remove job workspace {path}: {e}", exc_info=e)
+
+    def _make_dir(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, WORKSPACE_MARKER), "w", encoding="utf-8") as f:
+            f.write(self.job_id)
+
+
+class TransferScheduler:
+    """Runs transfer jobs on one thread per destination device, so separate disks are written in parallel
+    while a single disk never has two copies fighting over it."""
+
+    def __init__(self) -> None:
+        self.lanes = {}  # st_dev -> (queue of jobs waiting for that device, its thread)
+        self.lock = threading.Lock()
+
+    def device_of(self, path: str) -> int:
+        """st_dev of path, or of its nearest existing parent since episode folders are created by the transfer."""
+
+        path = os.path.abspath(path)
+        while True:
+            try:
+                return os.stat(path).st_dev
+            except FileNotFoundError:
+                parent = os.path.dirname(path)
+                if parent == path:
+                    raise
+                path = parent
+
+    def submit(self, dst_path: str, job) -> None:
+        """Queue job (a callable) behind the other transfers to the device dst_path is on."""
+
+        device = self.device_of(dst_path)
+        with self.lock:
+            lane = self.lanes.get(device)
+            if lane is None:
+                jobs = queue.Queue()
+                thread = threading.Thread(target=self._run, args=(device, jobs), name=f"transfer-dev{device}")
+                lane = (jobs, thread)
+                self.lanes[device] = lane
+                thread.start()
+                log_manager.debug(f"Started transfer lane for device {device} ({dst_path})")
+        lane[0].put(job)
+
+    def run(self, dst_path: str, job) -> None:
+        """Run job on the lane of dst_path's device and wait for it to finish."""
+
+        done = threading.Event()
+
+        def _job():
+            try:
+                job()
+            finally:
+                done.set()
+
+        self.submit(dst_path, _job)
+        done.wait()
+
+    def close(self) -> None:
+        """Let every lane finish the jobs it already has, then stop its thread."""
+
+        with self.lock:
+            lanes = list(self.lanes.values())
+            self.lanes.clear()
+
+        for jobs, _ in lanes:
+            jobs.put(None)
+        for _, thread in lanes:
+            thread.join()
+
+    def _run(self, device: int, jobs: queue.Queue) -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                log_manager.debug(f"Stopped transfer lane for device {device}")
+                return
+            try:
+                job()
+            except Exception as e:
+                log_manager.error(f"Transfer job for device {device} failed: {e}", exc_info=e)
+
+
 class FileManager:
     def __init__(self):
         self.source = TEMP_DIR
@@ -19,6 +456,15 @@ class FileManager:
         self.moveRetries = 3         # number of attempts to move file
         self.retryDelay = 5          # seconds between move attempts
 
+        # (strategy, source st_dev, destination st_dev) that failed as unsupported, so they are not tried again
+        self.unsupportedStrategies = set()
+
+        # hash copies while they are written and compare against a read back of the destination before it replaces anything
+        self.verifyTransfers = config.app.verify_transfers
+
+        # one transfer at a time per destination device, shared by every service
+        self.transferScheduler = TransferScheduler()
+
         # destinations get logged per-dir during test(), so keep this line minimal.
         log_manager.info(f"FileManager initialized with: Source: {self.source}")
 
@@ -75,6 +521,25 @@ class FileManager:
     def transfer(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
         """Transfer a file from src_path to dst_path with readiness checks and retries."""
 
+        # read up front, the source may not exist anymore once it was moved
+        try:
+            src_size = os.path.getsize(src_path)
+        except OSError:
+            src_size = 0
+
+        transfer_start = time.perf_counter()
+        transferred = self._transfer(src_path, dst_path, overwrite)
+        transfer_elapsed = time.perf_counter() - transfer_start
+
+        outcome = "success" if transferred else "failure"
+        metrics_manager.inc("mdnx_transfers_total", outcome=outcome)
+        metrics_manager.observe("mdnx_transfer_duration_seconds", transfer_elapsed, outcome=outcome)
+        if transferred:
+            metrics_manager.inc("mdnx_transfer_bytes_total", src_size)
+
+        return transferred
+
+    def _transfer(self, src_path: str, dst_path: str, overwrite: bool) -> bool:
         log_manager.info(f"Starting transfer from '{src_path}' to '{dst_path}'")
 
         src_basename = os.path.basename(src_path)
@@ -121,6 +586,7 @@ class FileManager:
             return False
 
         effective_free = free
+        replace_in_place = False  # only when there is no room for the new copy next to the old one
 
         if overwrite == True and os.path.exists(final_dst):
             try:
@@ -138,12 +604,13 @@ class FileManager:
                 )
                 return False
 
-            try:
-                os.remove(final_dst)
-                log_manager.info(f"Removed existing file at destination: {final_dst}")
-            except Exception as e:
-                log_manager.error(f"Failed to remove existing file {final_dst}: {e}", exc_info=e)
-                return False
+            # the new copy is written next to the old file and renamed over it, so both have to fit for a moment
+            if free < needed:
+                log_manager.warning(
+                    f"Not enough space at '{parent}' to keep '{final_dst}' until its replacement is complete, "
+                    f"removing it first. A failed transfer will leave the episode missing until the next pass."
+                )
+                replace_in_place = True
         elif effective_free < needed:
             log_manager.error(
                 f"Not enough space at '{parent}' to transfer '{src_basename}': "
@@ -157,8 +624,22 @@ class FileManager:
 
         for attempt in range(1, self.moveRetries + 1):
             try:
-                shcopy(src_path, final_dst)
-                log_manager.info(f"Moved '{src_basename}' to '{final_dst}'")
+                move_start = time.perf_counter()
+                if replace_in_place and os.path.exists(final_dst):
+                    os.remove(final_dst)
+                    log_manager.info(f"Removed existing file at destination: {final_dst}")
+
+                strategy = self._move_file(src_path, final_dst)
+                move_elapsed = time.perf_counter() - move_start
+
+                megabytes = needed / (1024 ** 2)
+                if strategy == "rename":
+                    log_manager.info(f"Moved '{src_basename}' to '{final_dst}' by rename ({megabytes:.1f} MB, no data copied)")
+                else:
+                    log_manager.info(
+                        f"Moved '{src_basename}' to '{final_dst}' by {strategy}: "
+                        f"{megabytes:.1f} MB in {move_elapsed:.2f}s ({megabytes / max(move_elapsed, 1e-6):.1f} MB/s)"
+                    )
                 return True
             except Exception as e:
                 log_manager.error(f"(attempt {attempt}) Failed to move '{src_basename}' to '{final_dst}': {e}", exc_info=e)
@@ -167,22 +648,213 @@ class FileManager:
         log_manager.error(f"Failed to move '{src_basename}' after {self.moveRetries} attempts.")
         return False
 
-    def remove_temp_files(self):
-        """Remove all files in the temporary source directory."""
+    def _move_file(self, src_path: str, dst_path: str) -> str:
+        """Move src_path to dst_path with the cheapest method the two filesystems support. Returns the method used.
 
-        for name in os.listdir(self.source):
-            path = os.path.join(self.source, name)
-            log_manager.debug(f"removing {path}")
+        A rename when both are on the same device, otherwise a copy (reflink, copy_file_range, sendfile, then plain)
+        that leaves the source for the job workspace cleanup. Either way dst_path only ever holds a complete file.
+        """
+
+        src_dev = os.stat(src_path).st_dev
+        dst_dev = os.stat(os.path.dirname(dst_path)).st_dev
+
+        if src_dev == dst_dev:
             try:
-                os.remove(path)
-                log_manager.debug(f"Removed {path}")
-            except Exception as e:
-                log_manager.error(f"Failed to remove {path}: {e}", exc_info=e)
+                # the data has to be on disk before the rename, or a crash could swap a good episode for an empty one
+                with open(src_path, "rb") as src:
+                    os.fsync(src.fileno())
+                os.replace(src_path, dst_path)
+                _fsync_dir(os.path.dirname(dst_path))
+                return "rename"
+            except OSError as e:
+                # bind mounts of the same filesystem share st_dev but can't be renamed across
+                if e.errno != errno.EXDEV:
+                    raise
+                log_manager.debug(f"Rename from '{src_path}' to '{dst_path}' crossed a mount, copying instead.")
 
-        log_manager.info(f"Temporary files in {self.source} removed.")
-        return True
+        # not named after the episode, the sanitized name may already be at the filesystem's length limit
+        dst_dir = os.path.dirname(dst_path)
+        partial_path = os.path.join(dst_dir, f"{PARTIAL_PREFIX}{uuid.uuid4().hex[:12]}")
+
+        try:
+            strategy = self._copy_file(src_path, partial_path, src_dev, dst_dev, os.path.basename(dst_path), self._destination_for(dst_path))
+
+            # the partial file is complete and on disk, so the rename can't expose a truncated episode
+            os.replace(partial_path, dst_path)
+            _fsync_dir(dst_dir)
+            return strategy
+        except BaseException:
+            try:
+                os.remove(partial_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log_manager.warning(f"Could not remove partial copy '{partial_path}': {e}")
+            raise
+
+    def _copy_file(self, src_path: str, dst_path: str, src_dev: int, dst_dev: int, label: str, destination: DestinationConfig | None) -> str:
+        """Copy src_path to a new dst_path and fsync it. Returns the method used."""
+
+        max_rate = destination.max_mb_per_sec * 1024 ** 2 if destination else 0
+        drop_cache = destination.drop_page_cache if destination else False
+
+        # the kernel copies can't be throttled, hashed or kept out of the page cache, so those go through our own loop
+        if self.verifyTransfers or max_rate or drop_cache:
+            with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+                src_digest = _chunked_copy(src, dst, label, max_rate, drop_cache, self.verifyTransfers)
+
+            strategy = "copy"
+            if src_digest is not None:
+                # read the copy back from the destination, only that shows what actually reached the disk
+                dst_digest = _read_back_digest(dst_path)
+                if dst_digest != src_digest:
+                    raise OSError(errno.EIO, f"checksum mismatch after copy (source {src_digest}, destination {dst_digest})")
+
+                log_manager.debug(f"Verified copy of '{src_path}': blake2b {src_digest}")
+                strategy = "verified copy"
+
+            if max_rate:
+                strategy += f" capped at {destination.max_mb_per_sec:g} MB/s"
+            return strategy
+
+        for strategy, copy_func in COPY_STRATEGIES:
+            key = (strategy, src_dev, dst_dev)
+            if key in self.unsupportedStrategies:
+                continue
+
+            try:
+                with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+                    copy_func(src, dst)
+                    os.fsync(dst.fileno())
+                return strategy
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                self.unsupportedStrategies.add(key)
+                log_manager.debug(f"{strategy} not supported from device {src_dev} to {dst_dev} ({e}), trying the next method.")
+
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            _chunked_copy(src, dst, label)
+        return "copy"
+
+    def _destination_for(self, path: str) -> DestinationConfig | None:
+        """The destinations entry whose dir holds path. The deepest one wins when dirs are nested."""
+
+        path = os.path.normpath(path)
+        best = None
+        best_len = -1
+        for destination in config.destinations.values():
+            dest_dir = os.path.normpath(destination.dir)
+            if len(dest_dir) > best_len and (path == dest_dir or path.startswith(dest_dir.rstrip(os.sep) + os.sep)):
+                best = destination
+                best_len = len(dest_dir)
+        return best
+
+    def create_workspace(self, label: str, root_dir: str | None = None) -> JobWorkspace:
+        """Create a unique job workspace under root_dir (defaults to TEMP_DIR)."""
+
+        if root_dir is None:
+            root_dir = self.source
+
+        return JobWorkspace(root_dir, label).create()
+
+    def remove_stale_workspaces(self) -> None:
+        """Remove job workspaces left behind by a previous run (crash, kill, etc)."""
+
+        roots = [self.source]
+        for service in SERVICES.all():
+            if not service.enabled:
+                continue
+
+            if service.tool == "mdnx":
+                service_roots = [config.mdnx.dir_path.content]
+            else:
+                service_roots = [service.config.dlpath, service.config.tempPath]
+
+            for root_dir in service_roots:
+                if root_dir not in roots:
+                    roots.append(root_dir)
+
+        for root_dir in roots:
+            if not os.path.isdir(root_dir):
+                continue
+
+            for name in os.listdir(root_dir):
+                path = os.path.join(root_dir, name)
+                # these roots are user dirs too, so a folder that merely looks like a workspace is left alone
+                if not name.startswith(WORKSPACE_PREFIX) or not os.path.isfile(os.path.join(path, WORKSPACE_MARKER)):
+                    continue
+
+                try:
+                    rmtree(path)
+                    log_manager.info(f"Removed stale job workspace {path}")
+                except Exception as e:
+                    log_manager.error(f"Failed to remove stale job workspace {path}: {e}", exc_info=e)
+
+    def remove_stale_partials(self) -> None:
+        """Remove partial copies a previous run left in the destination dirs (killed or crashed mid-copy)."""
+
+        dest_dirs = []
+        for service in SERVICES.all():
+            if not service.enabled:
+                continue
+
+            dest_dir = config.destinations[service.service_name].dir
+            if dest_dir not in dest_dirs:
+                dest_dirs.append(dest_dir)
+
+        for dest_dir in dest_dirs:
+            # partials sit next to the episode they were copied for, anywhere below the destination
+            for dir_path, _, file_names in os.walk(dest_dir):
+                for name in file_names:
+                    if not name.startswith(PARTIAL_PREFIX):
+                        continue
+
+                    path = os.path.join(dir_path, name)
+                    try:
+                        os.remove(path)
+                        log_manager.info(f"Removed stale partial copy {path}")
+                    except OSError as e:
+                        log_manager.error(f"Failed to remove stale partial copy {path}: {e}", exc_info=e)
 
     def _wait_for_ready(self, path):
+        """Wait for a file to become ready: right away once no process has it open for writing anymore.
+
+        Waits on inotify IN_CLOSE_WRITE while a writer still has it open. Falls back to watching the size for
+        readyStableSeconds where /proc or inotify aren't available.
+        """
+
+        if not os.path.exists(path):
+            log_manager.error(f"Failed to check readiness of {path}: file not found")
+            return False
+
+        start = time.time()
+        with _CloseWriteWatch(path) as watch:
+            # the watch is in place before we look, so a close in between still wakes us up
+            while True:
+                writers = _open_writers(path)
+                if writers is None:
+                    break
+
+                if not writers:
+                    log_manager.debug(f"File '{path}' is not open for writing by any process, ready after {time.time() - start:.2f} seconds.")
+                    return True
+
+                if not watch.available:
+                    break
+
+                remaining = self.readyTimeout - (time.time() - start)
+                if remaining <= 0:
+                    log_manager.warning(f"File '{path}' still open for writing by PID(s) {writers} after {self.readyTimeout} seconds timeout.")
+                    return False
+
+                log_manager.debug(f"File '{path}' open for writing by PID(s) {writers}, waiting for it to be closed.")
+                watch.wait(remaining)
+
+        log_manager.debug(f"Can't tell whether '{path}' is still being written, watching its size instead.")
+        return self._wait_for_stable_size(path)
+
+    def _wait_for_stable_size(self, path):
         """Wait for a file to become ready by monitoring its size stability over time."""
 
         lastSize = -1
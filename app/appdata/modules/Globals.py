@@ -3,6 +3,9 @@ import threading
 from .LogManager import LogManager
 log_manager = LogManager()
 
+from .MetricsManager import MetricsManager  # ruff:ignore[module-import-not-at-top-of-file]
+metrics_manager = MetricsManager()
+
 from .FileManager import FileManager  # ruff:ignore[module-import-not-at-top-of-file]
 file_manager = FileManager()
 
@@ -12,5 +15,8 @@ queue_manager = QueueManager()
 from .RemoteSpecials import RemoteSpecials  # ruff:ignore[module-import-not-at-top-of-file]
 remote_specials = RemoteSpecials()
 
+from .ProbeCache import ProbeCache  # ruff:ignore[module-import-not-at-top-of-file]
+probe_cache = ProbeCache()
+
 # Global stop event for threads to check and exit gracefully
 stop_event = threading.Event()
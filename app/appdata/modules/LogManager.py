@@ -1,8 +1,13 @@
 import os
 import sys
-import inspect
+import json
+import time
+import queue
+import atexit
 import threading
 import traceback
+from collections.abc import Callable
+from contextlib import contextmanager
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from zipfile import ZipFile, ZIP_DEFLATED
@@ -18,11 +23,23 @@ LEVEL_VALUES = {
     "CRITICAL": 50
 }
 
+# lines waiting for the writer thread. callers block once this fills up, so nothing is ever dropped.
+# if the writer thread is gone, callers write directly instead of waiting on a queue nobody drains.
+LOG_QUEUE_SIZE = 10000
+
+# seconds between attempts to reopen the log files after opening them failed (full disk, permissions)
+LOG_REOPEN_INTERVAL = 30.0
+
+# how often (seconds) the writer thread flushes the log file and stdout while lines keep coming in
+LOG_FLUSH_INTERVAL = 1.0
+
 
 class LogManager:
     def __init__(self) -> None:
         self.log_dir = LOG_DIR
         self.log_file = os.path.join(self.log_dir, "mdnx-auto-dl.log")
+        self.json_file = os.path.join(self.log_dir, "mdnx-auto-dl.jsonl")
+        self.json_enabled = config.app.log_json
 
         os.makedirs(self.log_dir, exist_ok=True)
 
@@ -35,52 +52,260 @@ class LogManager:
         self.max_archives = config.app.max_log_archives
         self.lock = threading.Lock()
 
+        # rotate while running once the file gets this big / this old. 0 turns either one off.
+        self.max_bytes = config.app.log_rotate_size_mb * 1024 * 1024
+        self.rotate_seconds = config.app.log_rotate_hours * 3600
+
+        # rotated segments are zipped on their own threads. archive_lock keeps zip + prune one at a time.
+        self.archive_lock = threading.Lock()
+        self.compressors = []
+
+        # building a ZoneInfo and formatting the time is only done once per second, not per line
+        self.tz = ZoneInfo(TZ)
+        self.stamp = (None, "")
+
+        # code object -> (filename, funcname), or None for frames that belong to the logger itself
+        self.caller_cache = {}
+
+        # per-thread fields (job_id, service, episode keys...) added to every JSON line, see context()
+        self.context_local = threading.local()
+
+        # lines are written by a background thread through one long lived handle,
+        # so callers (download output parsing etc) never wait on disk I/O.
+        self.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.closed = False
+        self.writer = None
+        self.next_reopen = 0.0
+
         # rotate any existing log from the previous run.
         self._rotate()
+
+        self.handle = open(self.log_file, "a", encoding="utf-8")
+        self.json_handle = open(self.json_file, "a", encoding="utf-8") if self.json_enabled else None
+        self.bytes_written = 0
+        self.next_rotation = self._next_rotation()
+        self.writer = threading.Thread(target=self._writer_loop, name="log-writer", daemon=True)
+        self.writer.start()
+
+        # drain whatever is still queued when the interpreter exits
+        atexit.register(self.close)
+        return
+
+    def close(self) -> None:
+        """Writes out every queued line and stops the writer thread. Safe to call more than once."""
+
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+
+        # a dead writer would never take the stop marker off a full queue
+        while self.writer.is_alive():
+            try:
+                self.queue.put(None, timeout=1)
+                break
+            except queue.Full:
+                continue
+        self.writer.join()
+
+        # lines a racing caller queued behind the stop marker
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._write_item(item)
+        self._flush()
+
+        try:
+            if self.handle is not None:
+                self.handle.close()
+            if self.json_handle is not None:
+                self.json_handle.close()
+        except Exception:
+            pass
+
+        # let running compressions finish so no rotated segment is left unzipped
+        for compressor in list(self.compressors):
+            compressor.join()
         return
 
-    def debug(self, message: str, exc_info=None) -> None:
+    @contextmanager
+    def context(self, **fields):
+        """Adds fields (job_id, service, series_id, ...) to every JSON log line and event written by this thread inside the block."""
+
+        previous = getattr(self.context_local, "fields", {})
+        self.context_local.fields = {**previous, **fields}
+        try:
+            yield
+        finally:
+            self.context_local.fields = previous
+
+    def event(self, stage: str, duration: float | None = None, **fields) -> None:
+        """Writes a structured event (stage, duration in seconds, extra fields) to the JSON log. No-op unless LOG_JSON is on."""
+
+        if not self.json_enabled:
+            return
+
+        record = {
+            "time": datetime.now(self.tz).isoformat(timespec="milliseconds"),
+            "level": "EVENT",
+            "stage": stage
+        }
+        record.update(getattr(self.context_local, "fields", {}))
+        if duration is not None:
+            record["duration"] = round(duration, 3)
+        record.update(fields)
+
+        self._write_line(None, json_line=json.dumps(record, ensure_ascii=False, default=str))
+        return
+
+    def is_enabled(self, level: str) -> bool:
+        """Returns True if a message at this level would be written. Unknown levels count as INFO."""
+        return LEVEL_VALUES.get(level.upper(), LEVEL_VALUES["INFO"]) >= self.min_level
+
+    def debug(self, message: str | Callable[[], str], exc_info=None) -> None:
         """Logs a debug-level message."""
         self._log(message, level="DEBUG", exc_info=exc_info)
         return
 
-    def info(self, message: str, exc_info=None) -> None:
+    def info(self, message: str | Callable[[], str], exc_info=None) -> None:
         """Logs an info-level message."""
         self._log(message, level="INFO", exc_info=exc_info)
         return
 
-    def warning(self, message: str, exc_info=None) -> None:
+    def warning(self, message: str | Callable[[], str], exc_info=None) -> None:
         """Logs a warning-level message."""
         self._log(message, level="WARNING", exc_info=exc_info)
         return
 
-    def error(self, message: str, exc_info=None) -> None:
+    def error(self, message: str | Callable[[], str], exc_info=None) -> None:
         """Logs an error-level message."""
         self._log(message, level="ERROR", exc_info=exc_info)
         return
 
-    def critical(self, message: str, exc_info=None) -> None:
+    def critical(self, message: str | Callable[[], str], exc_info=None) -> None:
         """Logs a critical-level message."""
         self._log(message, level="CRITICAL", exc_info=exc_info)
         return
 
     def _rotate(self) -> None:
-        """Archives the current log file and prunes old archives if necessary."""
+        """Archives the logs left by the previous run (and any segment a crash left unzipped) in the background."""
+
+        log_stem, _ = os.path.splitext(os.path.basename(self.log_file))
 
         with self.lock:
-            if not os.path.exists(self.log_file):
-                return
+            leftovers = set()
+            for name in os.listdir(self.log_dir):
+                if name.startswith(log_stem + "_") and name.endswith((".log", ".jsonl")):
+                    leftovers.add(os.path.join(self.log_dir, os.path.splitext(name)[0]))
 
-            if os.path.getsize(self.log_file) == 0:
-                return
+            segment = self._rename_current_log()
+            if segment is not None:
+                leftovers.add(segment)
 
-            self._archive_current_log()
-            self._prune_archives()
+        for segment in sorted(leftovers):
+            self._compress_in_background(segment)
 
         return
 
-    def _log(self, message: str, level: str = "INFO", exc_info=None) -> None:
-        """Logs a message with the specified level to both terminal and log file."""
+    def _next_rotation(self) -> float | None:
+        if self.rotate_seconds <= 0:
+            return None
+        return time.monotonic() + self.rotate_seconds
+
+    def _should_rotate(self) -> bool:
+        if self.bytes_written == 0:
+            return False
+
+        if self.max_bytes > 0 and self.bytes_written >= self.max_bytes:
+            return True
+
+        return self.next_rotation is not None and time.monotonic() >= self.next_rotation
+
+    def _rotate_open_log(self) -> None:
+        """Swaps the live log file for a fresh one. Only called from the writer thread, which owns the handle."""
+
+        self._flush()
+        segment = None
+        try:
+            if self.handle is not None:
+                self.handle.close()
+            if self.json_handle is not None:
+                self.json_handle.close()
+            segment = self._rename_current_log()
+        except Exception as e:
+            print(f"[ERROR] Failed to rotate {self.log_file}: {e}", file=sys.stderr, flush=True)
+        finally:
+            # whatever happened, keep logging. if the files can't be reopened, _write_item retries later.
+            self._reopen_handles()
+            self.bytes_written = 0
+            self.next_rotation = self._next_rotation()
+
+        if segment is not None:
+            self._compress_in_background(segment)
+
+    def _reopen_handles(self) -> bool:
+        """Opens fresh handles on the log files. On failure both are left as None and False is returned."""
+
+        self.handle = None
+        if self.json_enabled:
+            self.json_handle = None
+
+        try:
+            self.handle = open(self.log_file, "a", encoding="utf-8")
+            if self.json_enabled:
+                self.json_handle = open(self.json_file, "a", encoding="utf-8")
+        except Exception as e:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+            self.next_reopen = time.monotonic() + LOG_REOPEN_INTERVAL
+            print(f"[ERROR] Failed to open {self.log_file}: {e}. Retrying in {LOG_REOPEN_INTERVAL:.0f} seconds.", file=sys.stderr, flush=True)
+            return False
+        return True
+
+    def _rename_current_log(self) -> str | None:
+        """Moves the current text and JSON logs aside to a timestamped segment.
+
+        Returns the segment path without extension, or None if both logs were empty.
+        """
+
+        sources = []
+        for source in (self.log_file, self.json_file):
+            if os.path.exists(source) and os.path.getsize(source) > 0:
+                sources.append(source)
+
+        if not sources:
+            return None
+
+        log_stem, _ = os.path.splitext(os.path.basename(self.log_file))
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # size rotation can fire more than once a second under heavy debug logging
+        segment = os.path.join(self.log_dir, f"{log_stem}_{timestamp}")
+        counter = 1
+        while any(os.path.exists(segment + extension) for extension in (".log", ".jsonl", ".zip")):
+            segment = os.path.join(self.log_dir, f"{log_stem}_{timestamp}_{counter}")
+            counter += 1
+
+        for source in sources:
+            os.replace(source, segment + os.path.splitext(source)[1])
+        return segment
+
+    def _compress_in_background(self, segment: str) -> None:
+        self.compressors = [compressor for compressor in self.compressors if compressor.is_alive()]
+
+        compressor = threading.Thread(target=self._compress_segment, args=(segment,), name="log-compress", daemon=True)
+        self.compressors.append(compressor)
+        compressor.start()
+
+    def _log(self, message: str | Callable[[], str], level: str = "INFO", exc_info=None) -> None:
+        """Logs a message with the specified level to both terminal and log file.
+
+        message can be a callable returning the string, so expensive messages are only built when the level is enabled.
+        """
 
         level_name = level.upper()
         level_value = LEVEL_VALUES.get(level_name)
@@ -93,34 +318,63 @@ class LogManager:
         if level_value < self.min_level:
             return
 
-        filename, funcname = self._get_caller()
+        if callable(message):
+            try:
+                message = message()
+            except Exception as e:
+                message = f"<failed to build log message: {e!r}>"
 
-        # time_str: 6:00:00 AM
-        # date_str: 19/11/2025
-        now = datetime.now(ZoneInfo(TZ))
-        time_str = now.strftime("%I:%M:%S %p")
-        date_str = now.strftime("%d/%m/%Y")
+        filename, funcname = self._get_caller()
+        stamp = self._timestamp()
 
         terminal_line = f"[{level_name}] {message}"
-        logfile_line = f"[{time_str} {date_str}] [{level_name}] [{filename}<{funcname}>] - {message}"
-
-        self._write_line(logfile_line)
+        logfile_lines = [f"[{stamp}] [{level_name}] [{filename}<{funcname}>] - {message}"]
 
         # if exc_info is provided, append a formatted traceback to the log file.
+        traceback_text = None
         norm = self._normalize_exc_info(exc_info)
         if norm is not None:
             try:
                 traceback_text = "".join(traceback.format_exception(*norm)).rstrip("\n")
                 for traceback_line in traceback_text.splitlines():
-                    self._write_line(f"[{time_str} {date_str}] [{level_name}] [{filename}<{funcname}>] - {traceback_line}")
+                    logfile_lines.append(f"[{stamp}] [{level_name}] [{filename}<{funcname}>] - {traceback_line}")
             except Exception:
                 # avoid raising from the logger itself.
                 pass
 
-        print(terminal_line, file=sys.stdout, flush=True)
+        json_line = None
+        if self.json_enabled:
+            record = {
+                "time": datetime.now(self.tz).isoformat(timespec="milliseconds"),
+                "level": level_name,
+                "file": filename,
+                "func": funcname,
+                "message": message
+            }
+            record.update(getattr(self.context_local, "fields", {}))
+            if traceback_text is not None:
+                record["traceback"] = traceback_text
+            json_line = json.dumps(record, ensure_ascii=False, default=str)
+
+        self._write_line("\n".join(logfile_lines), terminal_line, json_line)
 
         return
 
+    def _timestamp(self) -> str:
+        """Returns the "6:00:00 AM 19/11/2025" stamp for the current second, formatting it at most once a second."""
+
+        second = int(time.time())
+
+        # one tuple so a racing thread never pairs a new second with an old string
+        cached_second, cached_stamp = self.stamp
+        if cached_second == second:
+            return cached_stamp
+
+        now = datetime.fromtimestamp(second, self.tz)
+        stamp = f"{now.strftime('%I:%M:%S %p')} {now.strftime('%d/%m/%Y')}"
+        self.stamp = (second, stamp)
+        return stamp
+
     def _normalize_exc_info(self, exc_info):
         """Normalize exc_info into (exc_type, exc_value, tb) tuple or None."""
 
@@ -138,24 +392,37 @@ class LogManager:
 
         return None
 
-    def _archive_current_log(self) -> None:
-        """Archives the current log file into a zip with a timestamped name."""
+    def _compress_segment(self, segment: str) -> None:
+        """Zips a rotated log segment (text and JSON log), removes it and prunes old archives."""
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        zip_name = segment + ".zip"
+        partial_name = zip_name + ".part"
 
-        log_basename = os.path.basename(self.log_file)
-        log_stem, _ = os.path.splitext(log_basename)
+        members = []
+        for source in (self.log_file, self.json_file):
+            extension = os.path.splitext(source)[1]
+            if os.path.exists(segment + extension):
+                members.append((segment + extension, os.path.basename(source)))
 
-        zip_name = os.path.join(self.log_dir, f"{log_stem}_{timestamp}.zip")
+        if not members:
+            return
 
-        try:
-            with ZipFile(zip_name, mode="w", compression=ZIP_DEFLATED) as zf:
-                zf.write(self.log_file, arcname=log_basename)
-        finally:
+        with self.archive_lock:
             try:
-                os.remove(self.log_file)
-            except FileNotFoundError:
-                pass
+                # written under another name first so pruning never counts a half written archive
+                with ZipFile(partial_name, mode="w", compression=ZIP_DEFLATED) as zf:
+                    for member_path, arcname in members:
+                        zf.write(member_path, arcname=arcname)
+                os.replace(partial_name, zip_name)
+                for member_path, _ in members:
+                    os.remove(member_path)
+                self._prune_archives()
+            except Exception as e:
+                self.error(f"Failed to archive log segment {segment}: {e}", exc_info=e)
+                try:
+                    os.remove(partial_name)
+                except FileNotFoundError:
+                    pass
         return
 
     def _prune_archives(self) -> None:
@@ -181,46 +448,147 @@ class LogManager:
                 pass
         return
 
-    def _write_line(self, line) -> None:
-        """Writes a line to the log file with thread safety."""
+    def _write_line(self, line: str | None, terminal_line: str | None = None, json_line: str | None = None) -> None:
+        """Queues a line for the log file, terminal and JSON log (each optional).
 
+        Writes directly once the writer is closed or has died, so a caller can never block on a queue nobody drains.
+        """
+
+        item = (line, terminal_line, json_line)
+        while not self.closed:
+            writer = self.writer
+            if writer is not None and not writer.is_alive():
+                break
+            try:
+                self.queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+        # logging after close() (late atexit handlers etc) or without a writer. slow path, but nothing gets lost.
         with self.lock:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+            try:
+                if line is not None:
+                    with open(self.log_file, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+                if json_line is not None:
+                    with open(self.json_file, "a", encoding="utf-8") as f:
+                        f.write(json_line + "\n")
+            except Exception:
+                pass
+        if terminal_line is not None:
+            try:
+                print(terminal_line, file=sys.stdout, flush=True)
+            except Exception:
+                pass
         return
 
+    def _writer_loop(self) -> None:
+        """Background thread that owns the log file handle."""
+
+        try:
+            self._write_queued()
+        except BaseException as e:
+            # callers notice the thread is gone and write directly from here on
+            print(f"[ERROR] Log writer stopped: {e!r}. Writing log lines directly from now on.", file=sys.stderr, flush=True)
+
+    def _write_queued(self) -> None:
+        dirty = False
+        last_flush = time.monotonic()
+
+        while True:
+            try:
+                item = self.queue.get(timeout=LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                item = False
+
+            # idle, or the interval passed while lines kept coming in
+            if dirty and (item is False or item is None or time.monotonic() - last_flush >= LOG_FLUSH_INTERVAL):
+                self._flush()
+                dirty = False
+                last_flush = time.monotonic()
+
+            if item is None:
+                return
+
+            if item is not False:
+                self._write_item(item)
+                dirty = True
+
+            if self._should_rotate():
+                self._rotate_open_log()
+                dirty = False
+
+    def _write_item(self, item: tuple[str | None, str | None, str | None]) -> None:
+        line, terminal_line, json_line = item
+
+        if self.handle is None and time.monotonic() >= self.next_reopen:
+            self._reopen_handles()
+
+        try:
+            # characters, not bytes. close enough for a size limit and much cheaper than encoding twice.
+            if line is not None and self.handle is not None:
+                self.handle.write(line + "\n")
+                self.bytes_written += len(line) + 1
+            if json_line is not None and self.json_handle is not None:
+                self.json_handle.write(json_line + "\n")
+                self.bytes_written += len(json_line) + 1
+            if terminal_line is not None:
+                sys.stdout.write(terminal_line + "\n")
+        except Exception:
+            # a full disk or closed stdout must not kill the writer
+            pass
+
+    def _flush(self) -> None:
+        try:
+            if self.handle is not None:
+                self.handle.flush()
+            if self.json_handle is not None:
+                self.json_handle.flush()
+            sys.stdout.flush()
+        except Exception:
+            pass
+
     def _get_caller(self):
         """
         Returns (filename, function_name) of the caller of self._log().
 
-        Stack frames:
-        0 -> _get_caller
-        1 -> _log
-        2 -> info/debug/etc
-        3 -> caller (or Vars._log wrapper, which is skipped to reach the caller)
+        Frames that live in this logger module and the Vars._log wrapper are skipped to reach the caller.
+        What each code object resolves to is cached, so this is a dict lookup per frame.
         """
         try:
-            frame = inspect.currentframe().f_back
+            frame = sys._getframe(1)
 
-            # skip frames that live in this logger module
-            while frame is not None and frame.f_code.co_filename == __file__:
-                frame = frame.f_back
-
-            # skip the Vars._log wrapper that forwards into this logger
-            if frame is not None:
+            while frame is not None:
                 code = frame.f_code
-                if os.path.basename(code.co_filename) == "Vars.py" and code.co_name == "_log":
-                    frame = frame.f_back
+                try:
+                    caller = self.caller_cache[code]
+                except KeyError:
+                    caller = self._describe_code(code)
+                    self.caller_cache[code] = caller
+
+                if caller is not None:
+                    return caller
 
-            if frame is None:
-                return "<unknown>", "<unknown>"
+                frame = frame.f_back
         except Exception:
-            return "<unknown>", "<unknown>"
+            pass
+
+        return "<unknown>", "<unknown>"
+
+    def _describe_code(self, code) -> tuple[str, str] | None:
+        """Returns (filename, function_name) for a code object, or None if it is part of the logging path."""
+
+        if code.co_filename == __file__:
+            return None
 
-        code = frame.f_code
         filename = os.path.basename(code.co_filename)
         funcname = code.co_name
 
+        # the Vars._log wrapper that forwards into this logger
+        if filename == "Vars.py" and funcname == "_log":
+            return None
+
         if funcname == "<module>":
             funcname = "__root__"
 
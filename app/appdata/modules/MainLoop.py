@@ -1,19 +1,171 @@
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from .MediaServerManager import mediaserver_scan_library
-from .Globals import file_manager, queue_manager, log_manager, remote_specials, stop_event
+from .Globals import file_manager, queue_manager, log_manager, metrics_manager, remote_specials, stop_event
+from .Profiler import IterationProfiler, thread_label
 from .ServiceHelper import get_wanted_dubs_and_subs, probe_streams, select_dubs, select_subs
 from .Vars import (
     config,
-    JELLY_CONFIGURED, PLEX_CONFIGURED, SERVICES, TEMP_DIR, TZ,
+    JELLY_CONFIGURED, LOG_DIR, PLEX_CONFIGURED, SERVICES, TZ,
     format_duration, get_episode_file_path, get_season_monitor_config, iter_episodes
 )
 from .types.queue import Episode, ServiceBucket
 
 
+class PostStage:
+    """Runs the transfer/probe step of finished downloads on FileManager's transfer scheduler.
+
+    At most queue_size + 1 finished downloads of a service wait there at once (the same as a queue of queue_size
+    with one job in progress), the rest of the download loop blocks in submit until one is done.
+    """
+
+    def __init__(self, service_label: str, handler, queue_size: int) -> None:
+        self.service_label = service_label
+        self.handler = handler
+        self.limit = queue_size + 1
+        self.pending = 0
+        self.idle = threading.Condition()
+
+        # a queue size of 0 means no pipelining, the download thread waits for each job to finish.
+        self.pipelined = queue_size > 0
+
+    def submit(self, job: dict) -> bool:
+        """Hand a finished download to the post stage. Blocks while too many are waiting. False if stop was requested.
+
+        The job is handed over either way, a finished download is always transferred, even on stop.
+        """
+
+        job["queued_at"] = time.perf_counter()
+
+        # even then the job runs on its device's transfer lane, so other services never copy to the same disk alongside it
+        if not self.pipelined:
+            try:
+                file_manager.transferScheduler.run(job["file_path"], lambda: self._handle_labelled(job))
+            except OSError as e:
+                log_manager.warning(f"[{self.service_label}] Could not schedule the transfer of {job['file_path']} ({e}). Running it here.")
+                self._handle(job)
+            return True
+
+        stopping = False
+        with self.idle:
+            while self.pending >= self.limit:
+                if stop_event.is_set():
+                    # go over the limit instead of dropping it, the transfer lanes finish every job before shutdown
+                    log_manager.info(f"[{self.service_label}] Stop requested. Queueing {os.path.basename(job['file_path'])} for transfer before exiting.")
+                    stopping = True
+                    break
+                self.idle.wait(timeout=1)
+            self.pending += 1
+
+        try:
+            file_manager.transferScheduler.submit(job["file_path"], lambda: self._run(job))
+        except OSError as e:
+            log_manager.warning(f"[{self.service_label}] Could not schedule the transfer of {job['file_path']} ({e}). Running it here.")
+            self._run(job)
+        return not stopping
+
+    def close(self) -> None:
+        """Wait for every submitted job to finish."""
+
+        with self.idle:
+            while self.pending > 0:
+                self.idle.wait()
+
+    def _run(self, job: dict) -> None:
+        try:
+            self._handle_labelled(job)
+        finally:
+            self._done()
+
+    def _handle_labelled(self, job: dict) -> None:
+        with thread_label(self.service_label):
+            self._handle(job)
+
+    def _done(self) -> None:
+        with self.idle:
+            self.pending -= 1
+            self.idle.notify_all()
+
+    def _handle(self, job: dict) -> None:
+        # same job_id/episode fields the download thread logged with
+        with log_manager.context(**job["log_context"]):
+            try:
+                log_manager.event("post_queue", duration=time.perf_counter() - job["queued_at"])
+                self.handler(job)
+            except Exception as e:
+                log_manager.error(f"[{self.service_label}] Post-download step failed for {job['file_path']}: {e}", exc_info=e)
+            finally:
+                job["workspace"].cleanup()
+
+
+class ProbePrefetcher:
+    """Probes the upcoming files of a dub/sub pass on a small thread pool, a few files ahead of the caller."""
+
+    def __init__(self, service: str, service_label: str, file_paths: list[str], workers: int) -> None:
+        self.service = service
+        self.service_label = service_label
+        self.file_paths = file_paths
+        self.workers = workers
+        self.next_index = 0
+        self.futures = {}
+        self.pool = None
+
+        # a single worker means no prefetching, files are probed inline when asked for.
+        if workers > 1 and len(file_paths) > 1:
+            self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{service_label}-probe")
+
+    def get(self, file_path: str) -> tuple[set, set] | None:
+        """Return probe_streams for file_path, waiting on its prefetch if one is running. None if stop was requested."""
+
+        if self.pool is None:
+            return probe_streams(file_path, self.service)
+
+        self._fill()
+
+        future = self.futures.pop(file_path, None)
+        if future is None:
+            return probe_streams(file_path, self.service)
+
+        while True:
+            try:
+                result = future.result(timeout=1)
+                break
+            except TimeoutError:
+                if stop_event.is_set():
+                    return None
+
+        # keep the pool busy with the files after this one
+        self._fill()
+        return result
+
+    def close(self) -> None:
+        """Cancel outstanding prefetches and release the pool."""
+
+        if self.pool is None:
+            return
+
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.futures.clear()
+
+    def _fill(self) -> None:
+        # keep one probe per worker in flight
+        while len(self.futures) < self.workers and self.next_index < len(self.file_paths):
+            file_path = self.file_paths[self.next_index]
+            self.next_index += 1
+            self.futures[file_path] = self.pool.submit(self._probe, file_path)
+
+    def _probe(self, file_path: str) -> tuple[set, set] | None:
+        if stop_event.is_set():
+            return None
+        with thread_label(self.service_label):
+            return probe_streams(file_path, self.service)
+
+
 class MainLoop:
     def __init__(self, notifiers) -> None:
 
@@ -25,7 +177,12 @@ class MainLoop:
         self.only_create_queue = config.app.only_create_queue
         self.skip_queue_refresh = config.app.skip_queue_refresh
         self.dry_run = config.app.dry_run
+        self.max_concurrent_downloads = config.app.max_concurrent_downloads
+        self.pipeline_queue_size = config.app.pipeline_queue_size
+        self.probe_workers = config.app.probe_workers
+        self.profile_iteration = config.app.profile_iteration
         self.notifications_buffer = []
+        self.notifications_lock = threading.Lock()
         stop_event.clear()
 
         log_manager.debug("MainLoop initialized.")
@@ -33,60 +190,67 @@ class MainLoop:
     def mainloop(self) -> None:
         try:
             while not stop_event.is_set():
-                log_manager.debug("Executing MainLoop task.")
-
-                # pull the latest remote-specials.yaml and rebuild internal state for overrides.
-                remote_specials.refresh()
-
-                if self.skip_queue_refresh is True:
-                    log_manager.info("SKIP_QUEUE_REFRESH is True. Skipping queue refresh step and using old queue data.")
+                if self.profile_iteration:
+                    # only the first iteration after startup is profiled
+                    self.profile_iteration = False
+                    with IterationProfiler(LOG_DIR):
+                        finished = self._run_iteration()
                 else:
-                    self._refresh_queue()
+                    finished = self._run_iteration()
 
-                # push anything this iteration wrote out of the WAL file and into queue.db
-                queue_manager.checkpoint()
+                if finished:
+                    return
 
-                if self.only_create_queue == True:
-                    log_manager.info("ONLY_CREATE_QUEUE is True. Exiting after queue creation.\nIf docker-compose.yaml has 'restart: always/unless-stopped', please change it to 'restart: no' to prevent restart loop.")
-                    self.stop()
+                # wait for self.loop_timeout seconds or exit early if stop is requested.
+                log_manager.info(f"MainLoop iteration completed. Next iteration in {format_duration(self.loop_timeout)} ({(datetime.now(ZoneInfo(TZ)) + timedelta(seconds=self.loop_timeout)).strftime('%I:%M:%S %p')}).")
+                if self._wait_or_interrupt(timeout=self.loop_timeout):
                     return
+        finally:
+            log_manager.info("MainLoop exited.")
 
-                # Download any missing / not yet downloaded episodes for every configured service.
-                # then (if configured) check for missing dubs/subs on already downloaded episodes.
-                for service in SERVICES.all():
-                    if not service.configured:
-                        continue
+    def _run_iteration(self) -> bool:
+        """Run one pass over every service. Returns True if the main loop should exit afterwards."""
 
-                    self._download_for_service(service.service_name, service.display_name, service.api)
+        log_manager.debug("Executing MainLoop task.")
 
-                    if self.check_missing_dub_sub == True:
-                        self._refresh_dub_sub_for_service(service.service_name, service.display_name, service.api)
-                    else:
-                        log_manager.info(f"[{service.display_name}] CHECK_MISSING_DUB_SUB is False. Skipping dub/sub verification.")
+        # pull the latest remote-specials.yaml and rebuild internal state for overrides.
+        remote_specials.refresh()
 
-                if self.dry_run:
-                    log_manager.info("DRY_RUN is True. Exiting after one iteration of the main loop.\nIf docker-compose.yaml has 'restart: always/unless-stopped', please change it to 'restart: no' to prevent restart loop.")
-                    self.stop()
-                    return
+        if self.skip_queue_refresh is True:
+            log_manager.info("SKIP_QUEUE_REFRESH is True. Skipping queue refresh step and using old queue data.")
+        else:
+            self._refresh_queue()
 
-                # trigger media server scan if configured and there are new items in the notifications buffer.
-                if len(self.notifications_buffer) > 0 and (PLEX_CONFIGURED is True or JELLY_CONFIGURED is True):
-                    log_manager.info("Triggering media server scan.")
-                    mediaserver_scan_library()
+        # push anything this iteration wrote out of the WAL file and into queue.db
+        queue_manager.checkpoint()
 
-                if self.notifications_buffer:
-                    log_manager.info("Flushing notifications buffer.")
-                    self._flush_notifications()
+        if self.only_create_queue == True:
+            log_manager.info("ONLY_CREATE_QUEUE is True. Exiting after queue creation.\nIf docker-compose.yaml has 'restart: always/unless-stopped', please change it to 'restart: no' to prevent restart loop.")
+            self.stop()
+            return True
 
-                # push anything this iteration wrote out of the WAL file and into queue.db
-                queue_manager.checkpoint()
+        # Download any missing / not yet downloaded episodes for every configured service.
+        # then (if configured) check for missing dubs/subs on already downloaded episodes.
+        self._run_service_workers()
 
-                # wait for self.loop_timeout seconds or exit early if stop is requested.
-                log_manager.info(f"MainLoop iteration completed. Next iteration in {format_duration(self.loop_timeout)} ({(datetime.now(ZoneInfo(TZ)) + timedelta(seconds=self.loop_timeout)).strftime('%I:%M:%S %p')}).")
-                if self._wait_or_interrupt(timeout=self.loop_timeout):
-                    return
-        finally:
-            log_manager.info("MainLoop exited.")
+        if self.dry_run:
+            log_manager.info("DRY_RUN is True. Exiting after one iteration of the main loop.\nIf docker-compose.yaml has 'restart: always/unless-stopped', please change it to 'restart: no' to prevent restart loop.")
+            self.stop()
+            return True
+
+        # trigger media server scan if configured and there are new items in the notifications buffer.
+        if len(self.notifications_buffer) > 0 and (PLEX_CONFIGURED is True or JELLY_CONFIGURED is True):
+            log_manager.info("Triggering media server scan.")
+            mediaserver_scan_library()
+
+        if self.notifications_buffer:
+            log_manager.info("Flushing notifications buffer.")
+            self._flush_notifications()
+
+        # push anything this iteration wrote out of the WAL file and into queue.db
+        queue_manager.checkpoint()
+
+        return False
 
     def stop(self) -> None:
         """Signal the main loop to stop."""
@@ -115,6 +279,107 @@ class MainLoop:
 
         return False
 
+    def _run_service_workers(self) -> None:
+        """Run the download worker of every configured service, at most MAX_CONCURRENT_DOWNLOADS at a time."""
+
+        services = []
+        for service in SERVICES.all():
+            if service.configured:
+                services.append(service)
+
+        if not services:
+            return
+
+        if self.max_concurrent_downloads <= 1 or len(services) == 1:
+            for service in services:
+                if stop_event.is_set():
+                    return
+                self._service_worker(service)
+            return
+
+        max_workers = min(self.max_concurrent_downloads, len(services))
+        log_manager.info(f"Running download workers for {len(services)} services ({max_workers} at a time).")
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download-worker") as executor:
+            futures = {}
+            for service in services:
+                futures[executor.submit(self._service_worker, service)] = service
+
+            for future in as_completed(futures):
+                service = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    log_manager.error(f"[{service.display_name}] Download worker failed: {e}")
+
+    def _service_worker(self, service) -> None:
+        """Download new episodes, then (if configured) verify dubs/subs for a single service."""
+
+        with thread_label(service.display_name):
+            self._download_for_service(service.service_name, service.display_name, service.api)
+
+            if self.check_missing_dub_sub == True:
+                self._refresh_dub_sub_for_service(service.service_name, service.display_name, service.api)
+            else:
+                log_manager.info(f"[{service.display_name}] CHECK_MISSING_DUB_SUB is False. Skipping dub/sub verification.")
+
+    def _buffer_notification(self, snapshot: dict) -> None:
+        """Append a snapshot to the notification buffer. Safe to call from any download worker."""
+
+        with self.notifications_lock:
+            self.notifications_buffer.append(snapshot)
+
+    def _finish_download(self, job: dict) -> None:
+        """Transfer a finished download to its destination, update the queue and buffer a notification."""
+
+        service_label = job["service_label"]
+
+        if job["action"] == "new":
+            transfer_start = time.perf_counter()
+            transferred = file_manager.transfer(job["workspace"].output_path, job["file_path"])
+            log_manager.event("transfer", duration=time.perf_counter() - transfer_start, success=transferred)
+
+            if transferred:
+                log_manager.info(f"[{service_label}] Transfer complete.")
+                queue_manager.update_episode_status(job["series_id"], job["season_key"], job["episode_key"], True, job["service"])
+
+                probe_start = time.perf_counter()
+                snapshot = self._snapshot_episode(
+                    job["series_name"], job["episode"], job["file_path"], job["time_taken"], "new", job["service"]
+                )
+                log_manager.event("probe", duration=time.perf_counter() - probe_start)
+
+                self._buffer_notification(snapshot)
+            else:
+                log_manager.error(f"[{service_label}] Transfer failed.")
+                queue_manager.update_episode_status(job["series_id"], job["season_key"], job["episode_key"], False, job["service"])
+            return
+
+        transfer_start = time.perf_counter()
+        transferred = file_manager.transfer(job["workspace"].output_path, job["file_path"], overwrite=True)
+        log_manager.event("transfer", duration=time.perf_counter() - transfer_start, success=transferred)
+
+        if transferred:
+            log_manager.info(f"[{service_label}] Transfer complete.")
+
+            probe_start = time.perf_counter()
+            snapshot = self._snapshot_episode(
+                job["series_name"], job["episode"], job["file_path"], job["time_taken"], "updated", job["service"],
+                before_dubs=job["before_dubs"], before_subs=job["before_subs"]
+            )
+            log_manager.event("probe", duration=time.perf_counter() - probe_start)
+
+            self._buffer_notification(snapshot)
+        else:
+            log_manager.error(f"[{service_label}] Transfer failed")
+
+    def _record_download(self, service: str, elapsed: float, successful: bool) -> None:
+        """Count one download_episode call in the metrics."""
+
+        outcome = "success" if successful else "failure"
+        metrics_manager.inc("mdnx_downloads_total", service=service, outcome=outcome)
+        metrics_manager.observe("mdnx_download_duration_seconds", elapsed, service=service, outcome=outcome)
+
     def _snapshot_episode(
         self,
         series_name: str,
@@ -273,11 +538,16 @@ class MainLoop:
 
         try:
             for notifier in self.notifiers:
+                notifier_name = type(notifier).__name__.lower()
                 if notifier.send_per_series:
                     for group in groups:
+                        send_start = time.perf_counter()
                         notifier.notify_series(group["action"], group["series_name"], group["blocks"])
+                        metrics_manager.observe("mdnx_notification_duration_seconds", time.perf_counter() - send_start, notifier=notifier_name)
                 else:
+                    send_start = time.perf_counter()
                     notifier.notify(subject, body)
+                    metrics_manager.observe("mdnx_notification_duration_seconds", time.perf_counter() - send_start, notifier=notifier_name)
         finally:
             self.notifications_buffer.clear()
 
@@ -296,43 +566,57 @@ class MainLoop:
                 log_manager.info(f"[{service.display_name}] Queue refresh skipped because the service wasnt enabled.")
                 continue
 
-            # only look at the correct bucket inside the queue db for this service
-            bucket = queue_manager.output(service.service_name)
-            if bucket is None:
-                bucket = ServiceBucket()
+            refresh_start = time.perf_counter()
 
-            queue_ids = set(bucket.series.keys())
+            # every monitor update for this service is written to queue.db in one transaction
+            with queue_manager.batch(), thread_label(service.display_name):
+                refreshed = self._refresh_service_queue(service)
 
-            # if both lists are empty, nothing to do, exit early
-            if not service.monitor_series_id and not queue_ids:
-                log_manager.info(f"[{service.display_name}] Your '{service.monitor_config_key}' list is empty. Skipped refreshing empty list.")
-                continue
+            metrics_manager.observe("mdnx_queue_refresh_duration_seconds", time.perf_counter() - refresh_start, service=service.service_name)
+            if not refreshed:
+                return
 
-            log_manager.info(f"[{service.display_name}] Checking monitors...")
-            for series_id in service.monitor_series_id:
-                if stop_event.is_set():
-                    log_manager.info(f"[{service.display_name}] Stop requested. Aborting monitor refresh.")
-                    return
-                if series_id not in queue_ids:
-                    log_manager.info(f"[{service.display_name}] Starting monitor for {series_id}")
-                    service.api.start_monitor(series_id)
-                else:
-                    log_manager.info(f"[{service.display_name}] Updating monitor for {series_id}")
-                    service.api.update_monitor(series_id)
+        log_manager.info("Queue refresh complete.")
 
-            # stop monitors for series removed from config so they are no longer monitored
-            log_manager.info(f"[{service.display_name}] Checking monitors to stop...")
-            for series_id in queue_ids:
-                if stop_event.is_set():
-                    log_manager.info(f"[{service.display_name}] Stop requested. Aborting monitor cleanup.")
-                    return
-                if series_id not in service.monitor_series_id:
-                    log_manager.info(f"[{service.display_name}] Stopping monitor for {series_id}")
-                    service.api.stop_monitor(series_id)
+    def _refresh_service_queue(self, service) -> bool:
+        """Start/update/stop the monitors of one service. False if a stop was requested midway."""
 
-            log_manager.info(f"[{service.display_name}] Monitor refresh complete.")
+        # only look at the correct bucket inside the queue db for this service
+        bucket = queue_manager.output(service.service_name)
+        if bucket is None:
+            bucket = ServiceBucket()
 
-        log_manager.info("Queue refresh complete.")
+        queue_ids = set(bucket.series.keys())
+
+        # if both lists are empty, nothing to do, exit early
+        if not service.monitor_series_id and not queue_ids:
+            log_manager.info(f"[{service.display_name}] Your '{service.monitor_config_key}' list is empty. Skipped refreshing empty list.")
+            return True
+
+        log_manager.info(f"[{service.display_name}] Checking monitors...")
+        for series_id in service.monitor_series_id:
+            if stop_event.is_set():
+                log_manager.info(f"[{service.display_name}] Stop requested. Aborting monitor refresh.")
+                return False
+            if series_id not in queue_ids:
+                log_manager.info(f"[{service.display_name}] Starting monitor for {series_id}")
+                service.api.start_monitor(series_id)
+            else:
+                log_manager.info(f"[{service.display_name}] Updating monitor for {series_id}")
+                service.api.update_monitor(series_id)
+
+        # stop monitors for series removed from config so they are no longer monitored
+        log_manager.info(f"[{service.display_name}] Checking monitors to stop...")
+        for series_id in queue_ids:
+            if stop_event.is_set():
+                log_manager.info(f"[{service.display_name}] Stop requested. Aborting monitor cleanup.")
+                return False
+            if series_id not in service.monitor_series_id:
+                log_manager.info(f"[{service.display_name}] Stopping monitor for {series_id}")
+                service.api.stop_monitor(series_id)
+
+        log_manager.info(f"[{service.display_name}] Monitor refresh complete.")
+        return True
 
     def _download_for_service(self, service: str, service_label: str, mdnx_api) -> None:
         """Download missing episodes for the specified service."""
@@ -349,83 +633,147 @@ class MainLoop:
 
         service_obj = SERVICES.get(service)
 
-        for series_id, season_key, episode_key, season, episode in iter_episodes(bucket):
+        # dry runs report on every episode, real runs only look at the ones still waiting for a download
+        if self.dry_run:
+            episodes = list(iter_episodes(bucket))
+        else:
+            episodes = queue_manager.pending_episodes(service, "download")
 
-            if stop_event.is_set():
-                log_manager.info(f"[{service_label}] Stop requested. Skipping download.")
-                return
+        # finished downloads are transferred/probed on the post stage while the next one downloads
+        post_stage = PostStage(service_label, self._finish_download, self.pipeline_queue_size)
 
-            file_path = get_episode_file_path(bucket, series_id, season_key, episode_key, service_obj)
-            episode_basename = os.path.basename(file_path)
+        try:
+            # flag updates are coalesced and flushed right before each real download
+            with queue_manager.batch():
+                for series_id, season_key, episode_key, season, episode in episodes:
 
-            if episode.episode_skip:
-                if not self.dry_run:
-                    log_manager.info(f"[{service_label}] {episode_basename} is blacklisted (episode_skip=True). Skipping download.")
-                continue
+                    if stop_event.is_set():
+                        log_manager.info(f"[{service_label}] Stop requested. Skipping download.")
+                        return
 
-            if episode.episode_downloaded:
-                if self.dry_run:
-                    log_manager.info(f"[{service_label}] DRY_RUN is True. Would have skipped {episode_basename} because it is already marked as downloaded (episode_downloaded=True).\nThe file should already be at {file_path}.")
-                else:
-                    log_manager.info(f"[{service_label}] {episode_basename} is marked as already downloaded (episode_downloaded=True). Skipping download.")
-                continue
+                    file_path = get_episode_file_path(bucket, series_id, season_key, episode_key, service_obj)
+                    episode_basename = os.path.basename(file_path)
 
-            log_manager.info(f"[{service_label}] Checking for {episode_basename} at {file_path}.")
+                    if episode.episode_skip:
+                        if not self.dry_run:
+                            log_manager.info(f"[{service_label}] {episode_basename} is blacklisted (episode_skip=True). Skipping download.")
+                        continue
 
-            if os.path.exists(file_path):
-                log_manager.info(f"[{service_label}] Episode already exists at {file_path}. Updating 'episode_downloaded' status to True and skipping download.")
-                queue_manager.update_episode_status(series_id, season_key, episode_key, True, service)
-                continue
+                    if episode.episode_downloaded:
+                        if self.dry_run:
+                            log_manager.info(f"[{service_label}] DRY_RUN is True. Would have skipped {episode_basename} because it is already marked as downloaded (episode_downloaded=True).\nThe file should already be at {file_path}.")
+                        else:
+                            log_manager.info(f"[{service_label}] {episode_basename} is marked as already downloaded (episode_downloaded=True). Skipping download.")
+                        continue
 
-            if not self.dry_run:
-                log_manager.info(f"[{service_label}] Episode not found at {file_path} and 'episode_downloaded' status is False. Initiating download.")
+                    log_manager.info(f"[{service_label}] Checking for {episode_basename} at {file_path}.")
 
-            season_monitor = get_season_monitor_config(service, series_id, season.season_id)
+                    if os.path.exists(file_path):
+                        log_manager.info(f"[{service_label}] Episode already exists at {file_path}. Updating 'episode_downloaded' status to True and skipping download.")
+                        queue_manager.update_episode_status(series_id, season_key, episode_key, True, service)
+                        continue
+
+                    if not self.dry_run:
+                        log_manager.info(f"[{service_label}] Episode not found at {file_path} and 'episode_downloaded' status is False. Initiating download.")
+
+                    season_monitor = get_season_monitor_config(service, series_id, season.season_id)
+
+                    dub_overrides = None
+                    sub_overrides = None
+                    if season_monitor is not None:
+                        dub_overrides = season_monitor.dub_overrides
+                        sub_overrides = season_monitor.sub_overrides
+
+                    dub_override = select_dubs(service, episode, dub_overrides)
+                    sub_override = select_subs(service, episode, sub_overrides)
+
+                    if self.dry_run and dub_override is not False:
+                        log_manager.info(f"[{service_label}] DRY_RUN is True. Would have downloaded {season_key}{episode_key} '{episode.episode_name}'.\nNaming it: {episode_basename}\nStoring it at: {file_path}")
+
+                    # persist the flag updates gathered so far before spending minutes on a download
+                    queue_manager.flush()
+
+                    # every download gets its own workspace so parallel service workers never share temp files
+                    workspace = mdnx_api.create_workspace()
+
+                    # the workspace id doubles as the correlation id for everything this job logs
+                    log_context = {
+                        "job_id": workspace.job_id,
+                        "service": service,
+                        "series_id": series_id,
+                        "season_key": season_key,
+                        "episode_key": episode_key
+                    }
+
+                    with log_manager.context(**log_context):
+                        dl_start = time.perf_counter()
+                        download_successful = mdnx_api.download_episode(
+                            series_id, season.season_id, episode.episode_number_download, dub_override, sub_override, workspace=workspace
+                        )
+                        dl_end = time.perf_counter()
+                        dl_elapsed = dl_end - dl_start
+                        log_manager.event("download", duration=dl_elapsed, action="new", success=download_successful)
+                        self._record_download(service, dl_elapsed, download_successful)
+
+                    if self.dry_run:
+                        workspace.cleanup()
+                        continue
+
+                    if download_successful:
+                        job = {
+                            "action": "new",
+                            "service": service,
+                            "service_label": service_label,
+                            "series_id": series_id,
+                            "season_key": season_key,
+                            "episode_key": episode_key,
+                            "series_name": bucket.series[series_id].series.series_name,
+                            "episode": episode,
+                            "file_path": file_path,
+                            "workspace": workspace,
+                            "log_context": log_context,
+                            "time_taken": dl_elapsed
+                        }
+                        if not post_stage.submit(job):
+                            return
+                    else:
+                        log_manager.error(f"[{service_label}] Episode download failed for {series_id} season {season_key} - {episode_key}.")
+                        queue_manager.update_episode_status(series_id, season_key, episode_key, False, service)
+                        workspace.cleanup()
 
-            dub_overrides = None
-            sub_overrides = None
-            if season_monitor is not None:
-                dub_overrides = season_monitor.dub_overrides
-                sub_overrides = season_monitor.sub_overrides
+                    log_manager.info(f"Waiting for {format_duration(self.between_episode_timeout)} before next iteration.")
+                    if self._wait_or_interrupt(timeout=self.between_episode_timeout):
+                        return
+        finally:
+            post_stage.close()
 
-            dub_override = select_dubs(service, episode, dub_overrides)
-            sub_override = select_subs(service, episode, sub_overrides)
+    def _verify_candidates(self, service: str, service_obj, bucket: ServiceBucket) -> list:
+        """Episodes the dub/sub check has to look at: the pending ones plus every episode of a season with dub/sub overrides."""
 
-            if self.dry_run and dub_override is not False:
-                log_manager.info(f"[{service_label}] DRY_RUN is True. Would have downloaded {season_key}{episode_key} '{episode.episode_name}'.\nNaming it: {episode_basename}\nStoring it at: {file_path}")
+        episodes = queue_manager.pending_episodes(service, "verify")
 
-            dl_start = time.perf_counter()
-            download_successful = mdnx_api.download_episode(
-                series_id, season.season_id, episode.episode_number_download, dub_override, sub_override
-            )
-            dl_end = time.perf_counter()
-            dl_elapsed = dl_end - dl_start
+        seen = set()
+        for series_id, season_key, episode_key, _season, _episode in episodes:
+            seen.add((series_id, season_key, episode_key))
 
-            if self.dry_run:
+        # seasons with track overrides are re-checked even when has_all_dubs_subs is already set
+        for series_id, season_configs in service_obj.monitor_series_id.items():
+            series = bucket.series.get(series_id)
+            if series is None:
                 continue
 
-            if download_successful:
-                temp_path = os.path.join(TEMP_DIR, "output.mkv")
-
-                if file_manager.transfer(temp_path, file_path):
-                    log_manager.info(f"[{service_label}] Transfer complete.")
-                    queue_manager.update_episode_status(series_id, season_key, episode_key, True, service)
-                    series_name = bucket.series[series_id].series.series_name
-                    snapshot = self._snapshot_episode(
-                        series_name, episode, file_path, dl_elapsed, "new", service
-                    )
-                    self.notifications_buffer.append(snapshot)
-                else:
-                    log_manager.error(f"[{service_label}] Transfer failed.")
-                    queue_manager.update_episode_status(series_id, season_key, episode_key, False, service)
-            else:
-                log_manager.error(f"[{service_label}] Episode download failed for {series_id} season {season_key} - {episode_key}.")
-                queue_manager.update_episode_status(series_id, season_key, episode_key, False, service)
+            for season_id, season_monitor in season_configs.items():
+                if season_monitor.dub_overrides is None and season_monitor.sub_overrides is None:
+                    continue
 
-            file_manager.remove_temp_files()
-            log_manager.info(f"Waiting for {format_duration(self.between_episode_timeout)} before next iteration.")
-            if self._wait_or_interrupt(timeout=self.between_episode_timeout):
-                return
+                for season_key, season in series.seasons.items():
+                    if season.season_id != season_id:
+                        continue
+                    for episode_key, episode in season.episodes.items():
+                        if (series_id, season_key, episode_key) not in seen:
+                            episodes.append((series_id, season_key, episode_key, season, episode))
+
+        return episodes
 
     def _refresh_dub_sub_for_service(self, service: str, service_label: str, mdnx_api) -> None:
         """Probe existing files for missing dubs/subs and re-download as needed."""
@@ -442,12 +790,15 @@ class MainLoop:
 
         service_obj = SERVICES.get(service)
 
-        for series_id, season_key, episode_key, season, episode in iter_episodes(bucket):
-
-            if stop_event.is_set():
-                log_manager.info(f"[{service_label}] Stop requested. Skipping dub/sub verification.")
-                return
+        # dry runs report on every episode, real runs only look at the ones that still need a dub/sub check
+        if self.dry_run:
+            episodes = list(iter_episodes(bucket))
+        else:
+            episodes = self._verify_candidates(service, service_obj, bucket)
 
+        # decide up front which files need probing, so the probe pool knows what to prefetch
+        targets = []
+        for series_id, season_key, episode_key, season, episode in episodes:
             season_monitor = get_season_monitor_config(service, series_id, season.season_id)
 
             season_has_track_overrides = False
@@ -472,107 +823,159 @@ class MainLoop:
             if not os.path.exists(file_path):
                 continue
 
-            wanted_dubs, wanted_subs = get_wanted_dubs_and_subs(service, series_id, season.season_id)
-
-            local_dubs, local_subs = probe_streams(file_path, service)
+            targets.append((series_id, season_key, episode_key, season, episode, season_monitor, file_path))
 
-            derived = set(local_subs)
-            for loc in list(local_subs):
-                if "-" in loc:
-                    derived.add(loc.split("-")[0])
-            local_subs = derived
+        # finished downloads are transferred/probed on the post stage while the next one downloads
+        post_stage = PostStage(service_label, self._finish_download, self.pipeline_queue_size)
 
-            missing_dubs = wanted_dubs - local_dubs
-            missing_subs = wanted_subs - local_subs
+        # probes for the next few files run on a small pool while the current one is evaluated
+        prober = ProbePrefetcher(service, service_label, [target[-1] for target in targets], self.probe_workers)
 
-            if not missing_dubs and not missing_subs:
-                log_manager.info(f"[{service_label}] {episode_basename} is up to date. All requested dubs and subs are locally present. No download needed.")
-                queue_manager.update_episode_has_all_dubs_subs(series_id, season_key, episode_key, True, service)
-                continue
+        try:
+            # flag updates are coalesced and flushed right before each real download
+            with queue_manager.batch():
+                for series_id, season_key, episode_key, season, episode, season_monitor, file_path in targets:
 
-            avail_dubs = set()
-            for dub in episode.available_dubs:
-                avail_dubs.add(dub.lower())
-
-            avail_subs = set()
-            for sub in episode.available_subs:
-                avail_subs.add(sub.lower())
-
-            effective_missing_dubs = set()
-            for dub in missing_dubs:
-                if dub.lower() in avail_dubs:
-                    effective_missing_dubs.add(dub)
-
-            effective_missing_subs = set()
-            for sub in missing_subs:
-                if sub.lower() in avail_subs:
-                    effective_missing_subs.add(sub)
-
-            skip_download = False
-            if not effective_missing_dubs and not effective_missing_subs:
-                skip_download = True
-
-            log_manager.debug(
-                f"{episode_basename}\ndubs: "
-                f"wanted={','.join(wanted_dubs) or 'None'} "
-                f"present={','.join(local_dubs) or 'None'} "
-                f"available={','.join(avail_dubs) or 'None'} "
-                f"downloading={','.join(effective_missing_dubs) or 'None'}\n"
-                f"subs: wanted={','.join(wanted_subs) or 'None'} "
-                f"present={','.join(local_subs) or 'None'} "
-                f"available={','.join(avail_subs) or 'None'} "
-                f"downloading={','.join(effective_missing_subs) or 'None'}\n"
-            )
+                    if stop_event.is_set():
+                        log_manager.info(f"[{service_label}] Stop requested. Skipping dub/sub verification.")
+                        return
 
-            if skip_download:
-                log_manager.info(f"[{service_label}] Skipping re-download for {episode_basename}: requested tracks are missing locally but not offered yet.")
-                continue
+                    episode_basename = os.path.basename(file_path)
 
-            if effective_missing_dubs and not self.dry_run:
-                log_manager.info(f"[{service_label}] Missing dubs detected for {episode_basename}: {', '.join(effective_missing_dubs)}. Re-downloading episode to acquire missing dubs.")
+                    wanted_dubs, wanted_subs = get_wanted_dubs_and_subs(service, series_id, season.season_id)
 
-            if effective_missing_subs and not self.dry_run:
-                log_manager.info(f"[{service_label}] Missing subs detected for {episode_basename}: {', '.join(effective_missing_subs)}. Re-downloading episode to acquire missing subs.")
+                    probed = prober.get(file_path)
+                    if probed is None:
+                        log_manager.info(f"[{service_label}] Stop requested. Skipping dub/sub verification.")
+                        return
+                    local_dubs, local_subs = probed
 
-            dub_overrides = None
-            sub_overrides = None
-            if season_monitor is not None:
-                dub_overrides = season_monitor.dub_overrides
-                sub_overrides = season_monitor.sub_overrides
+                    derived = set(local_subs)
+                    for loc in list(local_subs):
+                        if "-" in loc:
+                            derived.add(loc.split("-")[0])
+                    local_subs = derived
 
-            dub_override = select_dubs(service, episode, dub_overrides)
-            sub_override = select_subs(service, episode, sub_overrides)
+                    missing_dubs = wanted_dubs - local_dubs
+                    missing_subs = wanted_subs - local_subs
 
-            if self.dry_run and dub_override is not False:
-                log_manager.info(f"[{service_label}] DRY_RUN is True. Would have re-downloaded {episode_basename} to pick up missing dubs={','.join(effective_missing_dubs) or 'None'} and subs={','.join(effective_missing_subs) or 'None'}.\nOverwriting the file at {file_path}.")
+                    if not missing_dubs and not missing_subs:
+                        log_manager.info(f"[{service_label}] {episode_basename} is up to date. All requested dubs and subs are locally present. No download needed.")
+                        queue_manager.update_episode_has_all_dubs_subs(series_id, season_key, episode_key, True, service)
+                        continue
 
-            dl_start = time.perf_counter()
-            download_successful = mdnx_api.download_episode(
-                series_id, season.season_id, episode.episode_number_download, dub_override, sub_override
-            )
-            dl_end = time.perf_counter()
-            dl_elapsed = dl_end - dl_start
+                    avail_dubs = set()
+                    for dub in episode.available_dubs:
+                        avail_dubs.add(dub.lower())
+
+                    avail_subs = set()
+                    for sub in episode.available_subs:
+                        avail_subs.add(sub.lower())
+
+                    effective_missing_dubs = set()
+                    for dub in missing_dubs:
+                        if dub.lower() in avail_dubs:
+                            effective_missing_dubs.add(dub)
+
+                    effective_missing_subs = set()
+                    for sub in missing_subs:
+                        if sub.lower() in avail_subs:
+                            effective_missing_subs.add(sub)
+
+                    skip_download = False
+                    if not effective_missing_dubs and not effective_missing_subs:
+                        skip_download = True
+
+                    if log_manager.is_enabled("debug"):
+                        log_manager.debug(
+                            f"{episode_basename}\ndubs: "
+                            f"wanted={','.join(wanted_dubs) or 'None'} "
+                            f"present={','.join(local_dubs) or 'None'} "
+                            f"available={','.join(avail_dubs) or 'None'} "
+                            f"downloading={','.join(effective_missing_dubs) or 'None'}\n"
+                            f"subs: wanted={','.join(wanted_subs) or 'None'} "
+                            f"present={','.join(local_subs) or 'None'} "
+                            f"available={','.join(avail_subs) or 'None'} "
+                            f"downloading={','.join(effective_missing_subs) or 'None'}\n"
+                        )
+
+                    if skip_download:
+                        log_manager.info(f"[{service_label}] Skipping re-download for {episode_basename}: requested tracks are missing locally but not offered yet.")
+                        continue
 
-            if self.dry_run:
-                continue
+                    if effective_missing_dubs and not self.dry_run:
+                        log_manager.info(f"[{service_label}] Missing dubs detected for {episode_basename}: {', '.join(effective_missing_dubs)}. Re-downloading episode to acquire missing dubs.")
+
+                    if effective_missing_subs and not self.dry_run:
+                        log_manager.info(f"[{service_label}] Missing subs detected for {episode_basename}: {', '.join(effective_missing_subs)}. Re-downloading episode to acquire missing subs.")
+
+                    dub_overrides = None
+                    sub_overrides = None
+                    if season_monitor is not None:
+                        dub_overrides = season_monitor.dub_overrides
+                        sub_overrides = season_monitor.sub_overrides
+
+                    dub_override = select_dubs(service, episode, dub_overrides)
+                    sub_override = select_subs(service, episode, sub_overrides)
+
+                    if self.dry_run and dub_override is not False:
+                        log_manager.info(f"[{service_label}] DRY_RUN is True. Would have re-downloaded {episode_basename} to pick up missing dubs={','.join(effective_missing_dubs) or 'None'} and subs={','.join(effective_missing_subs) or 'None'}.\nOverwriting the file at {file_path}.")
+
+                    # persist the flag updates gathered so far before spending minutes on a download
+                    queue_manager.flush()
+
+                    # every download gets its own workspace so parallel service workers never share temp files
+                    workspace = mdnx_api.create_workspace()
+
+                    # the workspace id doubles as the correlation id for everything this job logs
+                    log_context = {
+                        "job_id": workspace.job_id,
+                        "service": service,
+                        "series_id": series_id,
+                        "season_key": season_key,
+                        "episode_key": episode_key
+                    }
+
+                    with log_manager.context(**log_context):
+                        dl_start = time.perf_counter()
+                        download_successful = mdnx_api.download_episode(
+                            series_id, season.season_id, episode.episode_number_download, dub_override, sub_override, workspace=workspace
+                        )
+                        dl_end = time.perf_counter()
+                        dl_elapsed = dl_end - dl_start
+                        log_manager.event("download", duration=dl_elapsed, action="updated", success=download_successful)
+                        self._record_download(service, dl_elapsed, download_successful)
+
+                    if self.dry_run:
+                        workspace.cleanup()
+                        continue
 
-            if download_successful:
-                temp_path = os.path.join(TEMP_DIR, "output.mkv")
-
-                if file_manager.transfer(temp_path, file_path, overwrite=True):
-                    log_manager.info(f"[{service_label}] Transfer complete.")
-                    series_name = bucket.series[series_id].series.series_name
-                    snapshot = self._snapshot_episode(
-                        series_name, episode, file_path, dl_elapsed, "updated", service,
-                        before_dubs=local_dubs, before_subs=local_subs
-                    )
-                    self.notifications_buffer.append(snapshot)
-                else:
-                    log_manager.error(f"[{service_label}] Transfer failed")
-            else:
-                log_manager.error(f"[{service_label}] Re-download failed. Keeping existing file.")
+                    if download_successful:
+                        job = {
+                            "action": "updated",
+                            "service": service,
+                            "service_label": service_label,
+                            "series_id": series_id,
+                            "season_key": season_key,
+                            "episode_key": episode_key,
+                            "series_name": bucket.series[series_id].series.series_name,
+                            "episode": episode,
+                            "file_path": file_path,
+                            "workspace": workspace,
+                            "log_context": log_context,
+                            "time_taken": dl_elapsed,
+                            "before_dubs": local_dubs,
+                            "before_subs": local_subs
+                        }
+                        if not post_stage.submit(job):
+                            return
+                    else:
+                        log_manager.error(f"[{service_label}] Re-download failed. Keeping existing file.")
+                        workspace.cleanup()
 
-            file_manager.remove_temp_files()
-            log_manager.info(f"Waiting for {format_duration(self.between_episode_timeout)} before next iteration.")
-            if self._wait_or_interrupt(timeout=self.between_episode_timeout):
-                return
+                    log_manager.info(f"Waiting for {format_duration(self.between_episode_timeout)} before next iteration.")
+                    if self._wait_or_interrupt(timeout=self.between_episode_timeout):
+                        return
+        finally:
+            prober.close()
+            post_stage.close()
@@ -0,0 +1,279 @@
+# EBML / Matroska element IDs (marker bits kept, as they appear in the file)
+EBML_ID = 0x1A45DFA3
+DOCTYPE_ID = 0x4282
+SEGMENT_ID = 0x18538067
+SEEKHEAD_ID = 0x114D9B74
+SEEK_ID = 0x4DBB
+SEEK_ELEMENT_ID = 0x53AB
+SEEK_POSITION_ID = 0x53AC
+TRACKS_ID = 0x1654AE6B
+TRACK_ENTRY_ID = 0xAE
+TRACK_TYPE_ID = 0x83
+CODEC_ID_ID = 0x86
+NAME_ID = 0x536E
+LANGUAGE_ID = 0x22B59C
+LANGUAGE_BCP47_ID = 0x22B59D
+CLUSTER_ID = 0x1F43B675
+
+MATROSKA_DOCTYPES = ("matroska", "webm")
+
+# TrackType -> ffprobe codec_type
+TRACK_TYPES = {
+    1: "video",
+    2: "audio",
+    17: "subtitle"
+}
+
+# CodecID -> ffprobe codec_name, for the codecs the services actually deliver
+CODEC_NAMES = {
+    "V_MPEG4/ISO/AVC": "h264",
+    "V_MPEGH/ISO/HEVC": "hevc",
+    "V_AV1": "av1",
+    "V_VP9": "vp9",
+    "A_AAC": "aac",
+    "A_AC3": "ac3",
+    "A_EAC3": "eac3",
+    "A_OPUS": "opus",
+    "A_FLAC": "flac",
+    "S_TEXT/ASS": "ass",
+    "S_TEXT/SSA": "ssa",
+    "S_TEXT/UTF8": "subrip",
+    "S_TEXT/WEBVTT": "webvtt",
+    "S_HDMV/PGS": "hdmv_pgs_subtitle"
+}
+
+# a real Tracks element is a few KB. anything bigger is not worth reading into memory.
+MAX_TRACKS_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 4096
+# top level elements to walk before giving up on finding Tracks
+MAX_TOP_LEVEL_ELEMENTS = 64
+
+
+class MatroskaError(Exception):
+    """Raised when a file is not Matroska or its track headers cannot be read."""
+
+
+def _vint_length(first: int) -> int:
+    if first == 0:
+        raise MatroskaError("Invalid EBML variable size integer")
+    return 9 - first.bit_length()
+
+
+def _read_element_header(fh) -> tuple[int, int | None, int]:
+    """Read an element ID and size at the current position. Returns (id, size or None if unknown, header length)."""
+
+    head = fh.read(1)
+    if not head:
+        raise EOFError
+
+    id_length = _vint_length(head[0])
+    if id_length > 4:
+        raise MatroskaError("Invalid EBML element ID")
+    id_bytes = head + fh.read(id_length - 1)
+
+    size_head = fh.read(1)
+    if not size_head:
+        raise EOFError
+    size_length = _vint_length(size_head[0])
+    size_bytes = size_head + fh.read(size_length - 1)
+    if len(id_bytes) != id_length or len(size_bytes) != size_length:
+        raise EOFError
+
+    element_id = int.from_bytes(id_bytes, "big")
+    size = int.from_bytes(size_bytes, "big") & ((1 << (7 * size_length)) - 1)
+    if size == (1 << (7 * size_length)) - 1:
+        return element_id, None, id_length + size_length
+
+    return element_id, size, id_length + size_length
+
+
+def _iter_children(data: bytes, start: int = 0, end: int | None = None):
+    """Yield (id, data_start, data_end) for every element in data[start:end]."""
+
+    if end is None:
+        end = len(data)
+
+    pos = start
+    while pos < end:
+        id_length = _vint_length(data[pos])
+        if id_length > 4 or pos + id_length >= end:
+            raise MatroskaError("Truncated element ID")
+        element_id = int.from_bytes(data[pos:pos + id_length], "big")
+        pos += id_length
+
+        size_length = _vint_length(data[pos])
+        if pos + size_length > end:
+            raise MatroskaError("Truncated element size")
+        size = int.from_bytes(data[pos:pos + size_length], "big") & ((1 << (7 * size_length)) - 1)
+        pos += size_length
+
+        if pos + size > end:
+            raise MatroskaError("Element runs past its parent")
+
+        yield element_id, pos, pos + size
+        pos += size
+
+
+def _uint(data: bytes, start: int, end: int) -> int:
+    return int.from_bytes(data[start:end], "big")
+
+
+def _string(data: bytes, start: int, end: int) -> str:
+    return data[start:end].split(b"\x00", 1)[0].decode("utf-8", errors="replace")
+
+
+def _parse_track_entry(data: bytes, start: int, end: int) -> dict:
+    track_type = None
+    codec_id = ""
+    name = None
+    # Matroska's default when the element is missing, same as ffmpeg
+    language = "eng"
+    has_language = False
+    has_bcp47 = False
+
+    for element_id, data_start, data_end in _iter_children(data, start, end):
+        if element_id == TRACK_TYPE_ID:
+            track_type = _uint(data, data_start, data_end)
+        elif element_id == CODEC_ID_ID:
+            codec_id = _string(data, data_start, data_end)
+        elif element_id == NAME_ID:
+            name = _string(data, data_start, data_end)
+        elif element_id == LANGUAGE_ID:
+            language = _string(data, data_start, data_end)
+            has_language = True
+        elif element_id == LANGUAGE_BCP47_ID:
+            has_bcp47 = True
+
+    # ffmpeg's handling of BCP47-only tracks differs between versions. let ffprobe answer those.
+    if has_bcp47 and not has_language:
+        raise MatroskaError("Track only has a BCP47 language")
+
+    if track_type is None:
+        raise MatroskaError("TrackEntry without TrackType")
+
+    stream = {"codec_type": TRACK_TYPES.get(track_type, "data")}
+
+    codec_name = CODEC_NAMES.get(codec_id)
+    if codec_name is not None:
+        stream["codec_name"] = codec_name
+
+    tags = {}
+    if language and language != "und":
+        tags["language"] = language
+    if name:
+        tags["title"] = name
+    if tags:
+        stream["tags"] = tags
+
+    return stream
+
+
+def _parse_tracks(data: bytes) -> list[dict]:
+    streams = []
+    for element_id, data_start, data_end in _iter_children(data):
+        if element_id != TRACK_ENTRY_ID:
+            continue
+
+        stream = _parse_track_entry(data, data_start, data_end)
+        stream["index"] = len(streams)
+        streams.append(stream)
+
+    if not streams:
+        raise MatroskaError("Tracks element has no TrackEntry")
+
+    return streams
+
+
+def _tracks_position(data: bytes) -> int | None:
+    """Return the segment-relative position of Tracks from a SeekHead body, if listed."""
+
+    for element_id, data_start, data_end in _iter_children(data):
+        if element_id != SEEK_ID:
+            continue
+
+        seek_id = None
+        seek_position = None
+        for child_id, child_start, child_end in _iter_children(data, data_start, data_end):
+            if child_id == SEEK_ELEMENT_ID:
+                seek_id = _uint(data, child_start, child_end)
+            elif child_id == SEEK_POSITION_ID:
+                seek_position = _uint(data, child_start, child_end)
+
+        if seek_id == TRACKS_ID and seek_position is not None:
+            return seek_position
+
+    return None
+
+
+def _read_body(fh, size: int | None, limit: int) -> bytes:
+    if size is None or size > limit:
+        raise MatroskaError("Element too large to read")
+
+    body = fh.read(size)
+    if len(body) != size:
+        raise EOFError
+    return body
+
+
+def _read_tracks_at(fh, position: int) -> list[dict]:
+    fh.seek(position)
+    element_id, size, _ = _read_element_header(fh)
+    if element_id != TRACKS_ID:
+        raise MatroskaError("SeekHead does not point at Tracks")
+    return _parse_tracks(_read_body(fh, size, MAX_TRACKS_SIZE))
+
+
+def read_tracks(file_path: str) -> list[dict]:
+    """Read the Tracks element of a Matroska file and return ffprobe-shaped stream dicts.
+
+    Only codec_type, codec_name and the language/title tags are filled in. Raises MatroskaError
+    (or OSError) when the file is not Matroska or the header cannot be read.
+    """
+
+    with open(file_path, "rb") as fh:
+        try:
+            element_id, size, _ = _read_element_header(fh)
+            if element_id != EBML_ID:
+                raise MatroskaError("Not an EBML file")
+
+            header = _read_body(fh, size, MAX_HEADER_SIZE)
+            doctype = ""
+            for child_id, data_start, data_end in _iter_children(header):
+                if child_id == DOCTYPE_ID:
+                    doctype = _string(header, data_start, data_end)
+            if doctype not in MATROSKA_DOCTYPES:
+                raise MatroskaError(f"Unsupported DocType {doctype!r}")
+
+            element_id, segment_size, _ = _read_element_header(fh)
+            if element_id != SEGMENT_ID:
+                raise MatroskaError("Missing Segment")
+
+            segment_start = fh.tell()
+            segment_end = None if segment_size is None else segment_start + segment_size
+
+            position = segment_start
+            for _ in range(MAX_TOP_LEVEL_ELEMENTS):
+                if segment_end is not None and position >= segment_end:
+                    break
+
+                fh.seek(position)
+                element_id, size, header_length = _read_element_header(fh)
+
+                if element_id == TRACKS_ID:
+                    return _parse_tracks(_read_body(fh, size, MAX_TRACKS_SIZE))
+
+                if element_id == SEEKHEAD_ID:
+                    tracks_position = _tracks_position(_read_body(fh, size, MAX_TRACKS_SIZE))
+                    if tracks_position is not None:
+                        return _read_tracks_at(fh, segment_start + tracks_position)
+
+                # tracks always come before the first cluster in files we can read without a SeekHead
+                if element_id == CLUSTER_ID or size is None:
+                    break
+
+                position += header_length + size
+
+        except (EOFError, IndexError) as e:
+            raise MatroskaError("Truncated Matroska header") from e
+
+    raise MatroskaError("No Tracks element found")
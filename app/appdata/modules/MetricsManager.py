@@ -0,0 +1,189 @@
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .Globals import log_manager
+from .Vars import config
+
+
+# minutes-long work (downloads, queue refreshes, transfers to slow or throttled destinations)
+SLOW_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+# everything else (probes, checkpoints, notifications)
+FAST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "mdnx_downloads_total": ("counter", "Episode downloads by service and outcome.", None),
+    "mdnx_download_duration_seconds": ("histogram", "Time spent in download_episode by service and outcome.", SLOW_BUCKETS),
+    "mdnx_transfers_total": ("counter", "File transfers to their destination by outcome.", None),
+    "mdnx_transfer_bytes_total": ("counter", "Bytes moved to their destination by successful transfers.", None),
+    "mdnx_transfer_duration_seconds": ("histogram", "Time spent in FileManager.transfer by outcome.", SLOW_BUCKETS),
+    "mdnx_probes_total": ("counter", "Stream probes by where the answer came from (cache, matroska, ffprobe).", None),
+    "mdnx_probe_duration_seconds": ("histogram", "Stream probe latency by source.", FAST_BUCKETS),
+    "mdnx_queue_refresh_duration_seconds": ("histogram", "Time spent refreshing the queue of one service.", SLOW_BUCKETS),
+    "mdnx_queue_episodes": ("gauge", "Episodes in the queue by bucket and state (pending, downloaded, skipped).", None),
+    "mdnx_wal_checkpoint_duration_seconds": ("histogram", "Time spent checkpointing the queue DB WAL file.", FAST_BUCKETS),
+    "mdnx_notification_duration_seconds": ("histogram", "Time spent sending one notification by notifier.", FAST_BUCKETS)
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple, extra: str = "") -> str:
+    parts = []
+    for key, value in labels:
+        parts.append(f'{key}="{_escape(value)}"')
+    if extra:
+        parts.append(extra)
+    if not parts:
+        return ""
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsManager:
+    def __init__(self) -> None:
+        self.enabled = config.app.metrics_enabled
+        self.host = config.app.metrics_host
+        self.port = config.app.metrics_port
+
+        self.lock = threading.Lock()
+
+        # (name, sorted label tuple) -> value, or [bucket counts..., sum, count] for histograms
+        self.samples = {}
+
+        # gauge name -> callback returning [(labels dict, value), ...], read on every scrape
+        self.gauges = {}
+
+        self.server = None
+        self.thread = None
+
+        log_manager.debug("MetricsManager initialized")
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Adds value to a counter."""
+
+        if not self.enabled:
+            return
+
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Records one observation (usually seconds) in a histogram."""
+
+        if not self.enabled:
+            return
+
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+
+        with self.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = [0] * (len(buckets) + 2)
+                self.samples[key] = sample
+
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    sample[index] += 1
+            sample[-2] += value
+            sample[-1] += 1
+
+    def register_gauge(self, name: str, callback: Callable[[], list[tuple[dict, float]]]) -> None:
+        """Registers a callback that reports the current values of a gauge when scraped."""
+        self.gauges[name] = callback
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+
+        with self.lock:
+            samples = {}
+            for key, value in self.samples.items():
+                samples[key] = list(value) if isinstance(value, list) else value
+
+        for name, callback in self.gauges.items():
+            try:
+                for labels, value in callback():
+                    samples[name, tuple(sorted(labels.items()))] = value
+            except Exception as e:
+                log_manager.error(f"Failed to collect metric {name}: {e}", exc_info=e)
+
+        lines = []
+        for name, (metric_type, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+            for (sample_name, labels), value in sorted(samples.items(), key=lambda item: item[0]):
+                if sample_name != name:
+                    continue
+
+                if metric_type != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+
+                for index, bound in enumerate(buckets):
+                    lines.append(f"{name}_bucket{_format_labels(labels, f'le=\"{_format_value(bound)}\"')} {value[index]}")
+                lines.append(f"{name}_bucket{_format_labels(labels, 'le=\"+Inf\"')} {value[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+    def start(self) -> None:
+        """Starts the /metrics HTTP endpoint on a background thread if METRICS_ENABLED is set."""
+
+        if not self.enabled or self.server is not None:
+            return
+
+        manager = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = manager.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                log_manager.debug(f"Metrics request from {self.client_address[0]}: {format % args}")
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        except OSError as e:
+            log_manager.error(f"Failed to start metrics endpoint on {self.host}:{self.port}: {e}", exc_info=e)
+            return
+
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self.thread.start()
+
+        log_manager.info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stops the HTTP endpoint."""
+
+        if self.server is None:
+            return
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        log_manager.info("Metrics endpoint stopped.")
@@ -0,0 +1,114 @@
+import os
+import time
+import sqlite3
+import threading
+
+from .Globals import log_manager, metrics_manager
+from .Matroska import MatroskaError, read_tracks
+from .Vars import ffprobe
+from .db.connection import open_connection
+from .db.probe_repo import delete_probes, get_probe, list_probe_paths, put_probe
+
+
+# stream fields probe_streams actually reads. everything else ffprobe returns is dropped before caching.
+CACHED_STREAM_KEYS = ("index", "codec_type", "codec_name", "tags")
+
+
+class ProbeCache:
+    def __init__(self) -> None:
+        self.conn = open_connection()
+        self._lock = threading.Lock()
+
+        log_manager.debug("ProbeCache initialized")
+
+    def streams(self, file_path: str) -> list[dict]:
+        """Return the ffprobe streams of file_path, only running ffprobe when the file changed since the last probe."""
+
+        path = os.path.abspath(file_path)
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # let ffprobe report the missing/unreadable file like it always has
+            return ffprobe(file_path)
+
+        with self._lock:
+            try:
+                cached = get_probe(self.conn, path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            except sqlite3.Error as e:
+                log_manager.error(f"Failed to read probe cache for {path}: {e}", exc_info=e)
+                cached = None
+
+        if cached is not None:
+            log_manager.debug(f"Probe cache hit for {path}")
+            metrics_manager.inc("mdnx_probes_total", source="cache")
+            return cached
+
+        streams = self._probe(path)
+
+        # never cache a failed probe, the next pass should try again
+        if not streams:
+            return streams
+
+        trimmed = []
+        for stream in streams:
+            entry = {}
+            for key in CACHED_STREAM_KEYS:
+                if key in stream:
+                    entry[key] = stream[key]
+            trimmed.append(entry)
+
+        with self._lock:
+            try:
+                put_probe(self.conn, path, stat.st_ino, stat.st_size, stat.st_mtime_ns, trimmed)
+            except sqlite3.Error as e:
+                log_manager.error(f"Failed to write probe cache for {path}: {e}", exc_info=e)
+
+        return trimmed
+
+    def _probe(self, path: str) -> list[dict]:
+        """Read the track headers directly for Matroska files, and only spawn ffprobe for anything else."""
+
+        probe_start = time.perf_counter()
+        try:
+            streams = read_tracks(path)
+        except (MatroskaError, OSError) as e:
+            log_manager.debug(f"Matroska header read failed for {path} ({e}). Falling back to ffprobe.")
+
+            probe_start = time.perf_counter()
+            streams = ffprobe(path)
+            metrics_manager.inc("mdnx_probes_total", source="ffprobe")
+            metrics_manager.observe("mdnx_probe_duration_seconds", time.perf_counter() - probe_start, source="ffprobe")
+            return streams
+
+        metrics_manager.inc("mdnx_probes_total", source="matroska")
+        metrics_manager.observe("mdnx_probe_duration_seconds", time.perf_counter() - probe_start, source="matroska")
+
+        log_manager.debug(lambda: f"Matroska tracks for {path}: {streams}")
+        return streams
+
+    def prune(self) -> int:
+        """Drop cache entries whose file no longer exists. Returns the number of entries removed."""
+
+        with self._lock:
+            paths = list_probe_paths(self.conn)
+
+            missing = []
+            for path in paths:
+                if not os.path.isfile(path):
+                    missing.append(path)
+
+            if missing:
+                delete_probes(self.conn, missing)
+
+        log_manager.info(f"Probe cache pruned {len(missing)} of {len(paths)} entries.")
+        return len(missing)
+
+    def close(self) -> None:
+        """Close the database connection."""
+
+        try:
+            self.conn.close()
+            log_manager.info("Probe cache DB connection closed.")
+        except Exception as e:
+            log_manager.error(f"Failed to close probe cache DB connection: {e}", exc_info=e)
@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from .Globals import log_manager
+
+
+# how often the sampler grabs every thread's stack
+SAMPLE_INTERVAL = 0.005
+
+# functions listed per service in the summary
+TOP_FUNCTIONS = 25
+
+# thread ident -> label (usually a service display name) used to split samples by service.
+# set through thread_label(), read by the sampler thread.
+_thread_labels = {}
+
+
+@contextmanager
+def thread_label(label: str):
+    """Attribute everything the current thread does inside the block to label in iteration profiles."""
+
+    ident = threading.get_ident()
+    previous = _thread_labels.get(ident)
+    _thread_labels[ident] = label
+    try:
+        yield
+    finally:
+        if previous is None:
+            _thread_labels.pop(ident, None)
+        else:
+            _thread_labels[ident] = previous
+
+
+def _frame_name(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+class IterationProfiler:
+    """Profiles one MainLoop iteration and writes the results to LOG_DIR.
+
+    cProfile gives exact call counts for the whole process, a stack sampler gives wall time
+    split by service (labelled threads only, so idle helper threads don't drown the numbers).
+    """
+
+    def __init__(self, log_dir: str) -> None:
+        self.log_dir = log_dir
+        self.prefix = os.path.join(log_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        self.profile = None
+        self.samples = Counter()
+        self.sample_count = 0
+        self.sampler = None
+        self.sampling = threading.Event()
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        log_manager.info(f"PROFILE_ITERATION is True. Profiling this iteration into {self.prefix}.*")
+
+        self.profile = cProfile.Profile()
+        try:
+            self.profile.enable()
+        except ValueError as e:
+            # only one profiler can be active per process
+            log_manager.warning(f"cProfile unavailable ({e}). Only sampling this iteration.")
+            self.profile = None
+
+        self.sampling.set()
+        self.sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+        self.started = time.perf_counter()
+        self.sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> bool:
+        self.elapsed = time.perf_counter() - self.started
+        self.sampling.clear()
+        self.sampler.join()
+
+        if self.profile is not None:
+            self.profile.disable()
+
+        try:
+            self._dump()
+        except Exception as e:
+            log_manager.error(f"Failed to write iteration profile: {e}", exc_info=e)
+
+        return False
+
+    def _sample_loop(self) -> None:
+        own_ident = threading.get_ident()
+        main_ident = threading.main_thread().ident
+
+        while self.sampling.is_set():
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                label = _thread_labels.get(ident)
+                if label is None:
+                    if ident != main_ident:
+                        continue
+                    label = "main"
+
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+
+                self.samples[label, *stack] += 1
+
+            self.sample_count += 1
+            time.sleep(SAMPLE_INTERVAL)
+
+    def _dump(self) -> None:
+        if self.profile is not None:
+            pstats.Stats(self.profile).dump_stats(self.prefix + ".pstats")
+
+        # collapsed stacks, one "label;outer;...;inner count" line each. feed to flamegraph.pl or speedscope.
+        with open(self.prefix + ".collapsed", "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+        # wall time per sample, measured rather than assumed since sleep() overshoots
+        sample_seconds = self.elapsed / self.sample_count if self.sample_count else SAMPLE_INTERVAL
+
+        by_label = {}
+        for stack, count in self.samples.items():
+            label = stack[0]
+            totals = by_label.setdefault(label, {"samples": 0, "inclusive": Counter(), "self": Counter()})
+            totals["samples"] += count
+            for name in set(stack[1:]):
+                totals["inclusive"][name] += count
+            if len(stack) > 1:
+                totals["self"][stack[-1]] += count
+
+        lines = [
+            f"MainLoop iteration profile: {self.elapsed:.1f}s wall time, {self.sample_count} samples ({sample_seconds * 1000:.1f} ms each)",
+            ""
+        ]
+        for label in sorted(by_label, key=lambda name: by_label[name]["samples"], reverse=True):
+            totals = by_label[label]
+            lines.append(f"[{label}] {totals['samples'] * sample_seconds:.1f}s of thread time sampled")
+            lines.append(f"  {'inclusive':>10} {'self':>10}  function")
+            for name, count in totals["inclusive"].most_common(TOP_FUNCTIONS):
+                lines.append(f"  {count * sample_seconds:>9.2f}s {totals['self'][name] * sample_seconds:>9.2f}s  {name}")
+            lines.append("")
+
+        with open(self.prefix + "_summary.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+        log_manager.info(f"Iteration profile written to {self.prefix}_summary.txt ({self.elapsed:.1f}s).")
@@ -1,7 +1,9 @@
 import sys
+import time
 import threading
+from contextlib import contextmanager
 
-from .Globals import log_manager
+from .Globals import log_manager, metrics_manager
 from .Vars import (
     config,
     SERVICES,
@@ -9,9 +11,37 @@ from .Vars import (
 )
 from .db.connection import open_connection
 from .db.queue_repo import (
-    checkpoint_wal, delete_series, load_queue, set_episode_field, clear_queue, upsert_series
+    checkpoint_wal, delete_series, load_pending, load_queue, set_episode_field, clear_queue, upsert_series, write_batch
 )
-from .types.queue import Queue, Season, Series, ServiceBucket
+from .types.queue import Episode, Queue, Season, Series, ServiceBucket
+
+
+def _episode_pending_kinds(episode: Episode) -> tuple[bool, bool]:
+    """Return (needs download, needs dub/sub check) for one episode. Mirrors PENDING_FILTERS in queue_repo."""
+
+    if episode.episode_skip:
+        return False, False
+
+    if not episode.episode_downloaded:
+        return True, False
+
+    return False, not episode.has_all_dubs_subs
+
+
+def _key_number(key: str) -> int:
+    """Numeric part of a season/episode key like S2 or E10, for sorting."""
+
+    try:
+        return int(key[1:])
+    except ValueError:
+        return 0
+
+
+def _pending_sort_key(item: tuple[str, str, str]) -> tuple:
+    """Sort pending (series_id, season_key, episode_key) keys in the same order load_queue uses."""
+
+    series_id, season_key, episode_key = item
+    return (series_id, _key_number(season_key), episode_key[:1], _key_number(episode_key))
 
 
 class QueueManager:
@@ -21,6 +51,15 @@ class QueueManager:
         self._ensure_buckets()
         self._lock = threading.Lock()
 
+        # {bucket: {series_id: {"download": {(season_key, episode_key)}, "verify": {...}}}}
+        # only episodes that still need work, so the download loop never walks the whole library.
+        self._pending_index = load_pending(self.conn)
+
+        # per-thread pending writes while inside a batch() block
+        self._local = threading.local()
+
+        metrics_manager.register_gauge("mdnx_queue_episodes", self._queue_gauge)
+
         log_manager.debug("QueueManager initialized")
 
         if config.app.clear_queue:
@@ -28,6 +67,7 @@ class QueueManager:
             clear_queue(self.conn)
             self.queue = Queue()
             self._ensure_buckets()
+            self._pending_index = {}
             update_app_config("CLEAR_QUEUE", False)
             log_manager.info("CLEAR_QUEUE is True. Cleared the queue and flipped CLEAR_QUEUE back to False. Exiting to restart with a clean slate.")
             sys.exit(0)
@@ -49,8 +89,9 @@ class QueueManager:
 
                 if existing_series is None:
                     bucket.series[series_id] = new_series
+                    self._write_series(bucket_name, series_id, new_series)
+                    self._index_series(bucket_name, series_id, new_series)
                     log_manager.debug(f"Added series '{series_id}' to '{bucket_name}'.")
-                    upsert_series(self.conn, bucket_name, series_id, new_series)
                     continue
 
                 # update only the SeriesInfo blob, leave existing seasons alone for merge
@@ -125,7 +166,8 @@ class QueueManager:
                 for stale_season_key in stale_season_keys:
                     del existing_series.seasons[stale_season_key]
 
-                upsert_series(self.conn, bucket_name, series_id, existing_series)
+                self._write_series(bucket_name, series_id, existing_series)
+                self._index_series(bucket_name, series_id, existing_series)
                 log_manager.debug(f"Updated series '{series_id}' in '{bucket_name}'.")
 
     def remove(self, series_id: str, service: str) -> None:
@@ -142,7 +184,13 @@ class QueueManager:
 
             if series_id in bucket.series:
                 del bucket.series[series_id]
-                delete_series(self.conn, bucket_name, series_id)
+                self._index_series(bucket_name, series_id, None)
+
+                pending = self._pending()
+                if pending is not None:
+                    pending["series"][bucket_name, series_id] = None
+                else:
+                    delete_series(self.conn, bucket_name, series_id)
                 log_manager.debug(f"Removed series '{series_id}' from '{bucket_name}'.")
                 return
 
@@ -158,6 +206,73 @@ class QueueManager:
 
         self._set_flag(series_id, season_key, episode_key, "has_all_dubs_subs", status, service)
 
+    def pending_episodes(self, service: str, kind: str) -> list[tuple[str, str, str, Season, Episode]]:
+        """Return (series_id, season_key, episode_key, Season, Episode) for every episode that needs kind ("download" or "verify")."""
+
+        bucket_name = self._normalize_service(service)
+        if bucket_name is None:
+            return []
+
+        with self._lock:
+            bucket = self.queue.buckets.setdefault(bucket_name, ServiceBucket())
+
+            keys = []
+            for series_id, series_pending in self._pending_index.get(bucket_name, {}).items():
+                for season_key, episode_key in series_pending[kind]:
+                    keys.append((series_id, season_key, episode_key))
+            keys.sort(key=_pending_sort_key)
+
+            pending = []
+            for series_id, season_key, episode_key in keys:
+                series_obj = bucket.series.get(series_id)
+                if series_obj is None:
+                    continue
+                season_obj = series_obj.seasons.get(season_key)
+                if season_obj is None:
+                    continue
+                episode_obj = season_obj.episodes.get(episode_key)
+                if episode_obj is None:
+                    continue
+                pending.append((series_id, season_key, episode_key, season_obj, episode_obj))
+
+        return pending
+
+    @contextmanager
+    def batch(self):
+        """Collect every queue write made on this thread inside the block and persist them in one transaction on exit."""
+
+        # nested batch() blocks just join the outer one
+        if self._pending() is not None:
+            yield
+            return
+
+        self._local.pending = {"series": {}, "flags": {}}
+        try:
+            yield
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._local.pending = None
+
+    def flush(self) -> int:
+        """Persist the writes queued so far by this thread's batch() block. Returns the number of rows written."""
+
+        pending = self._pending()
+        if pending is None or (not pending["series"] and not pending["flags"]):
+            return 0
+
+        series_writes = pending["series"]
+        flag_updates = pending["flags"]
+        pending["series"] = {}
+        pending["flags"] = {}
+
+        with self._lock:
+            rows_written = write_batch(self.conn, series_writes, flag_updates)
+
+        log_manager.debug(f"Flushed queue batch: {len(series_writes)} series, {len(flag_updates)} flag updates, {rows_written} rows written.")
+        return rows_written
+
     def output(self, service: str | None = None) -> Queue | ServiceBucket | None:
         """Return the whole queue, the bucket for one service, or None if the service is unknown."""
 
@@ -174,11 +289,35 @@ class QueueManager:
         """Write everything from the WAL file back into queue.db."""
 
         try:
+            checkpoint_start = time.perf_counter()
             checkpoint_wal(self.conn)
+            metrics_manager.observe("mdnx_wal_checkpoint_duration_seconds", time.perf_counter() - checkpoint_start)
             log_manager.debug("Queue DB checkpoint complete.")
         except Exception as e:
             log_manager.error(f"Failed to checkpoint queue DB: {e}", exc_info=e)
 
+    def _queue_gauge(self) -> list[tuple[dict, float]]:
+        """Episode counts per bucket and state for the mdnx_queue_episodes gauge."""
+
+        samples = []
+        with self._lock:
+            for bucket_name, bucket in self.queue.buckets.items():
+                counts = {"pending": 0, "downloaded": 0, "skipped": 0}
+                for series in bucket.series.values():
+                    for season in series.seasons.values():
+                        for episode in season.episodes.values():
+                            if episode.episode_skip:
+                                counts["skipped"] += 1
+                            elif episode.episode_downloaded:
+                                counts["downloaded"] += 1
+                            else:
+                                counts["pending"] += 1
+
+                for state, count in counts.items():
+                    samples.append(({"bucket": bucket_name, "state": state}, count))
+
+        return samples
+
     def close(self) -> None:
         """Close the database connection."""
 
@@ -214,10 +353,69 @@ class QueueManager:
                 return
 
             setattr(episode_obj, field, status)
-            set_episode_field(self.conn, bucket_name, series_id, season_key, episode_key, field, status)
+            self._index_episode(bucket_name, series_id, season_key, episode_key, episode_obj)
+
+            pending = self._pending()
+            if pending is not None:
+                pending["flags"][bucket_name, series_id, season_key, episode_key, field] = status
+            else:
+                set_episode_field(self.conn, bucket_name, series_id, season_key, episode_key, field, status)
 
         log_manager.info(f"Updated episode '{episode_key}' in series '{series_id}', season '{season_key}' to {field}={status} ({bucket_name}).")
 
+    def _index_series(self, bucket_name: str, series_id: str, series: Series | None) -> None:
+        """Rebuild the pending index entry of one series. None drops the series from the index."""
+
+        bucket_pending = self._pending_index.setdefault(bucket_name, {})
+        bucket_pending.pop(series_id, None)
+
+        if series is None:
+            return
+
+        series_pending = {"download": set(), "verify": set()}
+        for season_key, season in series.seasons.items():
+            for episode_key, episode in season.episodes.items():
+                needs_download, needs_verify = _episode_pending_kinds(episode)
+                if needs_download:
+                    series_pending["download"].add((season_key, episode_key))
+                if needs_verify:
+                    series_pending["verify"].add((season_key, episode_key))
+
+        if series_pending["download"] or series_pending["verify"]:
+            bucket_pending[series_id] = series_pending
+
+    def _index_episode(self, bucket_name: str, series_id: str, season_key: str, episode_key: str, episode: Episode) -> None:
+        """Update the pending index entry of one episode after a flag change."""
+
+        series_pending = self._pending_index.setdefault(bucket_name, {}).setdefault(series_id, {"download": set(), "verify": set()})
+        needs_download, needs_verify = _episode_pending_kinds(episode)
+
+        if needs_download:
+            series_pending["download"].add((season_key, episode_key))
+        else:
+            series_pending["download"].discard((season_key, episode_key))
+
+        if needs_verify:
+            series_pending["verify"].add((season_key, episode_key))
+        else:
+            series_pending["verify"].discard((season_key, episode_key))
+
+    def _pending(self) -> dict | None:
+        """Pending writes of the current thread's batch() block, or None when not batching."""
+
+        return getattr(self._local, "pending", None)
+
+    def _write_series(self, bucket_name: str, series_id: str, series: Series) -> None:
+        """Persist one series now, or queue it when the current thread is inside batch()."""
+
+        pending = self._pending()
+        if pending is not None:
+            pending["series"][bucket_name, series_id] = series
+            return
+
+        rows_written = upsert_series(self.conn, bucket_name, series_id, series)
+        log_manager.debug(f"Wrote series '{series_id}' in '{bucket_name}' ({rows_written} rows written).")
+
     def _normalize_service(self, service: str) -> str | None:
         """Normalize a service name to its standard queue bucket name."""
 
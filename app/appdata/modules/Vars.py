@@ -9,7 +9,9 @@ import tomllib
 import subprocess
 import unicodedata
 from string import Template
+from functools import lru_cache
 from collections import OrderedDict
+from collections.abc import Callable
 from pydantic import ValidationError
 
 from .types.config import Config, AppConfig
@@ -17,7 +19,7 @@ from .types.service import Service, MdnxServices, CdlServices, Services
 from .types.queue import Series, ServiceBucket
 
 
-def _log(message: str, level: str = "info", exc_info=None) -> None:
+def _log(message: str | Callable[[], str], level: str = "info", exc_info=None) -> None:
     """Internal logging helper function. Needed to avoid circular imports."""
 
     try:
@@ -292,6 +294,19 @@ LOG_DIR = config.app.log_dir
 
 INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1F]')
 
+# common unicode punctuation -> ASCII, applied after NFKC
+PUNCTUATION_TRANSLATION = {
+    ord('“'): '"', ord('”'): '"', ord('„'): '"', ord('‟'): '"',
+    ord('’'): "'", ord('‘'): "'", ord('‚'): "'", ord('ʼ'): "'",  # ruff:ignore[ambiguous-unicode-character-string]
+    ord('–'): '-', ord('—'): '-', ord('-'): '-',  # non-breaking hyphen maps to hyphen  # ruff:ignore[ambiguous-unicode-character-string]
+    ord('…'): '...', ord('•'): '-', ord('·'): '-', ord('‧'): '-',
+    ord('／'): '/', ord('＼'): '\\', ord('～'): '~',  # ruff:ignore[ambiguous-unicode-character-string]
+    ord('：'): ':', ord('；'): ';', ord('！'): '!', ord('？'): '?',  # ruff:ignore[ambiguous-unicode-character-string]
+}
+
+# distinct (segment, ascii_only, max_len) results sanitize() remembers
+SANITIZE_CACHE_SIZE = 8192
+
 # Whether any MDNX or CardinalDL services are enabled
 MDNX_ENABLED = False
 for mdnx_service in SERVICES.mdnx.all():
@@ -583,7 +598,7 @@ def ffprobe(file_path: str) -> list[dict]:
     timeout = 180
     cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_streams", file_path]
 
-    _log(f"Running ffprobe on {file_path} with command: {' '.join(cmd)}", level="debug")
+    _log(lambda: f"Running ffprobe on {file_path} with command: {' '.join(cmd)}", level="debug")
 
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
@@ -606,11 +621,22 @@ def ffprobe(file_path: str) -> list[dict]:
         _log(f"ffprobe returned non-list streams for {file_path}", level="error")
         return []
 
-    _log(f"ffprobe output for {file_path}: {streams}", level="debug")
+    _log(lambda: f"ffprobe output for {file_path}: {streams}", level="debug")
 
     return streams
 
 
+def probe_file(file_path: str) -> list[dict]:
+    """ffprobe through the persistent probe cache. Falls back to a plain ffprobe if the cache is unavailable."""
+
+    try:
+        from .Globals import probe_cache
+    except Exception:
+        return ffprobe(file_path)
+
+    return probe_cache.streams(file_path)
+
+
 def get_season_monitor_config(service: str, series_id: str, season_id: str | None):
     """Get the monitor config for a specific series season."""
 
@@ -716,37 +742,54 @@ def sanitize(path_segment: str, ascii_only: bool = False, max_len: int = 255) ->
       - Avoid Windows trailing dot/space and reserved names
       - Optionally force ASCII only
       - Truncate to max_len, preserving extension when possible
+
+    Results are memoized, since the same titles are sanitized again for every episode and path built from them.
     """
-    original_segment = path_segment
-
-    # normalize then translate common unicode punctuation to ASCII
-    normalized = unicodedata.normalize("NFKC", path_segment)
-    punctuation_translation = {
-        ord('“'): '"', ord('”'): '"', ord('„'): '"', ord('‟'): '"',
-        ord('’'): "'", ord('‘'): "'", ord('‚'): "'", ord('ʼ'): "'",  # ruff:ignore[ambiguous-unicode-character-string]
-        ord('–'): '-', ord('—'): '-', ord('-'): '-',  # non-breaking hyphen maps to hyphen  # ruff:ignore[ambiguous-unicode-character-string]
-        ord('…'): '...', ord('•'): '-', ord('·'): '-', ord('‧'): '-',
-        ord('／'): '/', ord('＼'): '\\', ord('～'): '~',  # ruff:ignore[ambiguous-unicode-character-string]
-        ord('：'): ':', ord('；'): ';', ord('！'): '!', ord('？'): '?',  # ruff:ignore[ambiguous-unicode-character-string]
-    }
-    sanitized = normalized.translate(punctuation_translation)
-    sanitized = INVALID_CHARS_RE.sub(" ", sanitized)
 
-    # remove other control chars: DEL (0x7F) and C1 controls (0x80-0x9F)
-    sanitized = re.sub(r"[\x7F-\x9F]", " ", sanitized)
+    sanitized = _sanitize(path_segment, ascii_only, max_len)
+
+    if sanitized != path_segment:
+        _log(lambda: f"Sanitized {path_segment!r} to {sanitized!r}", level="debug")
+
+    return sanitized
+
+
+def _is_dropped_char(ch: str) -> bool:
+    """Unicode symbols (So/Sm/Sk) and any remaining "Other" categories, which sanitize() turns into spaces."""
+
+    category = unicodedata.category(ch)
+    return category.startswith("C") or category in ("So", "Sm", "Sk")
+
+
+# every ASCII char sanitize() turns into a space: filesystem-illegal ones, controls and the ASCII symbols (+ < = > ^ ` | ~).
+# NFKC and the punctuation map leave ASCII alone, so pure ASCII segments only need this one translate.
+_ASCII_TO_SPACE = {
+    code: " " for code in range(128)
+    if INVALID_CHARS_RE.match(chr(code)) or _is_dropped_char(chr(code))
+}
 
-    # drop most Unicode symbols (So/Sm/Sk) and any remaining "Other" categories
-    def _drop_symbols(text: str) -> str:
+
+@lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def _sanitize(path_segment: str, ascii_only: bool, max_len: int) -> str:
+    if path_segment.isascii():
+        sanitized = path_segment.translate(_ASCII_TO_SPACE)
+    else:
+        # normalize then translate common unicode punctuation to ASCII
+        normalized = unicodedata.normalize("NFKC", path_segment)
+        sanitized = normalized.translate(PUNCTUATION_TRANSLATION)
+        sanitized = INVALID_CHARS_RE.sub(" ", sanitized)
+
+        # remove other control chars: DEL (0x7F) and C1 controls (0x80-0x9F)
+        sanitized = re.sub(r"[\x7F-\x9F]", " ", sanitized)
+
+        # drop most Unicode symbols (So/Sm/Sk) and any remaining "Other" categories
         builder = []
-        for ch in text:
-            category = unicodedata.category(ch)
-            if category.startswith("C") or category in ("So", "Sm", "Sk"):
+        for ch in sanitized:
+            if _is_dropped_char(ch):
                 builder.append(" ")
             else:
                 builder.append(ch)
-        return "".join(builder)
-
-    sanitized = _drop_symbols(sanitized)
+        sanitized = "".join(builder)
 
     # underscores -> spaces
     sanitized = sanitized.replace("_", " ")
@@ -780,9 +823,6 @@ def sanitize(path_segment: str, ascii_only: bool = False, max_len: int = 255) ->
         else:
             sanitized = sanitized[:max_len].rstrip(" .")
 
-    if sanitized != original_segment:
-        _log(f"Sanitized {original_segment!r} to {sanitized!r}", level="debug")
-
     return sanitized
 
 
@@ -897,7 +937,7 @@ def build_folder_structure(base_dir: str, series_title: str, season: str, episod
     if not full_path.lower().endswith(extension.lower()):
         full_path = f"{full_path}{extension}"
 
-    _log(f"Built file path: {full_path}", level="debug")
+    _log(lambda: f"Built file path: {full_path}", level="debug")
 
     return full_path
 
@@ -921,7 +961,7 @@ def get_episode_file_path(bucket: ServiceBucket, series_id: str, season_key: str
 
     file_name = build_folder_structure(destination.dir, raw_series, season_number, episode_number, raw_episode_name, destination.folder_structure, extension, service.service_long, service.service_short)
 
-    _log(f"Built file path for series ID {series_id}, season {season_key}, episode {episode_key}: {file_name}", level="debug")
+    _log(lambda: f"Built file path for series ID {series_id}, season {season_key}, episode {episode_key}: {file_name}", level="debug")
 
     return file_name
 
@@ -0,0 +1,37 @@
+"""pending episode indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_episodes_pending_download',
+        'episodes',
+        ['service', 'series_id', 'season_key', 'episode_key'],
+        sqlite_where=sa.text('episode_downloaded = 0 AND episode_skip = 0')
+    )
+    op.create_index(
+        'ix_episodes_pending_verify',
+        'episodes',
+        ['service', 'series_id', 'season_key', 'episode_key'],
+        sqlite_where=sa.text('episode_downloaded = 1 AND has_all_dubs_subs = 0 AND episode_skip = 0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_episodes_pending_verify', table_name='episodes')
+    op.drop_index('ix_episodes_pending_download', table_name='episodes')
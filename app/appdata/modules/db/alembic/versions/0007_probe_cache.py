@@ -0,0 +1,33 @@
+"""probe cache
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('probe_cache',
+        sa.Column('path', sa.Text(), nullable=False),
+        sa.Column('inode', sa.Integer(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('mtime_ns', sa.Integer(), nullable=False),
+        sa.Column('streams', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('path'),
+        sqlite_with_rowid=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('probe_cache')
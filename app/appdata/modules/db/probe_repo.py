@@ -0,0 +1,42 @@
+import json
+import sqlite3
+
+
+def get_probe(conn: sqlite3.Connection, path: str, inode: int, size: int, mtime_ns: int) -> list[dict] | None:
+    """Return the cached streams for path, or None when there is no entry for this exact file identity."""
+
+    row = conn.execute(
+        "SELECT streams FROM probe_cache WHERE path = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+        (path, inode, size, mtime_ns)
+    ).fetchone()
+
+    if row is None:
+        return None
+
+    return json.loads(row["streams"])
+
+
+def put_probe(conn: sqlite3.Connection, path: str, inode: int, size: int, mtime_ns: int, streams: list[dict]) -> None:
+    """Insert or replace the cached streams for path."""
+
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO probe_cache (path, inode, size, mtime_ns, streams) VALUES (?, ?, ?, ?, ?)",
+            (path, inode, size, mtime_ns, json.dumps(streams))
+        )
+
+
+def list_probe_paths(conn: sqlite3.Connection) -> list[str]:
+    """Return every path that has a cache entry."""
+
+    paths = []
+    for row in conn.execute("SELECT path FROM probe_cache"):
+        paths.append(row["path"])
+    return paths
+
+
+def delete_probes(conn: sqlite3.Connection, paths: list[str]) -> None:
+    """Delete the cache entries of the given paths."""
+
+    with conn:
+        conn.executemany("DELETE FROM probe_cache WHERE path = ?", [(path,) for path in paths])
@@ -110,6 +110,27 @@ def load_queue(conn: sqlite3.Connection) -> Queue:
     return Queue(buckets=buckets)
 
 
+# which episodes still need work, per pending kind. these match the partial indexes in schema.py.
+PENDING_FILTERS = {
+    "download": "episode_downloaded = 0 AND episode_skip = 0",
+    "verify": "episode_downloaded = 1 AND has_all_dubs_subs = 0 AND episode_skip = 0"
+}
+
+
+def load_pending(conn: sqlite3.Connection) -> dict[str, dict[str, dict[str, set[tuple[str, str]]]]]:
+    """Load the keys of every episode that still needs work as {service: {series_id: {kind: {(season_key, episode_key)}}}}."""
+
+    pending: dict[str, dict[str, dict[str, set[tuple[str, str]]]]] = {}
+
+    for kind, where in PENDING_FILTERS.items():
+        rows = conn.execute(f"SELECT service, series_id, season_key, episode_key FROM episodes WHERE {where}")
+        for service, series_id, season_key, episode_key in rows:
+            series_pending = pending.setdefault(service, {}).setdefault(series_id, {"download": set(), "verify": set()})
+            series_pending[kind].add((season_key, episode_key))
+
+    return pending
+
+
 def checkpoint_wal(conn: sqlite3.Connection) -> None:
     """Move everything sitting in the WAL file back into the main db file."""
 
@@ -125,8 +146,98 @@ def clear_queue(conn: sqlite3.Connection) -> None:
             conn.execute("DELETE FROM series")
 
 
-def upsert_series(conn: sqlite3.Connection, service: str, series_id: str, series: Series) -> None:
-    """Insert or replace one series row, and all its seasons/episodes."""
+# value tuples from _season_values/_episode_values line up with the column lists below,
+# followed by the primary key columns for the INSERT/UPDATE statements.
+_SELECT_SERIES_SQL = "SELECT series_name, seasons_count, eps_count FROM series WHERE service = ? AND series_id = ?"
+_INSERT_SERIES_SQL = (
+    "INSERT INTO series (series_name, seasons_count, eps_count, service, series_id) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_UPDATE_SERIES_SQL = (
+    "UPDATE series SET series_name = ?, seasons_count = ?, eps_count = ? "
+    "WHERE service = ? AND series_id = ?"
+)
+_DELETE_SERIES_SQL = "DELETE FROM series WHERE service = ? AND series_id = ?"
+
+_SELECT_SEASONS_SQL = (
+    "SELECT season_key, season_id, season_number, season_name, eps_count "
+    "FROM seasons WHERE service = ? AND series_id = ?"
+)
+_INSERT_SEASON_SQL = (
+    "INSERT INTO seasons "
+    "(season_id, season_number, season_name, eps_count, service, series_id, season_key) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATE_SEASON_SQL = (
+    "UPDATE seasons SET season_id = ?, season_number = ?, season_name = ?, eps_count = ? "
+    "WHERE service = ? AND series_id = ? AND season_key = ?"
+)
+_DELETE_SEASON_SQL = "DELETE FROM seasons WHERE service = ? AND series_id = ? AND season_key = ?"
+
+_SELECT_EPISODES_SQL = (
+    "SELECT season_key, episode_key, episode_id, "
+    "episode_number, episode_number_download, episode_name, "
+    "available_dubs, available_subs, available_qualities, "
+    "episode_downloaded, episode_skip, has_all_dubs_subs "
+    "FROM episodes WHERE service = ? AND series_id = ?"
+)
+_INSERT_EPISODE_SQL = (
+    "INSERT INTO episodes "
+    "(episode_id, episode_number, episode_number_download, episode_name, "
+    "available_dubs, available_subs, available_qualities, "
+    "episode_downloaded, episode_skip, has_all_dubs_subs, "
+    "service, series_id, season_key, episode_key) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATE_EPISODE_SQL = (
+    "UPDATE episodes SET episode_id = ?, "
+    "episode_number = ?, episode_number_download = ?, episode_name = ?, "
+    "available_dubs = ?, available_subs = ?, available_qualities = ?, "
+    "episode_downloaded = ?, episode_skip = ?, has_all_dubs_subs = ? "
+    "WHERE service = ? AND series_id = ? AND season_key = ? AND episode_key = ?"
+)
+_DELETE_EPISODE_SQL = "DELETE FROM episodes WHERE service = ? AND series_id = ? AND season_key = ? AND episode_key = ?"
+
+
+# the order write_batch() applies queued changes in.
+_CHANGE_ORDER = (
+    ("series_delete", _DELETE_SERIES_SQL),
+    ("series_insert", _INSERT_SERIES_SQL),
+    ("series_update", _UPDATE_SERIES_SQL),
+    ("episode_delete", _DELETE_EPISODE_SQL),
+    ("season_delete", _DELETE_SEASON_SQL),
+    ("season_insert", _INSERT_SEASON_SQL),
+    ("season_update", _UPDATE_SEASON_SQL),
+    ("episode_insert", _INSERT_EPISODE_SQL),
+    ("episode_update", _UPDATE_EPISODE_SQL)
+)
+
+
+def _season_values(season: Season) -> tuple:
+    """Column values of a season row, in the order the season SQL above expects."""
+
+    return (season.season_id, season.season_number, season.season_name, season.eps_count)
+
+
+def _episode_values(episode: Episode) -> tuple:
+    """Column values of an episode row, in the order the episode SQL above expects."""
+
+    return (
+        episode.episode_id,
+        episode.episode_number,
+        episode.episode_number_download,
+        episode.episode_name,
+        json.dumps(episode.available_dubs),
+        json.dumps(episode.available_subs),
+        json.dumps(episode.available_qualities),
+        int(episode.episode_downloaded),
+        int(episode.episode_skip),
+        int(episode.has_all_dubs_subs)
+    )
+
+
+def _sync_counts(series: Series) -> None:
+    """Refresh the stored season/episode counts of a series from its contents."""
 
     series.series.seasons_count = str(len(series.seasons))
 
@@ -138,74 +249,130 @@ def upsert_series(conn: sqlite3.Connection, service: str, series_id: str, series
     for season in series.seasons.values():
         season.eps_count = str(len(season.episodes))
 
+
+def _diff_series(conn: sqlite3.Connection, service: str, series_id: str, series: Series, changes: dict[str, list]) -> None:
+    """Compare one in-memory series against its stored rows and queue the needed writes into changes."""
+
+    _sync_counts(series)
+
+    wanted_series = (series.series.series_name, series.series.seasons_count, series.series.eps_count)
+
+    wanted_seasons = {}
+    wanted_episodes = {}
+    for season_key, season in series.seasons.items():
+        wanted_seasons[season_key] = _season_values(season)
+        for episode_key, episode in season.episodes.items():
+            wanted_episodes[season_key, episode_key] = _episode_values(episode)
+
+    row = conn.execute(_SELECT_SERIES_SQL, (service, series_id)).fetchone()
+    if row is None:
+        changes["series_insert"].append((*wanted_series, service, series_id))
+    elif tuple(row) != wanted_series:
+        changes["series_update"].append((*wanted_series, service, series_id))
+
+    stored_seasons = {}
+    for row in conn.execute(_SELECT_SEASONS_SQL, (service, series_id)):
+        stored_seasons[row[0]] = tuple(row)[1:]
+
+    stored_episodes = {}
+    for row in conn.execute(_SELECT_EPISODES_SQL, (service, series_id)):
+        stored_episodes[row[0], row[1]] = tuple(row)[2:]
+
+    for season_key, episode_key in stored_episodes:
+        if (season_key, episode_key) not in wanted_episodes:
+            changes["episode_delete"].append((service, series_id, season_key, episode_key))
+
+    for season_key in stored_seasons:
+        if season_key not in wanted_seasons:
+            changes["season_delete"].append((service, series_id, season_key))
+
+    for season_key, values in wanted_seasons.items():
+        stored = stored_seasons.get(season_key)
+        if stored is None:
+            changes["season_insert"].append((*values, service, series_id, season_key))
+        elif stored != values:
+            changes["season_update"].append((*values, service, series_id, season_key))
+
+    for (season_key, episode_key), values in wanted_episodes.items():
+        stored = stored_episodes.get((season_key, episode_key))
+        if stored is None:
+            changes["episode_insert"].append((*values, service, series_id, season_key, episode_key))
+        elif stored != values:
+            changes["episode_update"].append((*values, service, series_id, season_key, episode_key))
+
+
+def write_batch(
+    conn: sqlite3.Connection,
+    series_writes: dict[tuple[str, str], Series | None],
+    flag_updates: dict[tuple[str, str, str, str, str], bool] | None = None
+) -> int:
+    """Persist many series writes/deletes and episode flag updates in one transaction. Returns the number of rows written.
+
+    series_writes maps (service, series_id) to the in-memory Series, or None to delete that series.
+    flag_updates maps (service, series_id, season_key, episode_key, field) to the new value.
+    """
+
+    if flag_updates is None:
+        flag_updates = {}
+
+    for (_service, _series_id, _season_key, _episode_key, field) in flag_updates:
+        if field not in _ALLOWED_EPISODE_FIELDS:
+            raise ValueError(f"Refusing to update unknown field: {field!r}")
+
+    if not series_writes and not flag_updates:
+        return 0
+
     with _write_lock:
-        conn.execute("BEGIN IMMEDIATE")
-        try:
-            conn.execute(
-                "INSERT OR REPLACE INTO series "
-                "(service, series_id, series_name, seasons_count, eps_count) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (
-                    service,
-                    series_id,
-                    series.series.series_name,
-                    series.series.seasons_count,
-                    series.series.eps_count
-                )
-            )
+        # diffed before the transaction so an unchanged refresh never takes the database write lock or commits.
+        # every write in this process goes through _write_lock, so the rows can't change between diff and write.
+        changes = {}
+        for key, _sql in _CHANGE_ORDER:
+            changes[key] = []
 
-            conn.execute(
-                "DELETE FROM seasons WHERE service = ? AND series_id = ?",
-                (service, series_id)
-            )
+        for (service, series_id), series in series_writes.items():
+            if series is None:
+                changes["series_delete"].append((service, series_id))
+            else:
+                _diff_series(conn, service, series_id, series, changes)
 
-            for season_key, season in series.seasons.items():
-                conn.execute(
-                    "INSERT INTO seasons "
-                    "(service, series_id, season_key, season_id, season_number, season_name, eps_count) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        service,
-                        series_id,
-                        season_key,
-                        season.season_id,
-                        season.season_number,
-                        season.season_name,
-                        season.eps_count
-                    )
-                )
+        if not flag_updates and not any(changes.values()):
+            return 0
 
-                for episode_key, episode in season.episodes.items():
-                    conn.execute(
-                        "INSERT INTO episodes "
-                        "(service, series_id, season_key, episode_key, episode_id, "
-                        "episode_number, episode_number_download, episode_name, "
-                        "available_dubs, available_subs, available_qualities, "
-                        "episode_downloaded, episode_skip, has_all_dubs_subs) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            service,
-                            series_id,
-                            season_key,
-                            episode_key,
-                            episode.episode_id,
-                            episode.episode_number,
-                            episode.episode_number_download,
-                            episode.episode_name,
-                            json.dumps(episode.available_dubs),
-                            json.dumps(episode.available_subs),
-                            json.dumps(episode.available_qualities),
-                            int(episode.episode_downloaded),
-                            int(episode.episode_skip),
-                            int(episode.has_all_dubs_subs)
-                        )
-                    )
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            touched = 0
+
+            # deletes go first (series, episodes, then seasons) so a re-keyed row never collides with its old self,
+            # and seasons are written before episodes so new episodes always have their parent row.
+            for key, sql in _CHANGE_ORDER:
+                if changes[key]:
+                    cursor = conn.executemany(sql, changes[key])
+                    touched += cursor.rowcount
+
+            params_by_field: dict[str, list] = {}
+            for (service, series_id, season_key, episode_key, field), value in flag_updates.items():
+                params_by_field.setdefault(field, []).append((int(value), service, series_id, season_key, episode_key))
+
+            for field, params in params_by_field.items():
+                cursor = conn.executemany(
+                    f"UPDATE episodes SET {field} = ? WHERE service = ? AND series_id = ? AND season_key = ? AND episode_key = ?",
+                    params
+                )
+                touched += cursor.rowcount
         except Exception:
             conn.execute("ROLLBACK")
             raise
         else:
             conn.execute("COMMIT")
 
+    return touched
+
+
+def upsert_series(conn: sqlite3.Connection, service: str, series_id: str, series: Series) -> int:
+    """Write one series with its seasons/episodes, touching only the rows that changed. Returns the number of rows written."""
+
+    return write_batch(conn, {(service, series_id): series})
+
 
 def delete_series(conn: sqlite3.Connection, service: str, series_id: str) -> None:
     """Delete one series and all its seasons/episodes."""
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKeyConstraint, Integer, MetaData, Table, Text
+from sqlalchemy import Column, ForeignKeyConstraint, Index, Integer, MetaData, Table, Text, text
 
 
 metadata = MetaData()
@@ -63,3 +63,37 @@ episodes = Table(
     ),
     sqlite_with_rowid=False
 )
+
+
+# ffprobe results keyed by file identity. a row is only valid while inode, size and mtime_ns still match the file.
+probe_cache = Table(
+    "probe_cache",
+    metadata,
+    Column("path", Text, primary_key=True, nullable=False),
+    Column("inode", Integer, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("mtime_ns", Integer, nullable=False),
+    Column("streams", Text, nullable=False),
+    sqlite_with_rowid=False
+)
+
+
+# partial indexes over the episodes that still need work, so QueueManager can load its pending index
+# without scanning the whole library.
+Index(
+    "ix_episodes_pending_download",
+    episodes.c.service,
+    episodes.c.series_id,
+    episodes.c.season_key,
+    episodes.c.episode_key,
+    sqlite_where=text("episode_downloaded = 0 AND episode_skip = 0")
+)
+
+Index(
+    "ix_episodes_pending_verify",
+    episodes.c.service,
+    episodes.c.series_id,
+    episodes.c.season_key,
+    episodes.c.episode_key,
+    sqlite_where=text("episode_downloaded = 1 AND has_all_dubs_subs = 0 AND episode_skip = 0")
+)
@@ -6,6 +6,8 @@ class DestinationConfig(BaseModel):
 
     dir: str = Field(min_length=1)
     folder_structure: str = Field(min_length=1)
+    max_mb_per_sec: float = Field(0, ge=0)
+    drop_page_cache: bool = False
 
 
 class AppConfig(BaseModel):
@@ -39,6 +41,10 @@ class AppConfig(BaseModel):
     check_missing_dub_sub: bool = Field(True, alias="CHECK_MISSING_DUB_SUB")
     check_for_updates_interval: int = Field(3600, alias="CHECK_FOR_UPDATES_INTERVAL")
     episode_dl_delay: int = Field(30, alias="EPISODE_DL_DELAY")
+    max_concurrent_downloads: int = Field(1, ge=1, alias="MAX_CONCURRENT_DOWNLOADS")
+    pipeline_queue_size: int = Field(1, ge=0, alias="PIPELINE_QUEUE_SIZE")
+    probe_workers: int = Field(4, ge=1, alias="PROBE_WORKERS")
+    verify_transfers: bool = Field(False, alias="VERIFY_TRANSFERS")
 
     cr_force_reauth: bool = Field(False, alias="CR_FORCE_REAUTH")
     cr_skip_api_test: bool = Field(False, alias="CR_SKIP_API_TEST")
@@ -55,6 +61,14 @@ class AppConfig(BaseModel):
 
     log_level: str = Field("info", alias="LOG_LEVEL")
     max_log_archives: int = Field(5, alias="MAX_LOG_ARCHIVES")
+    log_rotate_size_mb: int = Field(100, ge=0, alias="LOG_ROTATE_SIZE_MB")
+    log_rotate_hours: int = Field(0, ge=0, alias="LOG_ROTATE_HOURS")
+    log_json: bool = Field(False, alias="LOG_JSON")
+    profile_iteration: bool = Field(False, alias="PROFILE_ITERATION")
+
+    metrics_enabled: bool = Field(False, alias="METRICS_ENABLED")
+    metrics_host: str = Field("0.0.0.0", alias="METRICS_HOST")
+    metrics_port: int = Field(9464, ge=1, le=65535, alias="METRICS_PORT")
 
     smtp_enabled: bool = Field(False, alias="SMTP_ENABLED")
     smtp_from: str = Field("", alias="SMTP_FROM")